@@ -1,5 +1,7 @@
 import os
 import sys
+import asyncio
+import argparse
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -8,7 +10,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.collectors.gcp_collector import GCPCollector
+from src.collectors.billing_export_collector import BillingExportCollector
+from src.collectors.async_gcp_collector import AsyncGCPCollector
+from src.collectors.multi_project import MultiProjectScanner
+from src.collectors.replay import recording_clients, replay_clients
 from src.analyzers.cost_analyzer import CostAnalyzer
+from src.analyzers.recommendation_engine import RecommendationEngine
+from src.data.billing_frame import BillingFrame
+from src.data.cost_cube import DailyCostCube
+from src.data.cost_store import CostStore
+from src.data.snapshot import Snapshot, SnapshotWriter
 from src.config_loader import load_config, expand_env_vars
 
 # configure logging
@@ -23,6 +34,18 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# analyzers that read the resource inventory in this report; the ListAssets
+# request asks only for the union of their REQUIRED_ASSET_TYPES
+INVENTORY_CONSUMERS = (CostAnalyzer, RecommendationEngine)
+
+
+def inventory_asset_types():
+    """
+    asset types to request for the report, or None for the configured
+    asset_types (every type unless config narrows it)
+    """
+    return GCPCollector.asset_types_for(*INVENTORY_CONSUMERS)
+
 
 def print_header(text: str):
     """print a formatted header."""
@@ -38,10 +61,303 @@ def print_section(text: str):
     print(f"{'-'*70}\n")
 
 
-def main():
+def parse_args(argv=None):
+    """parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Cloud Cost Optimizer")
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help="collect billing, resources and idle instances concurrently"
+    )
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument(
+        '--record',
+        metavar='DIR',
+        help="record live API responses into fixture files under DIR"
+    )
+    replay_group.add_argument(
+        '--replay',
+        metavar='DIR',
+        help="serve API calls from fixtures under DIR instead of GCP (no network)"
+    )
+    parser.add_argument(
+        '--replay-latency-ms',
+        type=float,
+        default=0.0,
+        help="simulated latency per replayed call/page in milliseconds"
+    )
+    parser.add_argument(
+        '--lazy-auth',
+        action='store_true',
+        help="skip the authentication probe call (credential errors surface on the first API call)"
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        '--snapshot-out',
+        metavar='DIR',
+        help="save billing, resource and idle-instance data as a columnar snapshot in DIR"
+    )
+    snapshot_group.add_argument(
+        '--snapshot-in',
+        metavar='DIR',
+        help="report from a snapshot saved with --snapshot-out (no collection, no GCP access)"
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help="bypass the on-disk API response cache entirely"
+    )
+    cache_group.add_argument(
+        '--refresh',
+        action='store_true',
+        help="ignore cached API responses but store the fresh ones"
+    )
+    return parser.parse_args(argv)
+
+
+def summarize_resources(resources, snapshot=None):
+    """count resources and tally asset types from a (streaming) iterable."""
+    resource_count = 0
+    resource_types = {}
+    for resource in resources:
+        if snapshot is not None:
+            snapshot.add_resource(resource)
+        resource_count += 1
+        asset_type = resource.get('asset_type', 'Unknown')
+        resource_types[asset_type] = resource_types.get(asset_type, 0) + 1
+    return resource_count, resource_types
+
+
+async def summarize_resources_async(resources, snapshot=None):
+    """async counterpart of summarize_resources for AsyncGCPCollector streams."""
+    resource_count = 0
+    resource_types = {}
+    async for resource in resources:
+        if snapshot is not None:
+            snapshot.add_resource(resource)
+        resource_count += 1
+        asset_type = resource.get('asset_type', 'Unknown')
+        resource_types[asset_type] = resource_types.get(asset_type, 0) + 1
+    return resource_count, resource_types
+
+
+async def collect_concurrently(collector, start_date, end_date, snapshot=None):
+    """
+    authenticate, then run billing collection, resource discovery and idle
+    detection concurrently. failures are returned in place of results so each
+    report section can handle them like the sequential path does.
+    """
+    if not await collector.authenticate():
+        return None
+    
+    try:
+        billing_data, resource_summary, idle_instances = await asyncio.gather(
+            collector.collect_billing_data(start_date, end_date),
+            summarize_resources_async(collector.iter_resources(inventory_asset_types()), snapshot),
+            collector.get_idle_compute_instances(),
+            return_exceptions=True
+        )
+        recommendations = await collector.get_cost_optimization_recommendations()
+    finally:
+        await collector.close()
+    
+    return {
+        'billing_data': billing_data,
+        'resource_summary': resource_summary,
+        'idle_instances': idle_instances,
+        'recommendations': recommendations
+    }
+
+
+def prefetched_result(prefetched, key):
+    """return a result gathered by collect_concurrently, re-raising its failure."""
+    result = prefetched[key]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def report_billing_export(export_collector, start_date, end_date):
+    """
+    load the local billing export into a BillingFrame and print the top
+    services by cost. returns the frame, or None if the export can't be read.
+    """
+    try:
+        if not export_collector.authenticate():
+            print(f"❌ No billing export files found at {export_collector.path}")
+            return None
+        
+        frame = export_collector.collect_billing_frame(start_date, end_date)
+        cost_by_service = frame.group_costs('service')
+        print(f"\nBilling export: {frame.total_cost():,.2f} total across {len(cost_by_service)} services "
+              f"({len(frame)} line items)")
+        for service, cost in sorted(cost_by_service.items(), key=lambda x: x[1], reverse=True)[:10]:
+            print(f"  • {service}: {cost:,.2f}")
+        return frame
+    
+    except Exception as e:
+        logger.error(f"Failed to read billing export: {str(e)}")
+        print(f"❌ Error: {str(e)}")
+        return None
+
+
+def update_cost_store(store, frame, source, end_date):
+    """
+    append this run's line items to the local cost store and report the
+    period comparison and forecast over the stored history. the last year is
+    grouped into a DailyCostCube by one SQL query and both analyses read the
+    cube, so the history can span a year or more.
+    """
+    try:
+        stored = store.append(frame, source=source)
+        history = store.date_range()
+        print(f"\nCost store: {stored} line items appended to {store.path}")
+        if history is None:
+            return
+        print(f"  History: {history[0]} to {history[1]}")
+        
+        # one GROUP BY over the last year; every analysis below reads the cube
+        cube = DailyCostCube.build(store.window(end_date - timedelta(days=364), end_date))
+        analyzer = CostAnalyzer()
+        current = cube.filter(end_date - timedelta(days=29), end_date)
+        previous = cube.filter(end_date - timedelta(days=59), end_date - timedelta(days=30))
+        comparison = analyzer.compare_periods(current, previous)
+        if 'percentage_change' in comparison:
+            print(f"  Last 30 days: {comparison['current_period_cost']:,.2f} "
+                  f"({comparison['percentage_change']:+.2f}% vs the 30 days before)")
+        
+        forecast = analyzer.generate_budget_forecast(cube)
+        if forecast.get('status') == 'success':
+            interval = ''
+            if 'lower_bound' in forecast:
+                interval = f", {forecast['confidence_level']:.0%} interval {forecast['lower_bound']:,.2f}-{forecast['upper_bound']:,.2f}"
+            print(f"  30-day forecast: {forecast['forecasted_total']:,.2f} "
+                  f"({forecast['historical_daily_average']:,.2f}/day{interval})")
+    except Exception as e:
+        logger.error(f"Failed to update cost store: {str(e)}")
+        print(f"❌ Cost store error: {str(e)}")
+
+
+def run_snapshot_report(directory):
+    """print the cost, resource and recommendation report from a saved snapshot."""
+    print_section("📦 Snapshot Report")
+    
+    try:
+        snapshot = Snapshot.load(directory)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load snapshot: {str(e)}")
+        print(f"❌ Error: {str(e)}")
+        return 1
+    
+    scan = snapshot.metadata
+    print(f"Snapshot: {directory} (created {snapshot.meta['created_at']})")
+    print(f"Project ID: {scan.get('project_id', 'Unknown')}")
+    if scan.get('start_date'):
+        print(f"Date range: {scan['start_date'][:10]} to {scan.get('end_date', '')[:10]}")
+    
+    analyzer = CostAnalyzer()
+    
+    print_section("💰 Cost Breakdown")
+    trends = analyzer.analyze_cost_trends(snapshot)
+    if trends['status'] == 'success':
+        print(f"Total cost: {trends['total_cost']:,.2f}")
+        for item in trends['breakdown'][:10]:
+            print(f"  • {item['name']}: {item['cost']:,.2f} ({item['percentage']}%)")
+    else:
+        print("No billing line items in this snapshot")
+    
+    print_section("🔍 Resources")
+    resource_types = snapshot.resource_type_counts()
+    print(f"✅ {snapshot.resource_count} resources")
+    for rtype, count in sorted(resource_types.items(), key=lambda x: x[1], reverse=True)[:10]:
+        print(f"  • {rtype.split('/')[-1]}: {count}")
+    
+    print_section("💡 Cost Optimization Recommendations")
+    engine = RecommendationEngine()
+    engine.add_snapshot_recommendations(snapshot)
+    recommendations = engine.get_prioritized_recommendations(max_recommendations=10)
+    if recommendations:
+        summary = engine.get_summary_statistics()
+        print(f"{summary['total_recommendations']} recommendations, estimated "
+              f"{summary['total_monthly_savings']:,.2f}/month in savings. Top {len(recommendations)}:\n")
+        for rec in recommendations:
+            print(f"{rec['rank']}. {rec['resource_name']} [{rec['priority_label']}]")
+            print(f"   Recommendation: {rec['recommendation']}")
+            print(f"   Estimated monthly savings: {rec['estimated_monthly_savings']:,.2f}\n")
+    else:
+        print("✅ No optimization opportunities found - your resources are efficiently utilized!")
+    
+    print_section("📊 Resource Efficiency Analysis")
+    efficiency = analyzer.calculate_resource_efficiency(snapshot.resource_count, snapshot.idle_instances)
+    print(f"Total Resources: {efficiency['total_resources']}")
+    print(f"Idle Resources: {efficiency['idle_resources']}")
+    print(f"Utilization Rate: {efficiency['utilization_rate']}%")
+    print(f"Efficiency Grade: {efficiency['efficiency_grade']}")
+    
+    print_header("✨ Analysis Complete")
+    return 0
+
+
+def run_multi_project_scan(scanner, start_date, end_date, snapshot=None):
+    """scan every configured project in parallel and print a merged report."""
+    print_section("🌐 Multi-Project Scan")
+    print(f"Date range: {start_date.date()} to {end_date.date()}")
+    
+    try:
+        results = scanner.scan(start_date, end_date)
+    except Exception as e:
+        logger.error(f"Multi-project scan failed: {str(e)}")
+        print(f"❌ Error: {str(e)}")
+        return 1
+    
+    print(f"✅ Scanned {len(results['projects'])} projects")
+    print(f"   Billing records: {len(results['billing_data'])}")
+    print(f"   Resources: {len(results['resources'])}")
+    print(f"   Idle instances: {len(results['idle_instances'])}")
+    
+    print("\nProjects with the most idle instances:")
+    ranked = sorted(results['project_summaries'], key=lambda x: x['idle_instances'], reverse=True)
+    for summary in ranked[:10]:
+        print(f"  • {summary['project_id']}: {summary['idle_instances']} idle / "
+              f"{summary['resources']} resources ({summary['elapsed_seconds']}s)")
+    
+    if results['failed_projects']:
+        print(f"\n⚠️  {len(results['failed_projects'])} projects could not be fully scanned:")
+        for project_id, error in sorted(results['failed_projects'].items()):
+            print(f"  • {project_id}: {error}")
+    
+    print_section("📊 Resource Efficiency Analysis")
+    efficiency = CostAnalyzer().calculate_resource_efficiency(
+        results['resources'],
+        results['idle_instances']
+    )
+    print(f"Total Resources: {efficiency['total_resources']}")
+    print(f"Idle Resources: {efficiency['idle_resources']}")
+    print(f"Utilization Rate: {efficiency['utilization_rate']}%")
+    print(f"Efficiency Grade: {efficiency['efficiency_grade']}")
+    
+    if snapshot is not None:
+        snapshot.set_billing(BillingFrame.from_records(results['billing_data']))
+        snapshot.add_resources(results['resources'])
+        snapshot.set_idle_instances(results['idle_instances'])
+        print(f"\n📦 Snapshot saved to: {snapshot.close()}")
+    
+    print_header("✨ Analysis Complete")
+    print("Results saved to: cost_optimizer.log")
+    return 0
+
+
+def main(argv=None):
     """main execution function."""
+    args = parse_args(argv)
     print_header("☁️  Cloud Cost Optimizer")
     
+    # report-only run: everything comes from the snapshot
+    if args.snapshot_in:
+        return run_snapshot_report(args.snapshot_in)
+    
     # load configuration
     config_path = os.path.join('config', 'config.yaml')
     
@@ -59,6 +375,14 @@ def main():
         config = expand_env_vars(config)
         logger.info("Configuration loaded successfully")
         
+        if args.no_cache:
+            config['cache'] = dict(config.get('cache') or {}, enabled=False)
+        elif args.refresh or args.record:
+            # recording needs every call to reach the API
+            config['cache'] = dict(config.get('cache') or {}, mode='refresh')
+        if args.lazy_auth:
+            config['auth'] = dict(config.get('auth') or {}, lazy=True)
+    
     except Exception as e:
         logger.error(f"Failed to load configuration: {str(e)}")
         print(f"❌ Error loading configuration: {str(e)}")
@@ -69,49 +393,104 @@ def main():
     print(f"Project ID: {config.get('project_id', 'Not specified')}")
     print("Authenticating with GCP...")
     
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=30)
+    prefetched = None
+    snapshot = None
+    if args.snapshot_out:
+        snapshot = SnapshotWriter(args.snapshot_out, metadata={
+            'project_id': config.get('project_id'),
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat()
+        })
+    
     try:
-        collector = GCPCollector(config)
+        if args.use_async and (args.replay or args.record):
+            print("❌ --record/--replay are not supported with --async")
+            return 1
         
-        if not collector.authenticate():
+        if args.use_async and (config.get('projects') or config.get('organization_id') or config.get('folder_id')):
+            print("❌ Multi-project scans (projects / organization_id / folder_id) are not supported with --async")
+            return 1
+        
+        if args.replay:
+            collector = GCPCollector(config)
+            collector.use_clients(**replay_clients(args.replay, args.replay_latency_ms / 1000))
+            print(f"Replaying recorded API responses from {args.replay}")
+            authenticated = True
+        elif args.use_async:
+            collector = AsyncGCPCollector(config)
+            prefetched = asyncio.run(collect_concurrently(collector, start_date, end_date, snapshot))
+            authenticated = prefetched is not None
+        else:
+            collector = GCPCollector(config)
+            authenticated = collector.authenticate()
+            if authenticated and args.record:
+                collector.use_clients(**recording_clients(collector, args.record))
+                print(f"Recording API responses to {args.record}")
+        
+        if not authenticated:
             print("❌ Authentication failed")
             return 1
         
         print("✅ Successfully authenticated with GCP")
-        
+    
     except Exception as e:
         logger.error(f"Failed to initialize collector: {str(e)}")
         print(f"❌ Error: {str(e)}")
         return 1
     
+    # organization / multi-project mode shares this collector's clients
+    scanner = MultiProjectScanner.from_config(collector, config)
+    if scanner is not None:
+        return run_multi_project_scan(scanner, start_date, end_date, snapshot)
+    
     # collect billing data
     print_section("💰 Collecting Billing Data")
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
     print(f"Date range: {start_date.date()} to {end_date.date()}")
     
     try:
-        billing_data = collector.collect_billing_data(start_date, end_date)
+        if prefetched is not None:
+            billing_data = prefetched_result(prefetched, 'billing_data')
+        else:
+            billing_data = collector.collect_billing_data(start_date, end_date)
         print(f"✅ Collected {len(billing_data)} billing records")
-        
+    
     except Exception as e:
         logger.error(f"Failed to collect billing data: {str(e)}")
         print(f"❌ Error: {str(e)}")
         billing_data = []
     
+    billing_frame = None
+    billing_source = config.get('project_id') or 'billing_api'
+    if config.get('billing_export'):
+        billing_frame = report_billing_export(BillingExportCollector(config), start_date, end_date)
+        if billing_frame is not None:
+            billing_source = config['billing_export'].get('path', 'billing_export')
+    if billing_frame is None and (snapshot is not None or config.get('cost_store')):
+        billing_frame = BillingFrame.from_records(billing_data)
+    if snapshot is not None:
+        snapshot.set_billing(billing_frame)
+    
+    cost_store = CostStore.from_config(config.get('cost_store'))
+    if cost_store is not None:
+        update_cost_store(cost_store, billing_frame, billing_source, end_date)
+        cost_store.close()
+    
     # discover resources
     print_section("🔍 Discovering Resources")
     print("Scanning project for resources...")
     
     try:
-        resources = collector.collect_resource_data()
-        print(f"✅ Found {len(resources)} resources in the project")
+        if prefetched is not None:
+            resource_count, resource_types = prefetched_result(prefetched, 'resource_summary')
+        else:
+            # stream the inventory so memory stays flat on very large projects
+            resource_count, resource_types = summarize_resources(collector.iter_resources(inventory_asset_types()), snapshot)
         
-        # show resource type breakdown
-        resource_types = {}
-        for resource in resources:
-            asset_type = resource.get('asset_type', 'Unknown')
-            resource_types[asset_type] = resource_types.get(asset_type, 0) + 1
+        print(f"✅ Found {resource_count} resources in the project")
         
+        # show resource type breakdown
         print("\nResource type breakdown:")
         for rtype, count in sorted(resource_types.items(), key=lambda x: x[1], reverse=True)[:10]:
             short_type = rtype.split('/')[-1]
@@ -119,18 +498,21 @@ def main():
         
         if len(resource_types) > 10:
             print(f"  ... and {len(resource_types) - 10} more types")
-        
+    
     except Exception as e:
         logger.error(f"Failed to collect resources: {str(e)}")
         print(f"❌ Error: {str(e)}")
-        resources = []
+        resource_count = 0
     
     # identify idle instances
     print_section("⚠️  Identifying Idle Resources")
     print("Checking for idle compute instances...")
     
     try:
-        idle_instances = collector.get_idle_compute_instances()
+        if prefetched is not None:
+            idle_instances = prefetched_result(prefetched, 'idle_instances')
+        else:
+            idle_instances = collector.get_idle_compute_instances()
         print(f"✅ Found {len(idle_instances)} idle compute instances")
         
         if idle_instances:
@@ -141,7 +523,7 @@ def main():
                 print(f"    Recommendation: {instance['recommendation']}\n")
         else:
             print("  All instances are actively running - no idle resources detected")
-        
+    
     except Exception as e:
         logger.error(f"Failed to identify idle instances: {str(e)}")
         print(f"❌ Error: {str(e)}")
@@ -151,7 +533,10 @@ def main():
     print_section("💡 Cost Optimization Recommendations")
     
     try:
-        recommendations = collector.get_cost_optimization_recommendations()
+        if prefetched is not None:
+            recommendations = prefetched_result(prefetched, 'recommendations')
+        else:
+            recommendations = collector.get_cost_optimization_recommendations()
         
         if recommendations:
             print(f"Generated {len(recommendations)} recommendations:\n")
@@ -162,7 +547,7 @@ def main():
                 print(f"   Action: {rec['action']}\n")
         else:
             print("✅ No optimization opportunities found - your resources are efficiently utilized!")
-        
+    
     except Exception as e:
         logger.error(f"Failed to generate recommendations: {str(e)}")
         print(f"❌ Error: {str(e)}")
@@ -172,20 +557,32 @@ def main():
     
     try:
         analyzer = CostAnalyzer()
-        efficiency = analyzer.calculate_resource_efficiency(resources, idle_instances)
+        efficiency = analyzer.calculate_resource_efficiency(resource_count, idle_instances)
         
         print(f"Total Resources: {efficiency['total_resources']}")
         print(f"Active Resources: {efficiency['active_resources']}")
         print(f"Idle Resources: {efficiency['idle_resources']}")
         print(f"Utilization Rate: {efficiency['utilization_rate']}%")
         print(f"Efficiency Grade: {efficiency['efficiency_grade']}")
-        
+    
     except Exception as e:
         logger.error(f"Failed to analyze efficiency: {str(e)}")
         print(f"❌ Error: {str(e)}")
     
     # summary
     print_header("✨ Analysis Complete")
+    cache_stats = collector.scan_cache.stats()
+    disk_cache_stats = collector.response_cache.stats()
+    print(f"API cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    print(f"Disk cache ({disk_cache_stats['mode']}): {disk_cache_stats['hits']} hits, "
+          f"{disk_cache_stats['misses']} misses, {disk_cache_stats['writes']} writes")
+    logger.info(f"Scan cache statistics: {cache_stats}")
+    logger.info(f"Disk cache statistics: {disk_cache_stats}")
+    for api, limiter in collector.rate_limiters.items():
+        logger.info(f"Rate limiter statistics ({api}): {limiter.stats()}")
+    if snapshot is not None:
+        snapshot.set_idle_instances(idle_instances)
+        print(f"Snapshot saved to: {snapshot.close()}")
     print("Results saved to: cost_optimizer.log")
     print("\nNext steps:")
     print("  • Review idle resources and consider deletion")
@@ -0,0 +1,106 @@
+"""
+Offline throughput benchmark for GCPCollector and main.py.
+
+Generates (or reuses) replay fixtures for a synthetic fleet, then times each
+collection stage against the replay clients and, optionally, a full
+`main.py --replay` run. No GCP access is needed.
+
+usage:
+    python scripts/benchmark_collector.py --assets 100000 --latency-ms 20 --main
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.collectors.gcp_collector import GCPCollector
+from src.collectors.replay import generate_synthetic_fleet, replay_clients
+from src.config_loader import load_config
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    return result, elapsed
+
+
+def default_project_id():
+    config_path = ROOT / 'config' / 'config.yaml'
+    if config_path.exists():
+        return (load_config(str(config_path)) or {}).get('project_id', 'synthetic-project')
+    return 'synthetic-project'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the collector against replayed GCP responses")
+    parser.add_argument('--fixtures', help="existing fixture directory (default: generate a synthetic fleet)")
+    parser.add_argument('--assets', type=int, default=100_000, help="synthetic fleet size")
+    parser.add_argument('--zones', type=int, default=40, help="zones in the synthetic fleet")
+    parser.add_argument('--project-id', default=None, help="project id (default: config/config.yaml)")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="simulated latency per call/page")
+    parser.add_argument('--workers', type=int, default=8, help="collection.max_workers for the zonal scan")
+    parser.add_argument('--main', action='store_true', help="also time a full `main.py --replay` run")
+    args = parser.parse_args(argv)
+
+    project_id = args.project_id or default_project_id()
+    fixtures = args.fixtures or tempfile.mkdtemp(prefix='cco-fixtures-')
+
+    if not args.fixtures:
+        counts, elapsed = timed(lambda: generate_synthetic_fleet(
+            fixtures, project_id, asset_count=args.assets, zone_count=args.zones
+        ))
+        print(f"generated {counts['assets']} assets / {counts['instances']} instances "
+              f"/ {counts['idle_instances']} idle in {elapsed:.2f}s -> {fixtures}")
+
+    latency = args.latency_ms / 1000
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=30)
+
+    def make_collector(strategy):
+        collector = GCPCollector({
+            'project_id': project_id,
+            'collection': {'instance_scan_strategy': strategy, 'max_workers': args.workers}
+        })
+        collector.use_clients(**replay_clients(fixtures, latency))
+        return collector
+
+    collector = make_collector('aggregated')
+    stages = [
+        ('billing', lambda: collector.collect_billing_data(start_date, end_date)),
+        ('resources (stream)', lambda: sum(1 for _ in collector.iter_resources())),
+        ('idle (aggregated)', lambda: collector.get_idle_compute_instances()),
+        ('idle (zonal)', lambda: make_collector('zonal').get_idle_compute_instances()),
+    ]
+
+    print(f"\n{'stage':<22}{'items':>10}{'seconds':>10}{'items/s':>12}")
+    for label, func in stages:
+        result, elapsed = timed(func)
+        items = result if isinstance(result, int) else len(result)
+        rate = items / elapsed if elapsed > 0 else float('inf')
+        print(f"{label:<22}{items:>10}{elapsed:>10.3f}{rate:>12.0f}")
+
+    if args.main:
+        command = [
+            sys.executable, str(ROOT / 'main.py'),
+            '--replay', fixtures,
+            '--replay-latency-ms', str(args.latency_ms),
+            '--no-cache'
+        ]
+        _, elapsed = timed(lambda: subprocess.run(
+            command, cwd=str(ROOT), stdout=subprocess.DEVNULL, check=True
+        ))
+        print(f"\nmain.py --replay end-to-end: {elapsed:.2f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
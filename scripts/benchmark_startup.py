@@ -0,0 +1,86 @@
+"""
+Startup latency benchmark for the CLI and the collector package.
+
+Times fresh interpreter runs of `python main.py --help` and of importing
+`src.collectors` / `src.analyzers`, and reports which google.cloud SDKs each
+run loaded. --max-seconds makes the script fail when a median exceeds the
+budget, so it can track regressions in CI.
+
+usage:
+    python scripts/benchmark_startup.py --runs 5 --max-seconds 1.0
+"""
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SDK_MODULES = ('google.cloud.billing', 'google.cloud.asset', 'google.cloud.compute')
+
+# each probe prints a JSON list of the SDK modules it ended up importing
+PROBES = {
+    'main.py --help': (
+        "import sys, runpy; sys.argv = ['main.py', '--help']\n"
+        "try:\n"
+        "    runpy.run_path('main.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+    'import src.collectors': "import src.collectors\n",
+    'import src.analyzers': "import src.analyzers\n",
+}
+
+
+def run_probe(code):
+    """
+    run one probe in a fresh interpreter
+    returns:
+        tuple of (wall seconds, loaded SDK modules)
+    """
+    report = (
+        "import json, sys, time\n"
+        "_started = time.perf_counter()\n"
+        f"{code}"
+        "_elapsed = time.perf_counter() - _started\n"
+        f"print(json.dumps([_elapsed, [m for m in {list(SDK_MODULES)!r} if m in sys.modules]]), file=sys.stderr)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', report],
+        cwd=str(ROOT), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+    )
+    elapsed, loaded = json.loads(result.stderr.strip().splitlines()[-1])
+    return elapsed, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup and package import latency")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreter runs per probe")
+    parser.add_argument('--max-seconds', type=float, default=None, help="fail if any median exceeds this")
+    args = parser.parse_args(argv)
+    
+    print(f"{'probe':<24}{'median s':>10}{'min s':>10}  sdk modules loaded")
+    over_budget = []
+    for label, code in PROBES.items():
+        samples = []
+        loaded = []
+        for _ in range(max(1, args.runs)):
+            elapsed, loaded = run_probe(code)
+            samples.append(elapsed)
+        
+        median = statistics.median(samples)
+        print(f"{label:<24}{median:>10.3f}{min(samples):>10.3f}  {', '.join(loaded) or '-'}")
+        if args.max_seconds is not None and median > args.max_seconds:
+            over_budget.append(label)
+    
+    if over_budget:
+        print(f"\nover the {args.max_seconds:.2f}s budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
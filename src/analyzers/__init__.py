@@ -1,3 +1,8 @@
 from .cost_analyzer import CostAnalyzer
+from .anomaly_detector import DetectorState, SeriesAnomalyDetector
+from .forecaster import BatchForecaster
+from .period_comparison import PeriodComparator
+from .root_cause import AnomalyExplainer
+from .trend_aggregator import CostTrendAggregator
 
-__all__ = ['CostAnalyzer']
\ No newline at end of file
+__all__ = ['CostAnalyzer', 'SeriesAnomalyDetector', 'DetectorState', 'BatchForecaster', 'PeriodComparator', 'AnomalyExplainer', 'CostTrendAggregator']
\ No newline at end of file
@@ -0,0 +1,375 @@
+"""Rolling-window anomaly detection over many daily cost series at once."""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import os
+import json
+import tempfile
+import logging
+
+import numpy as np
+
+from ..data.billing_frame import BillingData, as_billing_source, day_label
+
+logger = logging.getLogger(__name__)
+
+# scales a median absolute deviation to a standard deviation for normal data
+MAD_TO_STD = 1.4826
+
+DETECTION_METHODS = ('mad', 'ewma')
+
+# smallest score scale (one cent), so flat series give finite scores
+MIN_SCALE = 0.01
+
+DETECTOR_STATE_VERSION = 1
+
+
+def _row_medians(values: np.ndarray) -> np.ndarray:
+    """
+    median of each row, ignoring NaN (NaN for all-NaN rows). sorting the
+    short window rows is several times faster than np.median/np.nanmedian
+    along an axis.
+    """
+    ordered = np.sort(values, axis=1)
+    counts = np.count_nonzero(~np.isnan(ordered), axis=1)
+    low = np.maximum((counts - 1) // 2, 0)[:, None]
+    high = (counts // 2)[:, None]
+    medians = (np.take_along_axis(ordered, low, axis=1) + np.take_along_axis(ordered, high, axis=1))[:, 0] / 2
+    return np.where(counts > 0, medians, np.nan)
+
+
+class SeriesAnomalyDetector:
+    """
+    Flags days whose cost deviates from each series' own recent baseline.
+    
+    Every series (e.g. every service, or every service/project pair) is
+    scored against its trailing history only, so a steady ramp moves the
+    baseline with it instead of being compared to one global mean. Two
+    baselines are available:
+        
+        mad   rolling median of the previous `window` days, scaled by the
+              median absolute deviation (robust to earlier spikes)
+        ewma  exponentially weighted mean and variance (`alpha`)
+    
+    The series x day matrix is processed one day at a time with every
+    series updated in the same vectorized step, so thousands of series cost
+    one pass over the days rather than one Python loop per series.
+    """
+    
+    def __init__(
+        self,
+        method: str = 'mad',
+        window: int = 14,
+        threshold: float = 3.5,
+        min_periods: int = 7,
+        alpha: float = 0.3,
+        min_deviation: float = 1.0,
+        min_scale_ratio: float = 0.01
+    ):
+        """
+        args:
+            method: Baseline method ('mad' or 'ewma')
+            window: Trailing days in the rolling median (mad)
+            threshold: Absolute score above which a day is anomalous
+            min_periods: Days of history a series needs before it is scored
+            alpha: Smoothing factor of the exponential baseline (ewma)
+            min_deviation: Smallest absolute cost deviation worth reporting
+            min_scale_ratio: Floor on the score scale as a fraction of the
+                baseline, so near-constant series don't score every cent
+        """
+        if method not in DETECTION_METHODS:
+            raise ValueError(f"Unknown detection method: {method} (expected one of {', '.join(DETECTION_METHODS)})")
+        if window < 1 or min_periods < 1:
+            raise ValueError("window and min_periods must be at least 1")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        
+        self.method = method
+        self.window = window
+        self.threshold = threshold
+        self.min_periods = min(min_periods, window) if method == 'mad' else min_periods
+        self.alpha = alpha
+        self.min_deviation = min_deviation
+        self.min_scale_ratio = min_scale_ratio
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    def score(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every day of every series against its trailing baseline.
+        
+        args:
+            matrix: Daily costs, one row per series and one column per day
+        
+        returns:
+            tuple of (scores, expected costs), both shaped like the matrix;
+            days without enough history are NaN
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        return self._score_days(self._initial_state(matrix.shape[0]), matrix)
+    
+    def _score_days(self, state: Dict[str, Any], matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        scores = np.full(matrix.shape, np.nan)
+        expected = np.full(matrix.shape, np.nan)
+        for day in range(matrix.shape[1]):
+            scores[:, day], expected[:, day] = self._step(state, matrix[:, day])
+        return scores, expected
+    
+    def detect(
+        self,
+        billing_data: BillingData,
+        dimensions: Sequence[str] = ('service',)
+    ) -> List[Dict[str, Any]]:
+        """
+        Find anomalous days per series.
+        
+        args:
+            billing_data: BillingFrame, CostStore window or billing records
+            dimensions: Dimensions that define a series (e.g. service, project)
+        
+        returns:
+            anomalies ordered by date, then by score
+        """
+        keys, first_day, matrix = as_billing_source(billing_data).daily_series(tuple(dimensions))
+        scores, expected = self.score(matrix)
+        return self._anomalies(keys, first_day, matrix, scores, expected)
+    
+    def detect_incremental(
+        self,
+        billing_data: BillingData,
+        state: Optional['DetectorState'] = None,
+        dimensions: Sequence[str] = ('service',)
+    ) -> Tuple[List[Dict[str, Any]], 'DetectorState']:
+        """
+        Score only the days after the ones already folded into `state`.
+        
+        Days up to state.last_day are skipped, days missing between runs
+        count as zero cost, and series seen for the first time start from
+        the zero history they would have had in a full run, so the scores
+        equal those of detect() over the whole history. Revisions to days
+        that were already processed are not picked up.
+        
+        args:
+            billing_data: New billing data (frame, CostStore window or records)
+            state: State from the previous run (None starts fresh)
+            dimensions: Dimensions that define a series (must match the state)
+        
+        returns:
+            tuple of (anomalies on the new days, updated state)
+        """
+        dimensions = tuple(dimensions)
+        if state is None:
+            state = DetectorState(self, dimensions)
+        else:
+            state.check(self, dimensions)
+        
+        keys, first_day, matrix = as_billing_source(billing_data).daily_series(dimensions)
+        if not keys:
+            return [], state
+        
+        if state.last_day is not None:
+            # line up the new columns so they start the day after the last run
+            offset = state.last_day + 1 - first_day
+            if offset > 0:
+                matrix = matrix[:, offset:]
+            elif offset < 0:
+                matrix = np.hstack([np.zeros((len(keys), -offset)), matrix])
+            first_day = state.last_day + 1
+        if matrix.shape[1] == 0:
+            return [], state
+        
+        rows = state.series_rows(self, keys, first_day)
+        full = np.zeros((len(state.keys), matrix.shape[1]))
+        full[rows] = matrix
+        
+        scores, expected = self._score_days(state.arrays, full)
+        state.last_day = first_day + matrix.shape[1] - 1
+        return self._anomalies(state.keys, first_day, full, scores, expected), state
+    
+    def _anomalies(
+        self,
+        keys: List[Dict[str, str]],
+        first_day: int,
+        matrix: np.ndarray,
+        scores: np.ndarray,
+        expected: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        deviation = matrix - expected
+        with np.errstate(invalid='ignore'):
+            flagged = (np.abs(scores) > self.threshold) & (np.abs(deviation) >= self.min_deviation)
+        series_index, day_offset = np.nonzero(flagged)
+        
+        anomalies = []
+        for i, offset in zip(series_index.tolist(), day_offset.tolist()):
+            baseline = float(expected[i, offset])
+            change = float(deviation[i, offset])
+            score = float(scores[i, offset])
+            anomalies.append({
+                'date': day_label(first_day + offset),
+                'series': dict(keys[i]),
+                'name': ' / '.join(keys[i].values()) or 'Total',
+                'cost': round(float(matrix[i, offset]), 2),
+                'expected_cost': round(baseline, 2),
+                'deviation': round(change, 2),
+                'deviation_percentage': round(change / baseline * 100, 2) if baseline > 0 else None,
+                'score': round(score, 2),
+                'direction': 'spike' if change > 0 else 'drop',
+                'severity': 'high' if abs(score) > 2 * self.threshold else 'medium',
+                'method': self.method
+            })
+        
+        anomalies.sort(key=lambda anomaly: (anomaly['date'], -abs(anomaly['score'])))
+        self.logger.info(f"Identified {len(anomalies)} anomalies across {len(keys)} series")
+        return anomalies
+    
+    def _initial_state(self, series_count: int) -> Dict[str, Any]:
+        state = {'count': np.zeros(series_count, dtype=np.int64)}
+        if self.method == 'mad':
+            # ring buffer of the trailing window; NaN until filled
+            state['history'] = np.full((series_count, self.window), np.nan)
+            state['position'] = 0
+        else:
+            state['mean'] = np.zeros(series_count)
+            state['variance'] = np.zeros(series_count)
+        return state
+    
+    def _step(self, state: Dict[str, Any], values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score one day for every series, then fold that day into the state.
+        
+        returns:
+            tuple of (scores, expected costs) for the day
+        """
+        ready = state['count'] >= self.min_periods
+        
+        if self.method == 'mad':
+            history = state['history']
+            baseline = _row_medians(history)
+            spread = MAD_TO_STD * _row_medians(np.abs(history - baseline[:, None]))
+            history[:, state['position']] = values
+            state['position'] = (state['position'] + 1) % self.window
+        else:
+            baseline = state['mean'].copy()
+            spread = np.sqrt(state['variance'])
+            first = state['count'] == 0
+            difference = values - state['mean']
+            increment = self.alpha * difference
+            state['mean'] = np.where(first, values, state['mean'] + increment)
+            state['variance'] = np.where(
+                first, 0.0, (1 - self.alpha) * (state['variance'] + difference * increment)
+            )
+        
+        state['count'] += 1
+        
+        scale = np.maximum(np.maximum(spread, self.min_scale_ratio * np.abs(baseline)), MIN_SCALE)
+        scores = (values - baseline) / scale
+        
+        return np.where(ready, scores, np.nan), np.where(ready, baseline, np.nan)
+
+
+class DetectorState:
+    """
+    Per-series detector state carried between scheduled runs: the series
+    keys, the last processed day and the running baseline (rolling window
+    buffer for mad, mean and variance for ewma). save()/load() keep it in a
+    single .npz file, so a run only reads the state and the new days.
+    """
+    
+    def __init__(self, detector: SeriesAnomalyDetector, dimensions: Sequence[str]):
+        self.settings = self._settings(detector)
+        self.dimensions = tuple(dimensions)
+        self.keys: List[Dict[str, str]] = []
+        self.first_day: Optional[int] = None
+        self.last_day: Optional[int] = None
+        self.arrays = detector._initial_state(0)
+    
+    @staticmethod
+    def _settings(detector: SeriesAnomalyDetector) -> Dict[str, Any]:
+        """detector parameters the state depends on (threshold etc. can change between runs)"""
+        return {
+            'method': detector.method,
+            'window': detector.window,
+            'min_periods': detector.min_periods,
+            'alpha': detector.alpha
+        }
+    
+    def check(self, detector: SeriesAnomalyDetector, dimensions: Sequence[str]) -> None:
+        """
+        raises:
+            ValueError: if the state was built with other detector settings or dimensions
+        """
+        if self._settings(detector) != self.settings:
+            raise ValueError(f"Detector state was built with {self.settings}, not {self._settings(detector)}")
+        if tuple(dimensions) != self.dimensions:
+            raise ValueError(f"Detector state tracks {', '.join(self.dimensions)}, not {', '.join(dimensions)}")
+    
+    def series_rows(self, detector: SeriesAnomalyDetector, keys: List[Dict[str, str]], first_day: int) -> np.ndarray:
+        """
+        state row of each key, adding unseen series with the all-zero history
+        they have in a full recompute
+        """
+        if self.first_day is None:
+            self.first_day = first_day
+        index = {tuple(key.items()): row for row, key in enumerate(self.keys)}
+        new_keys = [key for key in keys if tuple(key.items()) not in index]
+        
+        if new_keys:
+            processed = 0 if self.last_day is None else self.last_day - self.first_day + 1
+            added = detector._initial_state(len(new_keys))
+            added['count'][:] = processed
+            if 'history' in added:
+                added['history'][:, :min(processed, detector.window)] = 0.0
+            for name, values in added.items():
+                if isinstance(values, np.ndarray):
+                    self.arrays[name] = np.concatenate([self.arrays[name], values])
+            for key in new_keys:
+                index[tuple(key.items())] = len(self.keys)
+                self.keys.append(dict(key))
+        
+        return np.array([index[tuple(key.items())] for key in keys], dtype=np.int64)
+    
+    def save(self, path: str) -> None:
+        """write the state atomically to a .npz file"""
+        meta = {
+            'format_version': DETECTOR_STATE_VERSION,
+            'settings': self.settings,
+            'dimensions': list(self.dimensions),
+            'keys': self.keys,
+            'first_day': self.first_day,
+            'last_day': self.last_day,
+            'position': self.arrays.get('position')
+        }
+        arrays = {name: values for name, values in self.arrays.items() if isinstance(values, np.ndarray)}
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    @classmethod
+    def load(cls, path: str, detector: SeriesAnomalyDetector) -> 'DetectorState':
+        """
+        raises:
+            ValueError: for an unsupported format or state built with other settings
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('format_version') != DETECTOR_STATE_VERSION:
+                raise ValueError(f"Unsupported detector state version {meta.get('format_version')} in {path}")
+            arrays = {name: data[name] for name in data.files if name != 'meta'}
+        
+        state = cls(detector, meta['dimensions'])
+        if meta['settings'] != state.settings:
+            raise ValueError(f"Detector state in {path} was built with {meta['settings']}, not {state.settings}")
+        state.keys = meta['keys']
+        state.first_day = meta['first_day']
+        state.last_day = meta['last_day']
+        state.arrays.update(arrays)
+        if meta.get('position') is not None:
+            state.arrays['position'] = meta['position']
+        return state
@@ -1,50 +1,61 @@
 """Cost analysis and trend detection."""
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Sequence, Sized, Union
 from datetime import datetime, timedelta
-from collections import defaultdict
+from itertools import combinations
+import os
 import logging
 
+from ..data.billing_frame import DIMENSIONS, BillingData, as_billing_source, top_indices
+from .anomaly_detector import DetectorState, SeriesAnomalyDetector
+from .forecaster import BatchForecaster
+from .period_comparison import PeriodComparator, PeriodSpec
+from .root_cause import AnomalyExplainer
+
 logger = logging.getLogger(__name__)
 
 
 class CostAnalyzer:
     """Analyzes cloud costs and generates insights."""
     
+    # resource efficiency is measured against the whole inventory
+    REQUIRED_ASSET_TYPES = None
+    
     def __init__(self):
         self.logger = logger.getChild(self.__class__.__name__)
     
     def analyze_cost_trends(
         self, 
-        billing_data: List[Dict[str, Any]], 
+        billing_data: BillingData, 
         group_by: str = 'service'
     ) -> Dict[str, Any]:
         """
         Analyze cost trends from billing data.
         
         args:
-            billing_data: List of billing records
-            group_by: How to group the data (service, project, resource)
+            billing_data: BillingFrame, CostStore window or list of billing records
+            group_by: How to group the data (service, project, sku, region;
+                any other <field>_name of the records, e.g. resource, for a
+                list of billing records)
         
         returns:
             Dictionary with trend analysis
         """
-        if not billing_data:
-            return {
-                'status': 'no_data',
-                'message': 'No billing data available for analysis'
-            }
-        
         try:
-            # Group costs by the specified dimension
-            grouped_costs = defaultdict(float)
-            total_cost = 0.0
+            frame = as_billing_source(billing_data)
+            if len(frame) == 0:
+                return {
+                    'status': 'no_data',
+                    'message': 'No billing data available for analysis'
+                }
             
-            for record in billing_data:
-                key = record.get(f'{group_by}_name', 'Unknown')
-                cost = float(record.get('cost', 0))
-                grouped_costs[key] += cost
-                total_cost += cost
+            # Group costs by the specified dimension
+            if group_by not in DIMENSIONS and isinstance(billing_data, list):
+                # frames only encode the billing dimensions; other fields come from the records
+                grouped_costs = self._group_record_costs(billing_data, group_by)
+            else:
+                grouped_costs = frame.group_costs(group_by)
+            total_cost = frame.total_cost()
             
             # Calculate percentages
             cost_breakdown = []
@@ -67,7 +78,7 @@ class CostAnalyzer:
                 'top_cost_driver': cost_breakdown[0]['name'] if cost_breakdown else None,
                 'analysis_date': datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             self.logger.error(f"Error analyzing cost trends: {str(e)}")
             return {
@@ -75,24 +86,108 @@ class CostAnalyzer:
                 'message': str(e)
             }
     
+    @staticmethod
+    def _group_record_costs(records: List[Dict[str, Any]], group_by: str) -> Dict[str, float]:
+        grouped_costs: Dict[str, float] = {}
+        for record in records:
+            key = record.get(f'{group_by}_name') or 'Unknown'
+            grouped_costs[key] = grouped_costs.get(key, 0.0) + float(record.get('cost', 0) or 0)
+        return grouped_costs
+    
+    def analyze_cost_breakdown(
+        self,
+        billing_data: BillingData,
+        dimensions: Sequence[str] = ('service', 'project', 'sku'),
+        top_n: Optional[int] = 10,
+        cross_products: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Break costs down by several dimensions at once.
+        
+        The line items are aggregated once, to the finest grouping (every
+        dimension together); each coarser grouping is rolled up from those
+        cells, so a service/project/SKU report costs one pass over the data
+        instead of one per dimension. Top groups are selected without fully
+        sorting high-cardinality keys.
+        
+        args:
+            billing_data: BillingFrame, CostStore window or list of billing records
+            dimensions: Dimensions to group by (service, project, sku, region)
+            top_n: Groups to return per grouping (None for all of them)
+            cross_products: Also return every combination of the dimensions
+                (e.g. service+project), not just one grouping per dimension
+        
+        returns:
+            Dictionary with the top groups per grouping, keyed by the
+            '+'-joined dimension names
+        """
+        try:
+            dimensions = tuple(dimensions)
+            cells = as_billing_source(billing_data).rollup(dimensions)
+            if len(cells) == 0:
+                return {
+                    'status': 'no_data',
+                    'message': 'No billing data available for analysis'
+                }
+            
+            total_cost = cells.total_cost()
+            sizes = range(1, len(dimensions) + 1) if cross_products else [1]
+            groupings = [grouping for size in sizes for grouping in combinations(dimensions, size)]
+            
+            breakdowns = {}
+            for grouping in groupings:
+                grouped = cells if grouping == dimensions else cells.rollup(grouping)
+                labels = {dimension: grouped.categories[dimension] for dimension in grouping}
+                
+                top = []
+                for i in top_indices(grouped.cost, top_n):
+                    key = {dimension: labels[dimension][grouped.codes[dimension][i]] for dimension in grouping}
+                    cost = float(grouped.cost[i])
+                    top.append({
+                        'name': ' / '.join(key.values()),
+                        'key': key,
+                        'cost': round(cost, 2),
+                        'percentage': round(cost / total_cost * 100, 2) if total_cost > 0 else 0
+                    })
+                
+                breakdowns['+'.join(grouping)] = {
+                    'dimensions': list(grouping),
+                    'group_count': len(grouped),
+                    'top': top
+                }
+            
+            return {
+                'status': 'success',
+                'total_cost': round(total_cost, 2),
+                'groupings': breakdowns,
+                'analysis_date': datetime.now().isoformat()
+            }
+        
+        except Exception as e:
+            self.logger.error(f"Error analyzing cost breakdown: {str(e)}")
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+    
     def compare_periods(
         self,
-        current_data: List[Dict[str, Any]],
-        previous_data: List[Dict[str, Any]]
+        current_data: BillingData,
+        previous_data: BillingData
     ) -> Dict[str, Any]:
         """
         Compare costs between two time periods.
         
         args:
-            current_data: Billing data for current period
-            previous_data: Billing data for previous period
+            current_data: Billing data (frame, store window or records) for current period
+            previous_data: Billing data (frame, store window or records) for previous period
         
         returns:
             comparison analysis
         """
         try:
-            current_total = sum(float(r.get('cost', 0)) for r in current_data)
-            previous_total = sum(float(r.get('cost', 0)) for r in previous_data)
+            current_total = as_billing_source(current_data).total_cost()
+            previous_total = as_billing_source(previous_data).total_cost()
             
             if previous_total == 0:
                 percentage_change = 100.0 if current_total > 0 else 0.0
@@ -107,7 +202,7 @@ class CostAnalyzer:
                 'trend': 'increasing' if current_total > previous_total else 'decreasing',
                 'analysis_date': datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             self.logger.error(f"Error comparing periods: {str(e)}")
             return {
@@ -115,16 +210,51 @@ class CostAnalyzer:
                 'message': str(e)
             }
     
+    def compare_period_groups(
+        self,
+        billing_data: BillingData,
+        period: PeriodSpec = 'wow',
+        dimensions: Sequence[str] = ('service',),
+        end_date: Optional[Union[str, datetime]] = None,
+        top_n: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare two periods for every group of each dimension in one pass.
+        
+        args:
+            billing_data: BillingFrame, DailyCostCube, CostStore window or records
+            period: 'wow', 'mom', 'dod', '4w', a number of trailing days, or
+                ((current_start, current_end), (previous_start, previous_end))
+            dimensions: Dimensions whose groups are compared
+            end_date: Last day of the current period (default: last day with data)
+            top_n: Groups to return per dimension, ranked by absolute change
+        
+        returns:
+            period totals and per-dimension group deltas
+        """
+        try:
+            comparator = PeriodComparator(period=period, top_n=top_n)
+            result = comparator.compare(billing_data, dimensions, end_date)
+            result['analysis_date'] = datetime.now().isoformat()
+            return result
+        
+        except Exception as e:
+            self.logger.error(f"Error comparing period groups: {str(e)}")
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+    
     def identify_anomalies(
         self,
-        billing_data: List[Dict[str, Any]],
+        billing_data: BillingData,
         threshold_percentage: float = 20.0
     ) -> List[Dict[str, Any]]:
         """
         Identify cost anomalies or spikes.
         
         args:
-            billing_data: List of billing records with timestamps
+            billing_data: BillingFrame, CostStore window or billing records with timestamps
             threshold_percentage: Percentage threshold for anomaly detection
         
         returns:
@@ -134,14 +264,7 @@ class CostAnalyzer:
         
         try:
             # Group by date
-            daily_costs = defaultdict(float)
-            for record in billing_data:
-                date_str = record.get('date', record.get('collection_date', 'Unknown'))
-                if date_str != 'Unknown':
-                    # Extract just the date part
-                    date = date_str.split('T')[0]
-                    cost = float(record.get('cost', 0))
-                    daily_costs[date] += cost
+            daily_costs = as_billing_source(billing_data).daily_costs()
             
             if len(daily_costs) < 2:
                 return anomalies
@@ -164,57 +287,149 @@ class CostAnalyzer:
                     })
             
             self.logger.info(f"Identified {len(anomalies)} cost anomalies")
-            
+        
         except Exception as e:
             self.logger.error(f"Error identifying anomalies: {str(e)}")
         
         return anomalies
     
+    def identify_series_anomalies(
+        self,
+        billing_data: BillingData,
+        dimensions: Sequence[str] = ('service',),
+        method: str = 'mad',
+        window: int = 14,
+        threshold: float = 3.5,
+        state_path: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Identify anomalous days per service/project series.
+        
+        Unlike identify_anomalies, each series is compared to its own
+        trailing baseline (rolling median/MAD or EWMA), so trending spend
+        isn't flagged day after day. See SeriesAnomalyDetector.
+        
+        args:
+            billing_data: BillingFrame, CostStore window or billing records
+            dimensions: Dimensions that define a series
+            method: Baseline method ('mad' or 'ewma')
+            window: Trailing days in the rolling baseline
+            threshold: Robust z-score above which a day is anomalous
+            state_path: Detector state file; when given, only days after the
+                last run are scored and the state is saved for the next run
+        
+        returns:
+            list of detected anomalies with the series they belong to
+        """
+        try:
+            detector = SeriesAnomalyDetector(method=method, window=window, threshold=threshold)
+            if state_path is None:
+                return detector.detect(billing_data, dimensions)
+            
+            state = DetectorState.load(state_path, detector) if os.path.exists(state_path) else None
+            anomalies, state = detector.detect_incremental(billing_data, state, dimensions)
+            state.save(state_path)
+            return anomalies
+        except Exception as e:
+            self.logger.error(f"Error identifying series anomalies: {str(e)}")
+            return []
+    
+    def explain_anomalies(
+        self,
+        billing_data: BillingData,
+        anomalies: List[Dict[str, Any]],
+        dimensions: Sequence[str] = ('service', 'project', 'sku'),
+        baseline_days: int = 7,
+        top_n: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Drill anomalies down to the dimension values that explain them.
+        
+        args:
+            billing_data: BillingFrame, DailyCostCube, CostStore window or records
+            anomalies: Output of identify_anomalies or identify_series_anomalies
+            dimensions: Dimensions to rank contributors in
+            baseline_days: Trailing days whose mean is each value's expected cost
+            top_n: Contributors to keep per dimension
+        
+        returns:
+            the anomalies with 'root_causes' per dimension (see AnomalyExplainer)
+        """
+        try:
+            explainer = AnomalyExplainer(dimensions=dimensions, baseline_days=baseline_days, top_n=top_n)
+            return explainer.explain(billing_data, anomalies)
+        except Exception as e:
+            self.logger.error(f"Error explaining anomalies: {str(e)}")
+            return anomalies
+    
     def generate_budget_forecast(
         self,
-        historical_data: List[Dict[str, Any]],
-        forecast_days: int = 30
+        historical_data: BillingData,
+        forecast_days: int = 30,
+        confidence_level: float = 0.8
     ) -> Dict[str, Any]:
         """
-        Generate simple budget forecast based on historical trends.
+        Generate a budget forecast from historical daily costs.
+        
+        Fits trend plus day-of-week seasonality to the daily totals (see
+        BatchForecaster); with less than a week of history it falls back to
+        the daily average.
         
         args:
-            historical_data: Historical billing records
+            historical_data: Historical billing data (frame, store window or records)
             forecast_days: Number of days to forecast
+            confidence_level: Coverage of the prediction interval
         
         returns:
             forecast information
         """
         try:
-            if not historical_data:
+            frame = as_billing_source(historical_data)
+            if len(frame) == 0:
                 return {
                     'status': 'insufficient_data',
                     'message': 'Need historical data for forecasting'
                 }
             
             # Calculate daily average
-            total_cost = sum(float(r.get('cost', 0)) for r in historical_data)
-            days_in_data = len(set(
-                r.get('date', r.get('collection_date', '')).split('T')[0] 
-                for r in historical_data
-            ))
+            total_cost = frame.total_cost()
+            days_in_data = frame.day_count()
             
             if days_in_data == 0:
                 days_in_data = 1
             
             daily_avg = total_cost / days_in_data
-            forecasted_cost = daily_avg * forecast_days
-            
-            return {
+            result = {
                 'status': 'success',
                 'historical_daily_average': round(daily_avg, 2),
-                'forecast_period_days': forecast_days,
-                'forecasted_total': round(forecasted_cost, 2),
-                'confidence': 'low',  # Simple average has low confidence
-                'method': 'simple_moving_average',
-                'generated_date': datetime.now().isoformat()
+                'forecast_period_days': forecast_days
             }
             
+            forecaster = BatchForecaster(confidence_level=confidence_level)
+            _, first_day, matrix = frame.daily_series(())
+            if matrix.shape[1] < forecaster.min_trend_days:
+                result.update({
+                    'forecasted_total': round(daily_avg * forecast_days, 2),
+                    'confidence': 'low',  # Simple average has low confidence
+                    'method': 'simple_moving_average'
+                })
+            else:
+                fitted = forecaster.fit_predict(matrix, first_day, forecast_days)
+                forecasted = float(fitted['total'][0])
+                lower = float(fitted['total_lower'][0])
+                upper = float(fitted['total_upper'][0])
+                result.update({
+                    'forecasted_total': round(forecasted, 2),
+                    'lower_bound': round(lower, 2),
+                    'upper_bound': round(upper, 2),
+                    'confidence_level': confidence_level,
+                    'confidence': self._forecast_confidence(forecasted, lower, upper),
+                    'method': 'linear_trend_weekly' if 'weekday' in fitted['terms'] else 'linear_trend'
+                })
+            
+            result['generated_date'] = datetime.now().isoformat()
+            return result
+        
         except Exception as e:
             self.logger.error(f"Error generating forecast: {str(e)}")
             return {
@@ -222,24 +437,64 @@ class CostAnalyzer:
                 'message': str(e)
             }
     
+    def forecast_budgets(
+        self,
+        billing_data: BillingData,
+        dimensions: Sequence[str] = ('service',),
+        forecast_days: int = 30,
+        confidence_level: float = 0.8
+    ) -> List[Dict[str, Any]]:
+        """
+        Forecast every service/project series in one batch.
+        
+        args:
+            billing_data: BillingFrame, CostStore window or billing records
+            dimensions: Dimensions that define a series
+            forecast_days: Number of days to forecast
+            confidence_level: Coverage of the prediction intervals
+        
+        returns:
+            per-series forecasts with prediction intervals, largest first
+        """
+        try:
+            forecaster = BatchForecaster(confidence_level=confidence_level)
+            return forecaster.forecast(billing_data, dimensions, forecast_days)
+        except Exception as e:
+            self.logger.error(f"Error forecasting budgets: {str(e)}")
+            return []
+    
+    def _forecast_confidence(self, forecasted: float, lower: float, upper: float) -> str:
+        """
+        Rate a forecast by the width of its prediction interval relative to the forecast.
+        """
+        if forecasted <= 0:
+            return 'low'
+        relative_width = (upper - lower) / forecasted
+        if relative_width <= 0.2:
+            return 'high'
+        elif relative_width <= 0.5:
+            return 'medium'
+        else:
+            return 'low'
+    
     def calculate_resource_efficiency(
         self,
-        resources: List[Dict[str, Any]],
-        idle_resources: List[Dict[str, Any]]
+        resources: Union[Iterable[Dict[str, Any]], int],
+        idle_resources: Union[Iterable[Dict[str, Any]], int]
     ) -> Dict[str, Any]:
         """
         Calculate resource efficiency metrics.
         
         args:
-            resources: All resources
-            idle_resources: Idle or underutilized resources
+            resources: All resources - a list, a streaming iterator or a count
+            idle_resources: Idle or underutilized resources (same forms)
         
         returns:
             efficiency metrics
         """
         try:
-            total_resources = len(resources)
-            idle_count = len(idle_resources)
+            total_resources = self._count_items(resources)
+            idle_count = self._count_items(idle_resources)
             
             if total_resources == 0:
                 utilization_rate = 0
@@ -254,7 +509,7 @@ class CostAnalyzer:
                 'efficiency_grade': self._get_efficiency_grade(utilization_rate),
                 'analysis_date': datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             self.logger.error(f"Error calculating efficiency: {str(e)}")
             return {
@@ -262,6 +517,16 @@ class CostAnalyzer:
                 'message': str(e)
             }
     
+    def _count_items(self, items: Union[Iterable[Any], int]) -> int:
+        """
+        count a list, an iterator (consumed in constant memory) or a precomputed count
+        """
+        if isinstance(items, int):
+            return items
+        if isinstance(items, Sized):
+            return len(items)
+        return sum(1 for _ in items)
+    
     def _get_efficiency_grade(self, utilization_rate: float) -> str:
         """
         get efficiency grade based on utilization rate.
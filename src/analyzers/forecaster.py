@@ -0,0 +1,169 @@
+"""Batch trend + weekly seasonality forecasts for many daily cost series."""
+
+from typing import Dict, List, Any, Sequence
+from statistics import NormalDist
+import logging
+
+import numpy as np
+
+from ..data.billing_frame import BillingData, as_billing_source, day_label
+
+logger = logging.getLogger(__name__)
+
+# 1970-01-01 (day index 0) was a Thursday; Monday is weekday 0
+_EPOCH_WEEKDAY = 3
+
+
+class BatchForecaster:
+    """
+    Least-squares forecasts for every series of a series x day matrix at once.
+    
+    Each series is modelled as intercept + linear trend + day-of-week
+    offsets. All series share the same design matrix, so a single
+    np.linalg.lstsq call with one right-hand side per series fits thousands
+    of services or projects together. Prediction intervals come from each
+    series' residual variance and the usual regression forecast variance,
+    using a normal quantile (statistics.NormalDist).
+    
+    Short histories fall back to simpler models: no weekday terms below
+    `min_weekly_days` days and no trend below `min_trend_days`.
+    """
+    
+    def __init__(
+        self,
+        confidence_level: float = 0.8,
+        weekly: bool = True,
+        min_trend_days: int = 7,
+        min_weekly_days: int = 14
+    ):
+        """
+        args:
+            confidence_level: Coverage of the prediction intervals (0-1)
+            weekly: Fit day-of-week seasonality when there is enough history
+            min_trend_days: Days of history needed to fit a trend
+            min_weekly_days: Days of history needed to fit weekday offsets
+        """
+        if not 0 < confidence_level < 1:
+            raise ValueError("confidence_level must be between 0 and 1")
+        
+        self.confidence_level = confidence_level
+        self.weekly = weekly
+        self.min_trend_days = min_trend_days
+        self.min_weekly_days = min_weekly_days
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    def fit_predict(self, matrix: np.ndarray, first_day: int, horizon: int) -> Dict[str, Any]:
+        """
+        Fit every series and forecast the `horizon` days after the matrix.
+        
+        args:
+            matrix: Daily costs, one row per series and one column per day
+            first_day: Day index of the first column
+            horizon: Days to forecast
+        
+        returns:
+            dict of arrays, one entry per series unless noted: daily,
+            daily_lower, daily_upper (series x horizon), total, total_lower,
+            total_upper, trend_per_day, residual_std, plus the model terms
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        series_count, days = matrix.shape
+        if days == 0:
+            raise ValueError("Need at least one day of history to forecast")
+        
+        terms = self._terms(days)
+        history = self._design(np.arange(days), first_day, days, terms)
+        future = self._design(np.arange(days, days + horizon), first_day, days, terms)
+        
+        coefficients = np.linalg.lstsq(history, matrix.T, rcond=None)[0]
+        residuals = matrix.T - history @ coefficients
+        dof = days - history.shape[1]
+        variance = (residuals ** 2).sum(axis=0) / dof if dof > 0 else np.zeros(series_count)
+        
+        # forecast variance: noise plus coefficient uncertainty, per day and summed
+        precision = np.linalg.pinv(history.T @ history)
+        leverage = np.einsum('ij,jk,ik->i', future, precision, future)
+        summed = future.sum(axis=0)
+        total_leverage = horizon + summed @ precision @ summed
+        
+        z = NormalDist().inv_cdf(0.5 + self.confidence_level / 2)
+        daily = (future @ coefficients).T
+        daily_margin = z * np.sqrt(np.outer(variance, 1 + leverage))
+        total = daily.sum(axis=1)
+        total_margin = z * np.sqrt(variance * total_leverage)
+        
+        # costs can't go negative; clip the reported values, not the fit
+        return {
+            'daily': np.maximum(daily, 0),
+            'daily_lower': np.maximum(daily - daily_margin, 0),
+            'daily_upper': np.maximum(daily + daily_margin, 0),
+            'total': np.maximum(total, 0),
+            'total_lower': np.maximum(total - total_margin, 0),
+            'total_upper': np.maximum(total + total_margin, 0),
+            'trend_per_day': coefficients[1] / days if 'trend' in terms else np.zeros(series_count),
+            'residual_std': np.sqrt(variance),
+            'terms': terms,
+            'first_forecast_day': first_day + days
+        }
+    
+    def forecast(
+        self,
+        billing_data: BillingData,
+        dimensions: Sequence[str] = ('service',),
+        horizon: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Forecast every series of the billing data.
+        
+        args:
+            billing_data: BillingFrame, CostStore window or billing records
+            dimensions: Dimensions that define a series (() for the total)
+            horizon: Days to forecast
+        
+        returns:
+            one forecast per series, largest forecast total first
+        """
+        keys, first_day, matrix = as_billing_source(billing_data).daily_series(tuple(dimensions))
+        if not keys:
+            return []
+        
+        fitted = self.fit_predict(matrix, first_day, horizon)
+        start = day_label(fitted['first_forecast_day'])
+        end = day_label(fitted['first_forecast_day'] + horizon - 1)
+        
+        forecasts = []
+        for i in np.argsort(-fitted['total'], kind='stable').tolist():
+            forecasts.append({
+                'series': dict(keys[i]),
+                'name': ' / '.join(keys[i].values()) or 'Total',
+                'forecast_start': start,
+                'forecast_end': end,
+                'forecasted_total': round(float(fitted['total'][i]), 2),
+                'lower_bound': round(float(fitted['total_lower'][i]), 2),
+                'upper_bound': round(float(fitted['total_upper'][i]), 2),
+                'daily_trend': round(float(fitted['trend_per_day'][i]), 4),
+                'residual_std': round(float(fitted['residual_std'][i]), 2)
+            })
+        
+        self.logger.info(f"Forecast {len(forecasts)} series over {horizon} days ({', '.join(fitted['terms'])})")
+        return forecasts
+    
+    def _terms(self, days: int) -> List[str]:
+        terms = ['intercept']
+        if days >= self.min_trend_days:
+            terms.append('trend')
+        if self.weekly and days >= self.min_weekly_days:
+            terms.append('weekday')
+        return terms
+    
+    @staticmethod
+    def _design(offsets: np.ndarray, first_day: int, days: int, terms: Sequence[str]) -> np.ndarray:
+        """regression columns for the given day offsets (trend scaled to the history length)"""
+        columns = [np.ones(len(offsets))]
+        if 'trend' in terms:
+            columns.append(offsets / days)
+        if 'weekday' in terms:
+            weekdays = (first_day + offsets + _EPOCH_WEEKDAY) % 7
+            # Monday is the baseline; one offset column per other weekday
+            columns.extend((weekdays == weekday).astype(np.float64) for weekday in range(1, 7))
+        return np.column_stack(columns)
@@ -0,0 +1,174 @@
+"""Period-over-period cost deltas for every group of one or more dimensions."""
+
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+from datetime import date, datetime, timedelta
+import calendar
+import logging
+
+import numpy as np
+
+from ..data.billing_frame import MISSING_DAY, BillingData, as_billing_source, day_index, day_label, top_indices
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[str, date, datetime]
+
+# trailing windows of this many days, compared to the same span just before
+PERIOD_DAYS = {'dod': 1, 'wow': 7, '4w': 28}
+
+PeriodSpec = Union[str, int, Tuple[Tuple[DateLike, DateLike], Tuple[DateLike, DateLike]]]
+
+
+def resolve_periods(period: PeriodSpec, end: DateLike) -> Tuple[Tuple[date, date], Tuple[date, date]]:
+    """
+    Turn a period spec into inclusive (start, end) dates for the current and
+    previous period.
+    
+    args:
+        period: 'dod', 'wow' or '4w' (trailing days), 'mom' (month to date
+            vs the same days of the previous month), a number of trailing
+            days, or explicit ((current_start, current_end), (previous_start, previous_end))
+        end: Last day of the current period for the named and numeric specs
+    
+    raises:
+        ValueError: for an unknown spec
+    """
+    end = _as_date(end)
+    if isinstance(period, str) and period in PERIOD_DAYS:
+        period = PERIOD_DAYS[period]
+    
+    if isinstance(period, int) and not isinstance(period, bool):
+        if period < 1:
+            raise ValueError("A period must span at least one day")
+        current_start = end - timedelta(days=period - 1)
+        previous_end = current_start - timedelta(days=1)
+        return (current_start, end), (previous_end - timedelta(days=period - 1), previous_end)
+    
+    if period == 'mom':
+        current_start = end.replace(day=1)
+        previous_month_end = current_start - timedelta(days=1)
+        # month to date: same day of month, clipped to a shorter previous month
+        previous_end = previous_month_end.replace(
+            day=min(end.day, calendar.monthrange(previous_month_end.year, previous_month_end.month)[1])
+        )
+        return (current_start, end), (previous_month_end.replace(day=1), previous_end)
+    
+    if isinstance(period, (tuple, list)) and len(period) == 2:
+        (current_start, current_end), (previous_start, previous_end) = period
+        return (_as_date(current_start), _as_date(current_end)), (_as_date(previous_start), _as_date(previous_end))
+    
+    raise ValueError(f"Unknown period: {period!r} (expected one of dod, wow, 4w, mom, a day count or two date ranges)")
+
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class PeriodComparator:
+    """
+    Compares two periods for every group of the requested dimensions.
+    
+    The billing data is rolled up once to (day, dimensions) cells; each
+    dimension's current and previous totals then come from one bincount over
+    the cells (group code x period), and the groups are ranked by absolute
+    change with a partial selection instead of a full sort.
+    """
+    
+    def __init__(self, period: PeriodSpec = 'wow', top_n: Optional[int] = None):
+        """
+        args:
+            period: Period spec (see resolve_periods)
+            top_n: Groups to return per dimension (None for all of them)
+        """
+        self.period = period
+        self.top_n = top_n
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    def compare(
+        self,
+        billing_data: BillingData,
+        dimensions: Sequence[str] = ('service',),
+        end_date: Optional[DateLike] = None
+    ) -> Dict[str, Any]:
+        """
+        Per-group deltas between the current and the previous period.
+        
+        args:
+            billing_data: BillingFrame, DailyCostCube, CostStore window or records
+            dimensions: Dimensions whose groups are compared
+            end_date: Last day of the current period (default: last day with data)
+        
+        returns:
+            period bounds, overall totals and, per dimension, the groups
+            ranked by absolute change
+        """
+        dimensions = tuple(dimensions)
+        cells = as_billing_source(billing_data).rollup(dimensions, by_day=True)
+        cells = cells.take(cells.day != MISSING_DAY)
+        if len(cells) == 0:
+            return {
+                'status': 'no_data',
+                'message': 'No dated billing data available for comparison'
+            }
+        
+        end = end_date if end_date is not None else day_label(int(cells.day.max()))
+        current, previous = resolve_periods(self.period, end)
+        in_current = (cells.day >= day_index(current[0])) & (cells.day <= day_index(current[1]))
+        in_previous = (cells.day >= day_index(previous[0])) & (cells.day <= day_index(previous[1]))
+        selected = in_current | in_previous
+        # period slot per cell: 0 current, 1 previous
+        slot = np.where(in_current, 0, 1)[selected]
+        cost = cells.cost[selected]
+        
+        current_total = float(cost[slot == 0].sum())
+        previous_total = float(cost[slot == 1].sum())
+        groupings = {}
+        for dimension in dimensions:
+            codes = cells.codes[dimension][selected].astype(np.int64)
+            size = len(cells.categories[dimension])
+            totals = np.bincount(codes * 2 + slot, weights=cost, minlength=2 * size).reshape(size, 2)
+            present = np.flatnonzero(np.bincount(codes, minlength=size))
+            groupings[dimension] = {
+                'group_count': len(present),
+                'groups': self._ranked(cells.categories[dimension], present, totals)
+            }
+        
+        return {
+            'status': 'success',
+            'period': self.period if isinstance(self.period, (str, int)) else 'custom',
+            'current_period': {'start': current[0].isoformat(), 'end': current[1].isoformat()},
+            'previous_period': {'start': previous[0].isoformat(), 'end': previous[1].isoformat()},
+            **self._delta(current_total, previous_total),
+            'groupings': groupings
+        }
+    
+    def _ranked(self, categories: List[str], present: np.ndarray, totals: np.ndarray) -> List[Dict[str, Any]]:
+        current = totals[present, 0]
+        previous = totals[present, 1]
+        groups = []
+        for i in top_indices(np.abs(current - previous), self.top_n).tolist():
+            groups.append({
+                'name': categories[present[i]],
+                **self._delta(float(current[i]), float(previous[i]))
+            })
+        return groups
+    
+    @staticmethod
+    def _delta(current: float, previous: float) -> Dict[str, Any]:
+        if previous == 0:
+            status = 'new' if current > 0 else 'unchanged'
+        elif current == 0:
+            status = 'removed'
+        else:
+            status = 'increased' if current > previous else 'decreased' if current < previous else 'unchanged'
+        return {
+            'current_cost': round(current, 2),
+            'previous_cost': round(previous, 2),
+            'absolute_change': round(current - previous, 2),
+            'percentage_change': round((current - previous) / previous * 100, 2) if previous else None,
+            'change': status
+        }
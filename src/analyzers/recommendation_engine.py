@@ -1,4 +1,4 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 import logging
@@ -16,6 +16,14 @@ class RecommendationPriority(Enum):
 class RecommendationEngine:
     """consolidates and prioritizes cost optimization recommendations"""
     
+    # idle instances plus the unused disks, static IPs and snapshots we price
+    REQUIRED_ASSET_TYPES = (
+        'compute.googleapis.com/Instance',
+        'compute.googleapis.com/Disk',
+        'compute.googleapis.com/Address',
+        'compute.googleapis.com/Snapshot',
+    )
+    
     def __init__(self):
         self.logger = logger.getChild(self.__class__.__name__)
         self.recommendations = []
@@ -100,6 +108,13 @@ class RecommendationEngine:
             }
             self.recommendations.append(rec)
     
+    def add_snapshot_recommendations(self, snapshot: Any) -> None:
+        """
+        recommendations from a saved scan (src.data.Snapshot) without re-collecting
+        """
+        self.add_idle_instance_recommendations(snapshot.idle_instances)
+        self.logger.info(f"Loaded {len(snapshot.idle_instances)} idle instances from snapshot {snapshot.directory}")
+    
     def add_cost_anomaly_recommendations(
         self,
         anomalies: List[Dict[str, Any]]
@@ -109,16 +124,25 @@ class RecommendationEngine:
             priority = (RecommendationPriority.CRITICAL if severity == 'high' 
                        else RecommendationPriority.HIGH)
             
+            direction, change = self._anomaly_change(anomaly)
+            action = f"Investigate {change} cost {'decrease' if direction == 'drop' else 'increase'}"
+            cause = self._top_root_cause(anomaly.get('root_causes'))
+            if cause:
+                action += f", mostly {cause}"
+            
             rec = {
                 'type': 'cost_anomaly',
                 'resource_type': 'billing',
                 'date': anomaly.get('date'),
-                'recommendation': f"Cost spike detected on {anomaly.get('date')}",
-                'action': f"Investigate {anomaly.get('deviation_percentage', 0):.1f}% cost increase",
+                'recommendation': f"Cost {direction} detected on {anomaly.get('date')}",
+                'action': action,
                 'anomaly_details': {
                     'actual_cost': anomaly.get('cost'),
-                    'expected_cost': anomaly.get('average_cost'),
-                    'deviation_percentage': anomaly.get('deviation_percentage')
+                    # series detectors report a per-series baseline instead of the period average
+                    'expected_cost': anomaly.get('expected_cost', anomaly.get('average_cost')),
+                    'deviation_percentage': anomaly.get('deviation_percentage'),
+                    # filled in by CostAnalyzer.explain_anomalies
+                    'root_causes': anomaly.get('root_causes', {})
                 },
                 'priority': priority,
                 'confidence': 'medium',
@@ -128,6 +152,41 @@ class RecommendationEngine:
             }
             self.recommendations.append(rec)
     
+    @staticmethod
+    def _anomaly_change(anomaly: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        returns:
+            tuple of (spike or drop, size of the change as text) - the
+            percentage, or the absolute change when there is no baseline to
+            compare against (deviation_percentage is None)
+        """
+        percentage = anomaly.get('deviation_percentage')
+        deviation = anomaly.get('deviation')
+        if deviation is None and anomaly.get('cost') is not None:
+            expected = anomaly.get('expected_cost', anomaly.get('average_cost'))
+            deviation = anomaly['cost'] - expected if expected is not None else None
+        
+        direction = anomaly.get('direction')
+        if direction is None:
+            sign = percentage if percentage is not None else deviation or 0
+            direction = 'drop' if sign < 0 else 'spike'
+        
+        if percentage is not None:
+            return direction, f"{abs(percentage):.1f}%"
+        return direction, f"{abs(deviation or 0):,.2f}"
+    
+    @staticmethod
+    def _top_root_cause(root_causes: Optional[Dict[str, List[Dict[str, Any]]]]) -> Optional[str]:
+        """largest contributor of the most specific dimension, e.g. 'sku N1 Cores (+120.00, 80% of the change)'"""
+        for dimension, contributors in reversed(list((root_causes or {}).items())):
+            if not contributors:
+                continue
+            top = contributors[0]
+            share = top.get('contribution_percentage')
+            share = f", {share:.0f}% of the change" if share is not None else ''
+            return f"{dimension} {top['name']} ({top['deviation']:+,.2f}{share})"
+        return None
+    
     def get_prioritized_recommendations(
         self,
         max_recommendations: Optional[int] = None,
@@ -239,7 +298,7 @@ class RecommendationEngine:
         }
         
         return cost_map.get(machine_type, 50.0)  # default estimate
-
+    
     def _estimate_resource_cost(self, resource: Dict[str, Any]) -> float:
         resource_type = resource.get('type', '')
         
@@ -9,6 +9,8 @@ logger = logging.getLogger(__name__)
 class RightsizingAnalyzer:
     """analyzes resource utilization and provides rightsizing recommendations"""
     
+    REQUIRED_ASSET_TYPES = ('compute.googleapis.com/Instance',)
+    
     # GCP machine type specifications (simplified subset)
     MACHINE_TYPES = {
         'e2-micro': {'vcpus': 0.25, 'memory_gb': 1, 'cost_per_hour': 0.008},
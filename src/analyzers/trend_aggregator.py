@@ -0,0 +1,132 @@
+"""Streaming cost trend aggregation over chunks of billing line items."""
+
+from typing import Dict, Any, Iterable, Optional, Sequence
+from datetime import datetime
+import logging
+
+from ..data.billing_frame import DIMENSIONS, BillingData, as_billing_frame
+
+logger = logging.getLogger(__name__)
+
+
+class CostTrendAggregator:
+    """
+    Online version of CostAnalyzer.analyze_cost_trends.
+    
+    update() folds one chunk of billing data into running per-category and
+    per-day totals, so memory is bounded by the number of distinct services,
+    projects, SKUs, regions and days rather than by the line items. merge()
+    combines aggregators that consumed disjoint chunks (e.g. one per worker
+    or per export file), and the state is plain dicts, so it pickles across
+    processes.
+    """
+    
+    def __init__(self, dimensions: Sequence[str] = DIMENSIONS):
+        """
+        args:
+            dimensions: Dimensions to keep totals for (service, project, sku, region)
+        """
+        if not dimensions:
+            raise ValueError("At least one dimension is required")
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+        
+        self.dimensions = tuple(dimensions)
+        self.costs: Dict[str, Dict[str, float]] = {dimension: {} for dimension in self.dimensions}
+        self.daily: Dict[str, float] = {}
+        self.total_cost = 0.0
+        self.line_items = 0
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    def update(self, chunk: BillingData) -> 'CostTrendAggregator':
+        """
+        Add one chunk (a BillingFrame or a list of billing records).
+        
+        returns:
+            the aggregator, so calls can be chained
+        """
+        frame = as_billing_frame(chunk)
+        if len(frame) == 0:
+            return self
+        
+        for dimension in self.dimensions:
+            self._add(self.costs[dimension], frame.group_costs(dimension))
+        self._add(self.daily, frame.daily_costs())
+        self.total_cost += frame.total_cost()
+        self.line_items += len(frame)
+        return self
+    
+    def consume(self, chunks: Iterable[BillingData]) -> 'CostTrendAggregator':
+        """
+        Add every chunk of a stream, e.g. BillingExportCollector.iter_chunks().
+        Only one chunk is held in memory at a time.
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+    
+    def merge(self, other: 'CostTrendAggregator') -> 'CostTrendAggregator':
+        """
+        Fold in the totals of an aggregator that saw other chunks.
+        
+        raises:
+            ValueError: if the aggregators track different dimensions
+        """
+        if other.dimensions != self.dimensions:
+            raise ValueError(
+                f"Cannot merge aggregators over {', '.join(other.dimensions)} "
+                f"into one over {', '.join(self.dimensions)}"
+            )
+        
+        for dimension in self.dimensions:
+            self._add(self.costs[dimension], other.costs[dimension])
+        self._add(self.daily, other.daily)
+        self.total_cost += other.total_cost
+        self.line_items += other.line_items
+        return self
+    
+    def result(self, group_by: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Trend analysis over everything seen so far.
+        
+        args:
+            group_by: Dimension for the breakdown (default: the first tracked one)
+        
+        returns:
+            Dictionary shaped like CostAnalyzer.analyze_cost_trends, plus
+            line_items and daily_costs
+        """
+        group_by = group_by or self.dimensions[0]
+        if group_by not in self.costs:
+            raise ValueError(f"Dimension {group_by} is not tracked (tracking {', '.join(self.dimensions)})")
+        
+        if self.line_items == 0:
+            return {
+                'status': 'no_data',
+                'message': 'No billing data available for analysis'
+            }
+        
+        cost_breakdown = []
+        for name, cost in sorted(self.costs[group_by].items(), key=lambda x: x[1], reverse=True):
+            percentage = (cost / self.total_cost * 100) if self.total_cost > 0 else 0
+            cost_breakdown.append({
+                'name': name,
+                'cost': round(cost, 2),
+                'percentage': round(percentage, 2)
+            })
+        
+        return {
+            'status': 'success',
+            'total_cost': round(self.total_cost, 2),
+            'breakdown': cost_breakdown,
+            'top_cost_driver': cost_breakdown[0]['name'] if cost_breakdown else None,
+            'line_items': self.line_items,
+            'daily_costs': dict(sorted(self.daily.items())),
+            'analysis_date': datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _add(totals: Dict[str, float], values: Dict[str, float]) -> None:
+        for key, value in values.items():
+            totals[key] = totals.get(key, 0.0) + value
@@ -1,4 +1,8 @@
 from .base_collector import BaseCollector
 from .gcp_collector import GCPCollector
+from .billing_export_collector import BillingExportCollector
+from .async_gcp_collector import AsyncGCPCollector
+from .multi_project import MultiProjectScanner
+from .resource_record import ResourceRecord
 
-__all__ = ['BaseCollector', 'GCPCollector']
\ No newline at end of file
+__all__ = ['BaseCollector', 'GCPCollector', 'BillingExportCollector', 'AsyncGCPCollector', 'MultiProjectScanner', 'ResourceRecord']
\ No newline at end of file
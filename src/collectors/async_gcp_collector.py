@@ -0,0 +1,298 @@
+import asyncio
+import functools
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+from datetime import datetime
+import logging
+
+from .gcp_collector import GCPCollector, _copy_result, asset, billing, compute
+from .response_cache import PartialResult
+from .resource_record import ResourceRecord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_CONCURRENCY = {
+    'billing': 4,
+    'asset': 4,
+    'compute': 8
+}
+
+
+class AsyncGCPCollector(GCPCollector):
+    """
+    asyncio-native GCP collector.
+    
+    same configuration and record formats as GCPCollector, but every public
+    collection method is a coroutine so billing, asset and compute calls can
+    overlap. billing and asset use the SDK async clients; compute has no async
+    client, so its blocking calls run on the default executor. each API gets
+    its own concurrency limit (collection.api_concurrency) and every call
+    goes through the same per-API rate limiters as the sync collector.
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        
+        collection_config = self.config.get('collection') or {}
+        self.api_concurrency = dict(DEFAULT_API_CONCURRENCY)
+        self.api_concurrency.update(collection_config.get('api_concurrency') or {})
+        
+        # semaphores bind to the running loop, so they are created on first use
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    async def authenticate(self) -> bool:
+        
+        try:
+            if not self._load_credentials():
+                return False
+            await self._run_blocking(self._prepare_access_token)
+            
+            self.billing_client = billing.CloudBillingAsyncClient(credentials=self.credentials)
+            self.asset_client = asset.AssetServiceAsyncClient(credentials=self.credentials)
+            self.compute_client = compute.InstancesClient(credentials=self.credentials)
+            
+            if self.lazy_auth:
+                self.logger.info(f"Lazy authentication: skipping API probe for project: {self.project_id}")
+                return True
+            
+            # test authentication with a simple API call
+            try:
+                project_name = f"projects/{self.project_id}"
+                async with self._limit('billing'):
+                    project_billing_info = await self._call_async(
+                        'billing', self.billing_client.get_project_billing_info, name=project_name
+                    )
+                self._probe_billing_info = (self.project_id, project_billing_info)
+                self.logger.info(f"Successfully authenticated for project: {self.project_id}")
+                return True
+            
+            except Exception as test_error:
+                self.logger.error(f"Authentication test failed: {str(test_error)}")
+                return False
+        
+        except Exception as e:
+            self.logger.error(f"Authentication failed: {str(e)}")
+            return False
+    
+    async def collect_billing_data(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+        """
+        args:
+            start_date: Start date for billing data collection
+            end_date: End date for billing data collection
+        """
+        if not self.billing_client:
+            raise RuntimeError("Not authenticated - call authenticate() first")
+        
+        return await self._cached_async(
+            'collect_billing_data',
+            lambda: self._fetch_billing_data_async(start_date, end_date),
+            params=(start_date.date().isoformat(), end_date.date().isoformat())
+        )
+    
+    async def _fetch_billing_data_async(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+        billing_data = []
+        
+        try:
+            project_billing_info = self._take_probe_billing_info()
+            if project_billing_info is None:
+                project_name = f"projects/{self.project_id}"
+                async with self._limit('billing'):
+                    project_billing_info = await self._call_async(
+                        'billing', self.billing_client.get_project_billing_info, name=project_name
+                    )
+            
+            billing_data.append(self._build_billing_record(project_billing_info, start_date, end_date))
+            
+            self.logger.info(f"Collected billing data for project {self.project_id}")
+        
+        except Exception as e:
+            self.logger.error(f"Error collecting billing data: {str(e)}")
+            if self.raise_errors:
+                raise
+        
+        return billing_data
+    
+    async def collect_resource_data(self, asset_types: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        args:
+            asset_types: only collect these asset types (default: configured asset_types)
+        returns:
+            list of resource records
+        """
+        if not self.asset_client:
+            raise RuntimeError("Not authenticated - call authenticate() first")
+        
+        request = self._build_list_assets_request(asset_types)
+        
+        async def load() -> List[Dict[str, Any]]:
+            return [record async for record in self._iter_asset_pages_async(request)]
+        
+        return await self._cached_async(
+            'collect_resource_data',
+            load,
+            params=self._asset_request_params(request)
+        )
+    
+    def iter_resources(self, asset_types: Optional[Sequence[str]] = None) -> AsyncIterator[ResourceRecord]:
+        """
+        async-iterate resource records page by page (use with `async for`).
+        unlike the sync collector the async stream does not use the response cache.
+        args:
+            asset_types: only stream these asset types (default: configured asset_types)
+        """
+        if not self.asset_client:
+            raise RuntimeError("Not authenticated - call authenticate() first")
+        
+        return self._iter_asset_pages_async(self._build_list_assets_request(asset_types))
+    
+    async def _iter_asset_pages_async(self, request: Any) -> AsyncIterator[ResourceRecord]:
+        count = 0
+        collection_date = datetime.now().isoformat()
+        
+        try:
+            async with self._limit('asset'):
+                page_result = await self._call_async('asset', self.asset_client.list_assets, request=request)
+            
+            # later pages are fetched under the semaphore and rate limiter as well
+            pages = page_result.pages.__aiter__()
+            while True:
+                async with self._limit('asset'):
+                    page = await self._call_once_async('asset', anext, pages, None)
+                if page is None:
+                    break
+                for asset_item in page.assets:
+                    yield ResourceRecord(asset_item, self.project_id, collection_date)
+                    count += 1
+            
+            self.logger.info(f"Collected {count} resources from project {self.project_id}")
+        
+        except Exception as e:
+            self.logger.error(f"Error collecting resource data: {str(e)}")
+            if self.raise_errors:
+                raise
+    
+    async def get_idle_compute_instances(self) -> List[Dict[str, Any]]:
+        """
+        identify potentially idle Compute Engine instances
+        returns:
+            list of instances that might be candidates for shutdown
+        """
+        if not self.compute_client:
+            raise RuntimeError("Not authenticated - call authenticate() first")
+        
+        return await self._cached_async('get_idle_compute_instances', self._fetch_idle_compute_instances_async)
+    
+    async def _fetch_idle_compute_instances_async(self) -> List[Dict[str, Any]]:
+        if self.instance_scan_strategy == 'aggregated':
+            try:
+                async with self._limit('compute'):
+                    return await self._run_blocking(self._list_idle_instances_aggregated)
+            except Exception as e:
+                self.logger.warning(f"Aggregated instance listing failed, falling back to zonal scan: {str(e)}")
+        
+        idle_instances = []
+        
+        try:
+            zones_client = self.zones_client or compute.ZonesClient(credentials=self.credentials)
+            async with self._limit('compute'):
+                zone_names = await self._run_blocking(
+                    lambda: [zone.name for zone in zones_client.list(project=self.project_id)]
+                )
+            
+            async def scan(zone_name: str):
+                async with self._limit('compute'):
+                    return await self._run_blocking(self._scan_zone, zone_name)
+            
+            # gather keeps zone order, so the merge matches the sync collector
+            zone_results = await asyncio.gather(*(scan(zone_name) for zone_name in zone_names))
+            
+            failed_zones = []
+            for zone_name, (zone_idle, _) in zip(zone_names, zone_results):
+                # None marks a zone that could not be listed (logged by _scan_zone)
+                if zone_idle is None:
+                    failed_zones.append(zone_name)
+                    continue
+                idle_instances.extend(zone_idle)
+            
+            if failed_zones:
+                self.logger.warning(
+                    f"Could not list instances in {len(failed_zones)} of {len(zone_names)} zones: "
+                    f"{', '.join(failed_zones)}"
+                )
+                idle_instances = PartialResult(idle_instances, failed_zones)
+            
+            self.logger.info(f"Found {len(idle_instances)} potentially idle instances")
+        
+        except Exception as e:
+            self.logger.error(f"Error identifying idle instances: {str(e)}")
+            if self.raise_errors:
+                raise
+        
+        return idle_instances
+    
+    async def get_cost_optimization_recommendations(self) -> List[Dict[str, Any]]:
+        """
+        returns:
+            list of optimization recommendations
+        """
+        recommendations = []
+        
+        try:
+            idle_instances = await self.get_idle_compute_instances()
+            recommendations = self._build_recommendations(idle_instances)
+            
+            self.logger.info(f"Generated {len(recommendations)} optimization recommendations")
+        
+        except Exception as e:
+            self.logger.error(f"Error generating recommendations: {str(e)}")
+        
+        return recommendations
+    
+    async def get_cost_by_service(self, start_date: datetime, end_date: datetime) -> Dict[str, float]:
+        from ..data.billing_frame import as_billing_frame
+        
+        billing_data = await self.collect_billing_data(start_date, end_date)
+        return as_billing_frame(billing_data).group_costs('service')
+    
+    async def close(self) -> None:
+        """close the async transports (call before the event loop shuts down)"""
+        for client in (self.billing_client, self.asset_client):
+            transport = getattr(client, 'transport', None)
+            if transport is not None:
+                await transport.close()
+    
+    def _limit(self, api: str) -> asyncio.Semaphore:
+        """per-API concurrency limit"""
+        if api not in self._semaphores:
+            self._semaphores[api] = asyncio.Semaphore(max(1, int(self.api_concurrency.get(api, 4))))
+        return self._semaphores[api]
+    
+    async def _call_async(self, api: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        await an async client method through that API's rate limiter (token
+        bucket plus backoff on quota and transient errors)
+        """
+        return await self.rate_limiters[api].call_async(func, *args, **kwargs)
+    
+    async def _call_once_async(self, api: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """same as _call_async without retries, for calls that cannot be repeated (pager advances)"""
+        return await self.rate_limiters[api].call_once_async(func, *args, **kwargs)
+    
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
+    
+    async def _cached_async(
+        self,
+        method: str,
+        loader: Callable[[], Any],
+        params: tuple = ()
+    ) -> List[Dict[str, Any]]:
+        async def load() -> List[Dict[str, Any]]:
+            cached = self.response_cache.lookup(self.project_id, method, params)
+            if cached is not None:
+                return list(cached)
+            records = await loader()
+            self.response_cache.store(self.project_id, method, params, records)
+            return records
+        
+        return _copy_result(await self.scan_cache.get_or_load_async(self.project_id, method, load, params))
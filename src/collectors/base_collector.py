@@ -43,12 +43,8 @@ class BaseCollector(ABC):
         pass
     
     def get_cost_by_service(self, start_date: datetime, end_date: datetime) -> Dict[str, float]:
-        billing_data = self.collect_billing_data(start_date, end_date)
-        cost_by_service = {}
+        # imported here so importing a collector doesn't load numpy
+        from ..data.billing_frame import as_billing_frame
         
-        for record in billing_data:
-            service = record.get('service_name', 'Unknown')
-            cost = float(record.get('cost', 0))
-            cost_by_service[service] = cost_by_service.get(service, 0) + cost
-            
-        return cost_by_service
\ No newline at end of file
+        billing_data = self.collect_billing_data(start_date, end_date)
+        return as_billing_frame(billing_data).group_costs('service')
\ No newline at end of file
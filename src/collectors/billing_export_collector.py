@@ -0,0 +1,476 @@
+"""Streaming ingestion of Cloud Billing export files (CSV, JSON Lines, Parquet) from local disk."""
+
+import os
+import csv
+import glob
+import gzip
+import json
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime
+import logging
+
+from .base_collector import BaseCollector
+
+if TYPE_CHECKING:
+    from ..data.billing_frame import BillingFrame
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# output field -> candidate source columns in the BigQuery export schema.
+# CSV dumps flatten nested records as "service.description" (or with "_"),
+# JSONL keeps them nested, Parquet may do either.
+FIELD_SOURCES = {
+    'date': ('usage_start_time', 'usage_start_date', 'date'),
+    'service_name': ('service.description', 'service_description', 'service_name'),
+    'sku_name': ('sku.description', 'sku_description', 'sku_name'),
+    'project_id': ('project.id', 'project_id'),
+    'project_name': ('project.name', 'project_name', 'project.id', 'project_id'),
+    'region_name': ('location.region', 'location_region', 'region', 'region_name'),
+    'cost': ('cost',),
+    'currency': ('currency',),
+    'usage_amount': ('usage.amount', 'usage_amount'),
+    'usage_unit': ('usage.unit', 'usage_unit'),
+    'credits': ('credits',)
+}
+
+DEFAULT_COLUMNS = tuple(FIELD_SOURCES)
+
+# fields a BillingFrame keeps
+FRAME_COLUMNS = (
+    'date', 'service_name', 'project_name', 'sku_name', 'region_name',
+    'cost', 'usage_amount', 'credits'
+)
+
+NUMERIC_FIELDS = ('cost', 'usage_amount')
+
+_MISSING = object()
+
+
+def _to_float(value: Any) -> float:
+    if value is None or value == '':
+        return 0.0
+    return float(value)
+
+
+def _sum_credits(value: Any) -> float:
+    """credits are a repeated {name, amount} record; CSV dumps hold it as a JSON string"""
+    if value is None or value == '':
+        return 0.0
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return 0.0
+    if isinstance(value, dict):
+        value = [value]
+    return sum(_to_float(credit.get('amount')) for credit in value if isinstance(credit, dict))
+
+
+def _day(value: Any) -> str:
+    """YYYY-MM-DD from a timestamp string or datetime, without a full parse"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()[:10]
+    return str(value or '')[:10]
+
+
+def _converter(field: str) -> Callable[[Any], Any]:
+    if field in NUMERIC_FIELDS:
+        return _to_float
+    if field == 'credits':
+        return _sum_credits
+    if field == 'date':
+        return _day
+    return lambda value: '' if value is None else value
+
+
+def _lookup_path(obj: Dict[str, Any], path: str) -> Any:
+    """resolve a flat key ("service.description") or a nested one in a JSON record"""
+    if path in obj:
+        return obj[path]
+    value = obj
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+class BillingExportCollector(BaseCollector):
+    """
+    reads billing export files written from the BigQuery billing export.
+    
+    records are yielded in chunks of plain dicts keyed like the rest of the
+    collectors (date, service_name, project_name, sku_name, region_name, cost,
+    ...). only the requested columns are decoded, and rows outside the date
+    range are skipped before they are converted - for Parquet whole row groups
+    are skipped using their min/max statistics.
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        
+        export_config = self.config.get('billing_export') or {}
+        self.path = export_config.get('path')
+        self.export_format = export_config.get('format', 'auto')
+        self.chunk_size = max(1, int(export_config.get('chunk_size', 50_000)))
+        self.columns = tuple(export_config.get('columns') or DEFAULT_COLUMNS)
+        self.files: List[str] = []
+        
+        if self.export_format not in EXPORT_FORMATS + ('auto',):
+            raise ValueError(
+                f"Invalid billing_export format: {self.export_format} "
+                f"(expected auto or one of {', '.join(EXPORT_FORMATS)})"
+            )
+        self._check_columns(self.columns)
+    
+    def authenticate(self) -> bool:
+        """
+        local files need no credentials; this resolves the export files
+        """
+        if not self.path:
+            self.logger.error("Missing required configuration: billing_export.path")
+            return False
+        
+        self.files = self._resolve_files(self.path)
+        if not self.files:
+            self.logger.error(f"No billing export files found at {self.path}")
+            return False
+        
+        self.logger.info(f"Found {len(self.files)} billing export files under {self.path}")
+        return True
+    
+    def get_required_config_fields(self) -> List[str]:
+        """
+        returns:
+            list of required field names
+        """
+        return [
+            'billing_export'
+        ]
+    
+    def collect_billing_data(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        load every matching line item; prefer iter_chunks() for large exports
+        args:
+            start_date: first usage day to include (default: no lower bound)
+            end_date: last usage day to include (default: no upper bound)
+            columns: output fields to decode (default: configured columns)
+        """
+        billing_data = []
+        for chunk in self.iter_chunks(start_date, end_date, columns):
+            billing_data.extend(chunk)
+        
+        self.logger.info(f"Collected {len(billing_data)} billing line items")
+        return billing_data
+    
+    def collect_billing_frame(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> 'BillingFrame':
+        """
+        load matching line items into a columnar BillingFrame, one chunk of
+        records at a time (the analyzers accept the frame directly)
+        """
+        from ..data.billing_frame import BillingFrame
+        
+        frame = BillingFrame.from_chunks(self.iter_chunks(start_date, end_date, FRAME_COLUMNS))
+        
+        self.logger.info(
+            f"Collected {len(frame)} billing line items into a {frame.nbytes / 1024 / 1024:.1f} MiB frame"
+        )
+        return frame
+    
+    def iter_billing_records(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        for chunk in self.iter_chunks(start_date, end_date, columns):
+            yield from chunk
+    
+    def iter_chunks(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        stream line items as lists of at most chunk_size records
+        args:
+            start_date: first usage day to include (default: no lower bound)
+            end_date: last usage day to include (default: no upper bound)
+            columns: output fields to decode (default: configured columns)
+        """
+        if not self.files and not self.authenticate():
+            raise RuntimeError("No billing export files to read - check billing_export.path")
+        
+        columns = tuple(columns or self.columns)
+        self._check_columns(columns)
+        # 'date' is always decoded so the range filter can run
+        fields = columns if 'date' in columns else ('date',) + columns
+        day_range = (
+            start_date.date().isoformat() if start_date else '',
+            end_date.date().isoformat() if end_date else '9999-12-31'
+        )
+        
+        for path in self.files:
+            reader = {
+                'csv': self._read_csv,
+                'jsonl': self._read_jsonl,
+                'parquet': self._read_parquet
+            }[self._format_for(path)]
+            
+            count = 0
+            for chunk in reader(path, fields, day_range):
+                if 'date' not in columns:
+                    for record in chunk:
+                        del record['date']
+                count += len(chunk)
+                yield chunk
+            
+            self.logger.debug(f"Read {count} line items from {os.path.basename(path)}")
+    
+    def collect_resource_data(self) -> List[Dict[str, Any]]:
+        """billing exports carry no resource inventory"""
+        return []
+    
+    def get_cost_by_service(self, start_date: datetime, end_date: datetime) -> Dict[str, float]:
+        # streamed with two columns, so memory stays flat regardless of export size
+        cost_by_service = {}
+        for chunk in self.iter_chunks(start_date, end_date, columns=('service_name', 'cost')):
+            for record in chunk:
+                service = record['service_name'] or 'Unknown'
+                cost_by_service[service] = cost_by_service.get(service, 0) + record['cost']
+        return cost_by_service
+    
+    def _check_columns(self, columns: Sequence[str]) -> None:
+        unknown = [column for column in columns if column not in FIELD_SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown billing export columns: {', '.join(unknown)}")
+    
+    def _resolve_files(self, path: str) -> List[str]:
+        if os.path.isdir(path):
+            candidates = [os.path.join(path, name) for name in os.listdir(path)]
+        else:
+            candidates = glob.glob(path)
+        
+        files = []
+        for candidate in sorted(candidates):
+            if os.path.isfile(candidate):
+                try:
+                    self._format_for(candidate)
+                except ValueError:
+                    continue
+                files.append(candidate)
+        return files
+    
+    def _format_for(self, path: str) -> str:
+        if self.export_format != 'auto':
+            return self.export_format
+        
+        name = path[:-3] if path.endswith('.gz') else path
+        extension = os.path.splitext(name)[1].lower().lstrip('.')
+        if extension in ('json', 'ndjson'):
+            extension = 'jsonl'
+        if extension not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported billing export file: {path}")
+        return extension
+    
+    def _open_text(self, path: str):
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rt', encoding='utf-8', newline='')
+        return open(path, 'r', encoding='utf-8', newline='')
+    
+    def _read_csv(
+        self,
+        path: str,
+        fields: Sequence[str],
+        day_range: Tuple[str, str]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        with self._open_text(path) as handle:
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if header is None:
+                return
+            
+            # resolve column positions once so rows are never turned into full dicts
+            positions = {name: i for i, name in enumerate(header)}
+            getters = []
+            for field in fields:
+                source = next((s for s in FIELD_SOURCES[field] if s in positions), None)
+                getters.append((field, positions[source] if source is not None else None, _converter(field)))
+            
+            date_position = getters[fields.index('date')][1]
+            if date_position is None:
+                raise ValueError(f"{path} has no usage date column")
+            
+            low, high = day_range
+            chunk = []
+            for row in reader:
+                day = row[date_position][:10]
+                if day < low or day > high:
+                    continue
+                
+                chunk.append({
+                    field: convert(row[position]) if position is not None else convert(None)
+                    for field, position, convert in getters
+                })
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+            
+            if chunk:
+                yield chunk
+    
+    def _read_jsonl(
+        self,
+        path: str,
+        fields: Sequence[str],
+        day_range: Tuple[str, str]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        low, high = day_range
+        converters = [(field, _converter(field)) for field in fields]
+        # field -> the source path that last resolved; records may omit a field
+        # or use another schema variant, so a miss re-probes every candidate
+        sources: Dict[str, str] = {}
+        chunk = []
+        
+        def lookup(item: Dict[str, Any], field: str) -> Any:
+            source = sources.get(field)
+            value = _lookup_path(item, source) if source is not None else _MISSING
+            if value is _MISSING:
+                for candidate in FIELD_SOURCES[field]:
+                    value = _lookup_path(item, candidate)
+                    if value is not _MISSING:
+                        sources[field] = candidate
+                        break
+            return value
+        
+        with self._open_text(path) as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                
+                day = lookup(item, 'date')
+                day = _day(None if day is _MISSING else day)
+                if day < low or day > high:
+                    continue
+                
+                record = {}
+                for field, convert in converters:
+                    value = lookup(item, field)
+                    record[field] = convert(None if value is _MISSING else value)
+                chunk.append(record)
+                
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+        
+        if chunk:
+            yield chunk
+    
+    def _read_parquet(
+        self,
+        path: str,
+        fields: Sequence[str],
+        day_range: Tuple[str, str]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet billing exports requires pyarrow (pip install pyarrow)")
+        
+        parquet_file = pq.ParquetFile(path)
+        available = self._parquet_columns(parquet_file.schema_arrow)
+        
+        sources = []
+        for field in fields:
+            source = next((s for s in FIELD_SOURCES[field] if s in available), None)
+            sources.append((field, source, _converter(field)))
+        
+        date_source = sources[fields.index('date')][1]
+        if date_source is None:
+            raise ValueError(f"{path} has no usage date column")
+        
+        # read only the top-level columns (or structs) that hold the projected fields
+        top_level_names = set(parquet_file.schema_arrow.names)
+        top_level = sorted({
+            source if source in top_level_names else source.split('.')[0]
+            for _, source, _ in sources if source is not None
+        })
+        row_groups = self._parquet_row_groups(parquet_file, date_source, day_range)
+        if not row_groups:
+            return
+        
+        low, high = day_range
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, row_groups=row_groups, columns=top_level):
+            table = pa.Table.from_batches([batch]).flatten()
+            values = {source: table.column(source).to_pylist() for _, source, _ in sources if source is not None}
+            
+            chunk = []
+            for i, day in enumerate(_day(value) for value in values[date_source]):
+                if day < low or day > high:
+                    continue
+                chunk.append({
+                    field: convert(values[source][i]) if source is not None else convert(None)
+                    for field, source, convert in sources
+                })
+            if chunk:
+                yield chunk
+    
+    def _parquet_columns(self, schema: Any) -> set:
+        """flattened column names, e.g. service.description for a nested struct"""
+        import pyarrow as pa
+        
+        names = set()
+        
+        def walk(prefix: str, arrow_type: Any) -> None:
+            if pa.types.is_struct(arrow_type):
+                for child in arrow_type:
+                    walk(f"{prefix}.{child.name}", child.type)
+            else:
+                names.add(prefix)
+        
+        for field in schema:
+            walk(field.name, field.type)
+        return names
+    
+    def _parquet_row_groups(self, parquet_file: Any, date_source: str, day_range: Tuple[str, str]) -> List[int]:
+        """
+        row groups whose usage date statistics overlap the range (all of them
+        when the statistics are missing)
+        """
+        low, high = day_range
+        metadata = parquet_file.metadata
+        column_index = next(
+            (i for i in range(metadata.num_columns)
+             if metadata.schema.column(i).path == date_source),
+            None
+        )
+        
+        row_groups = []
+        for i in range(metadata.num_row_groups):
+            if column_index is not None:
+                statistics = metadata.row_group(i).column(column_index).statistics
+                if statistics is not None and statistics.has_min_max:
+                    if _day(statistics.max) < low or _day(statistics.min) > high:
+                        continue
+            row_groups.append(i)
+        
+        skipped = metadata.num_row_groups - len(row_groups)
+        if skipped:
+            self.logger.debug(f"Skipped {skipped} of {metadata.num_row_groups} row groups outside the date range")
+        return row_groups
@@ -1,32 +1,112 @@
 import os
-from typing import Dict, List, Any
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
-from google.cloud import billing, asset, compute
-from google.oauth2 import service_account
 import google.auth
 import logging
 
 from .base_collector import BaseCollector
+from .lazy_import import lazy_import
+from .rate_limiter import build_rate_limiters
+from .resource_record import ResourceRecord
+from .response_cache import PartialResult, ResponseCache
+from .scan_cache import ScanCache
+from .token_cache import DEFAULT_TOKEN_CACHE_PATH, TokenCache
 
 logger = logging.getLogger(__name__)
 
+# the SDKs take seconds to import (compute especially), so load them on first client use
+billing = lazy_import('google.cloud.billing')
+asset = lazy_import('google.cloud.asset')
+compute = lazy_import('google.cloud.compute')
+service_account = lazy_import('google.oauth2.service_account')
+
+IDLE_INSTANCE_STATUSES = ('STOPPED', 'SUSPENDED', 'TERMINATED')
+
+INSTANCE_SCAN_STRATEGIES = ('aggregated', 'zonal')
+
+SERVICE_ACCOUNT_SCOPES = (
+    'https://www.googleapis.com/auth/cloud-billing.readonly',
+    'https://www.googleapis.com/auth/cloud-platform'
+)
+
+ADC_SCOPES = (
+    'https://www.googleapis.com/auth/cloud-billing.readonly',
+    'https://www.googleapis.com/auth/cloud-platform.read-only'
+)
+
+# partial response for aggregated listing - only the fields we turn into records
+DEFAULT_INSTANCE_FIELD_MASK = (
+    'nextPageToken,'
+    'items/*/instances(name,zone,status,machineType,creationTimestamp)'
+)
+
+
+def _copy_result(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """shallow copy of a cached listing that keeps the PartialResult flag"""
+    if isinstance(records, PartialResult):
+        return PartialResult(records, records.failures)
+    return list(records)
+
 
 class GCPCollector(BaseCollector):
     """Google Cloud Platform data collector with service account authentication."""
     
     def __init__(self, config: Dict[str, Any]):
-
+        
         super().__init__(config)
-    
+        
         self.project_id = self._get_config_value('project_id')
         self.billing_account_id = self._get_config_value('billing_account_id', required=False)
         self.service_account_path = self._get_config_value('service_account_path', required=False)
         
+        collection_config = self.config.get('collection') or {}
+        self.max_workers = max(1, int(collection_config.get('max_workers', 8)))
+        self.instance_scan_strategy = collection_config.get('instance_scan_strategy', 'aggregated')
+        self.instance_field_mask = collection_config.get('instance_field_mask', DEFAULT_INSTANCE_FIELD_MASK)
+        self.instance_page_size = int(collection_config.get('instance_page_size', 500))
+        
+        # asset inventory request shaping (empty asset_types = every type)
+        self.asset_types = list(collection_config.get('asset_types') or [])
+        self.asset_content_type = collection_config.get('content_type')
+        self.asset_page_size = collection_config.get('page_size')
+        
+        cache_ttl = collection_config.get('cache_ttl_seconds', 3600)
+        self.scan_cache = ScanCache(ttl_seconds=float(cache_ttl) if cache_ttl is not None else None)
+        self.response_cache = ResponseCache.from_config(self.config.get('cache'))
+        
+        # one limiter per API, shared by every thread and project copy
+        self.rate_limiters = build_rate_limiters(self.config.get('rate_limits'))
+        
+        # lazy auth skips the billing probe; credentials fail on the first real call instead
+        auth_config = self.config.get('auth') or {}
+        self.lazy_auth = bool(auth_config.get('lazy', False))
+        token_cache_path = auth_config.get('token_cache', None)
+        if token_cache_path is True:
+            token_cache_path = DEFAULT_TOKEN_CACHE_PATH
+        self.token_cache = TokenCache(token_cache_path) if token_cache_path else None
+        
+        # billing info returned by the authentication probe, reused by the first billing collection
+        self._probe_billing_info = None
+        
+        # collection methods log API errors and return what they have; with
+        # raise_errors they re-raise so a caller can report the failure
+        self.raise_errors = False
+        
+        if self.instance_scan_strategy not in INSTANCE_SCAN_STRATEGIES:
+            raise ValueError(
+                f"Invalid instance_scan_strategy: {self.instance_scan_strategy} "
+                f"(expected one of {', '.join(INSTANCE_SCAN_STRATEGIES)})"
+            )
+        
         self.billing_client = None
         self.asset_client = None
         self.compute_client = None
+        self.zones_client = None
         self.credentials = None
-        
+    
     def _get_config_value(self, key: str, required: bool = True) -> str:
         """
         raises:
@@ -37,7 +117,7 @@ class GCPCollector(BaseCollector):
             if required:
                 raise ValueError(f"Missing required configuration: {key}")
             return None
-            
+        
         if isinstance(value, str) and value.startswith('$'):
             env_name = value[1:]  # remove $ prefix
             env_value = os.getenv(env_name)
@@ -46,53 +126,129 @@ class GCPCollector(BaseCollector):
                     raise ValueError(f"Environment variable {env_name} not found (referenced by {key})")
                 return None
             return env_value
-            
+        
         return value
     
     def authenticate(self) -> bool:
-
+        
         try:
-            if self.service_account_path and self.service_account_path != 'null':
-                if not os.path.exists(self.service_account_path):
-                    self.logger.error(f"Service account file not found: {self.service_account_path}")
-                    return False
-                    
-                self.credentials = service_account.Credentials.from_service_account_file(
-                    self.service_account_path,
-                    scopes=[
-                        'https://www.googleapis.com/auth/cloud-billing.readonly',
-                        'https://www.googleapis.com/auth/cloud-platform'
-                    ]
-                )
-                self.logger.info("Using service account credentials")
-            else:
-                self.credentials, project = google.auth.default(
-                    scopes=[
-                        'https://www.googleapis.com/auth/cloud-billing.readonly',
-                        'https://www.googleapis.com/auth/cloud-platform.read-only'
-                    ]
-                )
-                self.logger.info(f"Using Application Default Credentials (detected project: {project})")
+            if not self._load_credentials():
+                return False
+            self._prepare_access_token()
             
             self.billing_client = billing.CloudBillingClient(credentials=self.credentials)
             self.asset_client = asset.AssetServiceClient(credentials=self.credentials)
             self.compute_client = compute.InstancesClient(credentials=self.credentials)
             
+            if self.lazy_auth:
+                self.logger.info(f"Lazy authentication: skipping API probe for project: {self.project_id}")
+                return True
+            
             # test authentication with a simple API call
             try:
                 project_name = f"projects/{self.project_id}"
-                project_billing_info = self.billing_client.get_project_billing_info(name=project_name)
+                project_billing_info = self._call(
+                    'billing', self.billing_client.get_project_billing_info, name=project_name
+                )
+                self._probe_billing_info = (self.project_id, project_billing_info)
                 self.logger.info(f"Successfully authenticated for project: {self.project_id}")
                 return True
-                
+            
             except Exception as test_error:
                 self.logger.error(f"Authentication test failed: {str(test_error)}")
                 return False
-                
+        
         except Exception as e:
             self.logger.error(f"Authentication failed: {str(e)}")
             return False
     
+    def use_clients(
+        self,
+        billing_client: Any = None,
+        asset_client: Any = None,
+        compute_client: Any = None,
+        zones_client: Any = None
+    ) -> None:
+        """
+        install API clients directly instead of calling authenticate(), e.g. the
+        record/replay stand-ins from src.collectors.replay
+        """
+        self.billing_client = billing_client or self.billing_client
+        self.asset_client = asset_client or self.asset_client
+        self.compute_client = compute_client or self.compute_client
+        self.zones_client = zones_client or self.zones_client
+        # the probe response came from the previous clients, so the next call goes through the new ones
+        self._probe_billing_info = None
+    
+    def for_project(self, project_id: str, raise_errors: Optional[bool] = None) -> 'GCPCollector':
+        """
+        collector for another project that shares this collector's credentials,
+        API clients and scan cache (no re-authentication)
+        args:
+            raise_errors: re-raise API errors instead of logging them (default: inherit)
+        """
+        project_collector = copy.copy(self)
+        project_collector.project_id = project_id
+        project_collector._probe_billing_info = None
+        if raise_errors is not None:
+            project_collector.raise_errors = raise_errors
+        return project_collector
+    
+    def _load_credentials(self) -> bool:
+        """
+        load service account or application default credentials into self.credentials
+        """
+        if self._uses_service_account():
+            if not os.path.exists(self.service_account_path):
+                self.logger.error(f"Service account file not found: {self.service_account_path}")
+                return False
+            
+            self.credentials = service_account.Credentials.from_service_account_file(
+                self.service_account_path,
+                scopes=list(SERVICE_ACCOUNT_SCOPES)
+            )
+            self.logger.info("Using service account credentials")
+        else:
+            self.credentials, project = google.auth.default(scopes=list(ADC_SCOPES))
+            self.logger.info(f"Using Application Default Credentials (detected project: {project})")
+        
+        return True
+    
+    def _uses_service_account(self) -> bool:
+        return bool(self.service_account_path and self.service_account_path != 'null')
+    
+    def _prepare_access_token(self) -> None:
+        """
+        install a cached access token, or fetch one now and cache it until it
+        expires, so repeated runs skip the token round trip
+        """
+        if self.token_cache is None or not hasattr(self.credentials, 'refresh'):
+            return
+        
+        if self._uses_service_account():
+            identity = TokenCache.identity(self.credentials, self.service_account_path, SERVICE_ACCOUNT_SCOPES)
+        else:
+            identity = TokenCache.identity(self.credentials, None, ADC_SCOPES)
+        
+        if self.token_cache.restore(self.credentials, identity):
+            return
+        
+        from google.auth.transport.requests import Request
+        self.credentials.refresh(Request())
+        self.token_cache.save(self.credentials, identity)
+    
+    def _take_probe_billing_info(self) -> Any:
+        """
+        returns:
+            billing info fetched by the authentication probe for this project
+            (only once), or None
+        """
+        probe = self._probe_billing_info
+        self._probe_billing_info = None
+        if probe is not None and probe[0] == self.project_id:
+            return probe[1]
+        return None
+    
     def collect_billing_data(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         """
         args:
@@ -101,74 +257,201 @@ class GCPCollector(BaseCollector):
         """
         if not self.billing_client:
             raise RuntimeError("Not authenticated - call authenticate() first")
-            
+        
+        return self._cached(
+            'collect_billing_data',
+            lambda: self._fetch_billing_data(start_date, end_date),
+            params=(start_date.date().isoformat(), end_date.date().isoformat())
+        )
+    
+    def _fetch_billing_data(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         billing_data = []
         
         try:
-            project_name = f"projects/{self.project_id}"
-            project_billing_info = self.billing_client.get_project_billing_info(name=project_name)
-            
-            billing_record = {
-                'project_id': self.project_id,
-                'billing_account_name': project_billing_info.billing_account_name,
-                'billing_enabled': project_billing_info.billing_enabled,
-                'collection_date': datetime.now().isoformat(),
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
-                'data_source': 'gcp_billing_api'
-            }
+            project_billing_info = self._take_probe_billing_info()
+            if project_billing_info is None:
+                project_name = f"projects/{self.project_id}"
+                project_billing_info = self._call(
+                    'billing', self.billing_client.get_project_billing_info, name=project_name
+                )
             
-            billing_data.append(billing_record)
+            billing_data.append(self._build_billing_record(project_billing_info, start_date, end_date))
             
             self.logger.info(f"Collected billing data for project {self.project_id}")
-            
+        
         except Exception as e:
             self.logger.error(f"Error collecting billing data: {str(e)}")
-            
+            if self.raise_errors:
+                raise
+        
         return billing_data
     
-    def collect_resource_data(self) -> List[Dict[str, Any]]:
+    def _build_billing_record(self, project_billing_info: Any, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        return {
+            'project_id': self.project_id,
+            'billing_account_name': project_billing_info.billing_account_name,
+            'billing_enabled': project_billing_info.billing_enabled,
+            'collection_date': datetime.now().isoformat(),
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'data_source': 'gcp_billing_api'
+        }
+    
+    def collect_resource_data(self, asset_types: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
+        args:
+            asset_types: only collect these asset types (default: configured asset_types)
         returns:
             list of resource records
         """
         if not self.asset_client:
             raise RuntimeError("Not authenticated - call authenticate() first")
-            
-        resources = []
+        
+        request = self._build_list_assets_request(asset_types)
+        # the asset stream already reads/writes the response cache itself
+        return self._cached(
+            'collect_resource_data',
+            lambda: list(self._iter_asset_pages(request)),
+            params=self._asset_request_params(request),
+            persist=False
+        )
+    
+    def iter_resources(self, asset_types: Optional[Sequence[str]] = None) -> Iterator[ResourceRecord]:
+        """
+        stream resource records page by page instead of materializing the
+        whole inventory - memory stays bounded by one API page.
+        streamed records bypass the scan-session cache but are served from (and
+        written to) the on-disk response cache. records fetched from the API are
+        lazy ResourceRecord mappings; resource_data is converted on first access.
+        args:
+            asset_types: only stream these asset types (default: configured asset_types)
+        returns:
+            iterator of resource records
+        """
+        if not self.asset_client:
+            raise RuntimeError("Not authenticated - call authenticate() first")
+        
+        return self._iter_asset_pages(self._build_list_assets_request(asset_types))
+    
+    def _build_list_assets_request(self, asset_types: Optional[Sequence[str]] = None) -> Any:
+        """
+        build a ListAssetsRequest with asset type filter, content type and page
+        size pushed server-side so only the needed assets are transferred
+        """
+        request = asset.ListAssetsRequest(
+            parent=f"projects/{self.project_id}",
+            asset_types=sorted(asset_types if asset_types is not None else self.asset_types)
+        )
+        
+        if self.asset_content_type:
+            try:
+                request.content_type = asset.ContentType[str(self.asset_content_type).upper()]
+            except KeyError:
+                raise ValueError(f"Invalid asset content_type: {self.asset_content_type}")
+        
+        if self.asset_page_size:
+            request.page_size = int(self.asset_page_size)
+        
+        return request
+    
+    @staticmethod
+    def asset_types_for(*consumers: Any) -> Optional[List[str]]:
+        """
+        compute the minimal union of asset types needed by a set of analyzers.
+        each consumer declares REQUIRED_ASSET_TYPES; a consumer that declares
+        None (or nothing) needs the full inventory.
+        returns:
+            sorted asset type list, or None when every type is required
+        """
+        required = set()
+        for consumer in consumers:
+            consumer_types = getattr(consumer, 'REQUIRED_ASSET_TYPES', None)
+            if consumer_types is None:
+                return None
+            required.update(consumer_types)
+        return sorted(required)
+    
+    def _asset_request_params(self, request: Any) -> Tuple[Any, ...]:
+        return (tuple(request.asset_types), int(request.content_type))
+    
+    def _iter_asset_pages(self, request: Any) -> Iterator[ResourceRecord]:
+        count = 0
+        params = self._asset_request_params(request)
         
         try:
-            parent = f"projects/{self.project_id}"
-            
-            # list all assets in the project
-            request = asset.ListAssetsRequest(parent=parent)
-            page_result = self.asset_client.list_assets(request=request)
-            
-            for asset_item in page_result:
-                resource_data = {
-                    'name': asset_item.name,
-                    'asset_type': asset_item.asset_type,
-                    'project_id': self.project_id,
-                    'collection_date': datetime.now().isoformat()
-                }
-                
-                # add resource-specific data if available
-                if asset_item.resource and asset_item.resource.data:
-                    # convert protobuf to dict safely
-                    try:
-                        resource_data['resource_data'] = dict(asset_item.resource.data)
-                    except Exception:
-                        # if conversion fails, just note that data exists
-                        resource_data['has_resource_data'] = True
-                        
-                resources.append(resource_data)
-                
-            self.logger.info(f"Collected {len(resources)} resources from project {self.project_id}")
+            records = self.response_cache.lookup(self.project_id, 'collect_resource_data', params)
+            if records is None:
+                records = self.response_cache.tee(
+                    self.project_id,
+                    'collect_resource_data',
+                    params,
+                    self._list_asset_pages(request)
+                )
             
+            for record in records:
+                yield record
+                count += 1
+            
+            self.logger.info(f"Collected {count} resources from project {self.project_id}")
+        
         except Exception as e:
             self.logger.error(f"Error collecting resource data: {str(e)}")
-            
-        return resources
+            if self.raise_errors:
+                raise
+    
+    def _list_asset_pages(self, request: Any) -> Iterator[ResourceRecord]:
+        # one timestamp per scan rather than one per asset
+        collection_date = datetime.now().isoformat()
+        page_result = self._call('asset', self.asset_client.list_assets, request=request)
+        
+        # every page fetch goes through the limiter, not just the first request
+        pages = iter(page_result.pages)
+        while True:
+            page = self._call_once('asset', next, pages, None)
+            if page is None:
+                break
+            for asset_item in page.assets:
+                yield ResourceRecord(asset_item, self.project_id, collection_date)
+    
+    def _call(self, api: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        call an API client method through that API's rate limiter
+        args:
+            api: billing | asset | compute
+        """
+        return self.rate_limiters[api].call(func, *args, **kwargs)
+    
+    def _call_once(self, api: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """same as _call without retries, for calls that cannot be repeated (pager advances)"""
+        return self.rate_limiters[api].call_once(func, *args, **kwargs)
+    
+    def _cached(
+        self,
+        method: str,
+        loader: Callable[[], List[Dict[str, Any]]],
+        params: Tuple[Any, ...] = (),
+        persist: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        serve a listing from the scan-session cache, then the on-disk response
+        cache (when persist is set), fetching it on first use.
+        a shallow copy is returned so callers can't mutate the shared entry;
+        a PartialResult stays one (and is never written to disk).
+        """
+        def load() -> List[Dict[str, Any]]:
+            if not persist:
+                return loader()
+            return self.response_cache.get_or_load(self.project_id, method, params, loader)
+        
+        return _copy_result(self.scan_cache.get_or_load(self.project_id, method, load, params))
+    
+    def invalidate_cache(self, method: Optional[str] = None) -> int:
+        """
+        drop cached listings for this project so the next call refetches them
+        args:
+            method: only invalidate this collector method (default: all)
+        """
+        return self.scan_cache.invalidate(project_id=self.project_id, method=method)
     
     def get_required_config_fields(self) -> List[str]:
         """
@@ -187,46 +470,154 @@ class GCPCollector(BaseCollector):
         """
         if not self.compute_client:
             raise RuntimeError("Not authenticated - call authenticate() first")
-            
+        
+        return self._cached('get_idle_compute_instances', self._fetch_idle_compute_instances)
+    
+    def _fetch_idle_compute_instances(self) -> List[Dict[str, Any]]:
+        if self.instance_scan_strategy == 'aggregated':
+            try:
+                return self._list_idle_instances_aggregated()
+            except Exception as e:
+                self.logger.warning(f"Aggregated instance listing failed, falling back to zonal scan: {str(e)}")
+        
+        return self._list_idle_instances_by_zone()
+    
+    def _list_idle_instances_aggregated(self) -> List[Dict[str, Any]]:
+        """
+        list idle instances across all zones with one paginated aggregated call.
+        the status filter is applied server-side and the field mask trims each
+        page to the fields used in idle instance records.
+        """
+        started = time.monotonic()
+        idle_instances = []
+        
+        request = compute.AggregatedListInstancesRequest(
+            project=self.project_id,
+            filter=' OR '.join(f'(status = "{status}")' for status in IDLE_INSTANCE_STATUSES),
+            max_results=self.instance_page_size
+        )
+        metadata = [('x-goog-fieldmask', self.instance_field_mask)] if self.instance_field_mask else []
+        
+        # materialized inside the limiter so a throttled page retries the listing
+        pages = self._call(
+            'compute',
+            lambda: list(self.compute_client.aggregated_list(request=request, metadata=metadata))
+        )
+        
+        for scope, scoped_list in pages:
+            # scope keys look like "zones/us-central1-a"
+            zone_name = scope.split('/')[-1]
+            for instance in scoped_list.instances:
+                if instance.status in IDLE_INSTANCE_STATUSES:
+                    idle_instances.append(self._build_idle_instance_record(instance, zone_name))
+        
+        self.logger.info(
+            f"Found {len(idle_instances)} potentially idle instances "
+            f"(aggregated listing in {time.monotonic() - started:.2f}s)"
+        )
+        return idle_instances
+    
+    def _list_idle_instances_by_zone(self) -> List[Dict[str, Any]]:
+        """
+        list idle instances zone by zone, fanned out over max_workers threads
+        """
         idle_instances = []
         
         try:
             # get all zones in the project
-            zones_client = compute.ZonesClient(credentials=self.credentials)
-            zones_list = zones_client.list(project=self.project_id)
-            
-            for zone in zones_list:
-                try:
-                    # List instances in each zone
-                    instances = self.compute_client.list(
-                        project=self.project_id,
-                        zone=zone.name
-                    )
-                    
-                    for instance in instances:
-                        # Check for potentially idle instances
-                        if instance.status in ['STOPPED', 'SUSPENDED', 'TERMINATED']:
-                            idle_instances.append({
-                                'name': instance.name,
-                                'zone': zone.name,
-                                'status': instance.status,
-                                'machine_type': instance.machine_type,
-                                'creation_timestamp': instance.creation_timestamp,
-                                'project_id': self.project_id,
-                                'recommendation': f'Instance is {instance.status.lower()} - consider deletion if no longer needed',
-                                'potential_savings': 'Exact savings require pricing API integration'
-                            })
-                            
-                except Exception as zone_error:
-                    self.logger.warning(f"Could not list instances in zone {zone.name}: {str(zone_error)}")
-                    
-            self.logger.info(f"Found {len(idle_instances)} potentially idle instances")
+            zones_client = self.zones_client or compute.ZonesClient(credentials=self.credentials)
+            zone_names = self._call(
+                'compute',
+                lambda: [zone.name for zone in zones_client.list(project=self.project_id)]
+            )
+            
+            started = time.monotonic()
+            workers = min(self.max_workers, len(zone_names)) or 1
+            
+            if workers == 1:
+                zone_results = [self._scan_zone(zone_name) for zone_name in zone_names]
+            else:
+                # map() yields in submission order, so the merge is deterministic
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zone-scan') as executor:
+                    zone_results = list(executor.map(self._scan_zone, zone_names))
             
+            failed_zones = []
+            for zone_name, (zone_idle, _) in zip(zone_names, zone_results):
+                if zone_idle is None:
+                    failed_zones.append(zone_name)
+                    continue
+                idle_instances.extend(zone_idle)
+            
+            if failed_zones:
+                self.logger.warning(
+                    f"Could not list instances in {len(failed_zones)} of {len(zone_names)} zones: "
+                    f"{', '.join(failed_zones)}"
+                )
+                # flagged so the response cache doesn't replay the missing zones
+                idle_instances = PartialResult(idle_instances, failed_zones)
+            
+            if zone_results:
+                slowest_zone, (_, slowest_time) = max(
+                    zip(zone_names, zone_results),
+                    key=lambda item: item[1][1]
+                )
+                self.logger.info(
+                    f"Scanned {len(zone_names)} zones with {workers} workers in "
+                    f"{time.monotonic() - started:.2f}s (slowest: {slowest_zone} {slowest_time:.2f}s)"
+                )
+            
+            self.logger.info(f"Found {len(idle_instances)} potentially idle instances")
+        
         except Exception as e:
             self.logger.error(f"Error identifying idle instances: {str(e)}")
-            
+            if self.raise_errors:
+                raise
+        
         return idle_instances
     
+    def _scan_zone(self, zone_name: str) -> Tuple[Optional[List[Dict[str, Any]]], float]:
+        """
+        list instances in a single zone and keep the idle ones. quota and
+        transient errors are retried by the compute rate limiter.
+        returns:
+            tuple of (idle instance records, elapsed seconds); records are None
+            when the zone could not be listed
+        """
+        started = time.monotonic()
+        idle_instances = []
+        
+        try:
+            # materialized inside the limiter so a throttled page retries the zone
+            instances = self._call(
+                'compute',
+                lambda: list(self.compute_client.list(project=self.project_id, zone=zone_name))
+            )
+            
+            for instance in instances:
+                # Check for potentially idle instances
+                if instance.status in IDLE_INSTANCE_STATUSES:
+                    idle_instances.append(self._build_idle_instance_record(instance, zone_name))
+        
+        except Exception as zone_error:
+            self.logger.warning(f"Could not list instances in zone {zone_name}: {str(zone_error)}")
+            idle_instances = None
+        
+        elapsed = time.monotonic() - started
+        self.logger.debug(f"Zone {zone_name}: {len(idle_instances or [])} idle instances in {elapsed:.2f}s")
+        return idle_instances, elapsed
+    
+    def _build_idle_instance_record(self, instance: Any, zone_name: str) -> Dict[str, Any]:
+        return {
+            'name': instance.name,
+            'zone': zone_name,
+            'status': instance.status,
+            'machine_type': instance.machine_type,
+            'creation_timestamp': instance.creation_timestamp,
+            'project_id': self.project_id,
+            'recommendation': f'Instance is {instance.status.lower()} - consider deletion if no longer needed',
+            'potential_savings': 'Exact savings require pricing API integration'
+        }
+    
     def get_cost_optimization_recommendations(self) -> List[Dict[str, Any]]:
         """
         returns:
@@ -236,20 +627,23 @@ class GCPCollector(BaseCollector):
         
         try:
             idle_instances = self.get_idle_compute_instances()
-            
-            for instance in idle_instances:
-                recommendations.append({
-                    'type': 'compute_optimization',
-                    'resource_name': instance['name'],
-                    'recommendation': instance['recommendation'],
-                    'potential_impact': 'Cost savings from stopping unused compute resources',
-                    'action': 'Review and delete if no longer needed'
-                })
-
+            recommendations = self._build_recommendations(idle_instances)
             
             self.logger.info(f"Generated {len(recommendations)} optimization recommendations")
-            
+        
         except Exception as e:
             self.logger.error(f"Error generating recommendations: {str(e)}")
-            
-        return recommendations
\ No newline at end of file
+        
+        return recommendations
+    
+    def _build_recommendations(self, idle_instances: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'type': 'compute_optimization',
+                'resource_name': instance['name'],
+                'recommendation': instance['recommendation'],
+                'potential_impact': 'Cost savings from stopping unused compute resources',
+                'action': 'Review and delete if no longer needed'
+            }
+            for instance in idle_instances
+        ]
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""Deferred imports for the heavy google.cloud SDK modules."""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """
+    stand-in for a module that is imported on first attribute access.
+    attribute writes go to the real module, so monkeypatching through the
+    proxy behaves like patching the module itself.
+    """
+    
+    def __init__(self, name: str):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+    
+    def _load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            # collectors create clients from worker threads, so import once
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    object.__setattr__(self, '_module', module)
+        return module
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+    
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+    
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+    
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+    
+    def __dir__(self):
+        return dir(self._load())
+    
+    def __repr__(self) -> str:
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    args:
+        name: absolute module name, e.g. 'google.cloud.compute'
+    returns:
+        proxy that imports the module on first use
+    """
+    return LazyModule(name)
@@ -0,0 +1,184 @@
+"""Organization-wide scanning across many projects with one set of clients."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+import logging
+
+from .gcp_collector import GCPCollector
+from .response_cache import PartialResult
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ASSET_TYPE = 'cloudresourcemanager.googleapis.com/Project'
+
+
+class MultiProjectScanner:
+    """
+    fans a scan out over many projects in parallel, reusing one authenticated
+    GCPCollector (credentials, clients and scan cache) for every project
+    """
+    
+    def __init__(
+        self,
+        collector: GCPCollector,
+        projects: Optional[Sequence[str]] = None,
+        organization_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        max_workers: int = 8
+    ):
+        """
+        args:
+            collector: authenticated collector whose clients are shared
+            projects: explicit project ids to scan
+            organization_id: discover active projects under this organization
+            folder_id: discover active projects under this folder
+            max_workers: number of projects scanned in parallel
+        """
+        if not projects and not organization_id and not folder_id:
+            raise ValueError("Provide projects, organization_id or folder_id")
+        
+        self.collector = collector
+        self.projects = list(projects or [])
+        self.organization_id = organization_id
+        self.folder_id = folder_id
+        self.max_workers = max(1, int(max_workers))
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    @classmethod
+    def from_config(cls, collector: GCPCollector, config: Dict[str, Any]) -> Optional['MultiProjectScanner']:
+        """
+        build a scanner from the projects / organization_id / folder_id config
+        keys, or return None when the config targets a single project
+        """
+        projects = config.get('projects') or []
+        organization_id = config.get('organization_id')
+        folder_id = config.get('folder_id')
+        
+        if not projects and not organization_id and not folder_id:
+            return None
+        
+        collection_config = config.get('collection') or {}
+        return cls(
+            collector,
+            projects=projects,
+            organization_id=organization_id,
+            folder_id=folder_id,
+            max_workers=collection_config.get('project_workers', 8)
+        )
+    
+    def resolve_projects(self) -> List[str]:
+        """
+        returns:
+            sorted, de-duplicated project ids (explicit list plus discovered ones)
+        """
+        project_ids = set(self.projects)
+        
+        for scope in self._discovery_scopes():
+            if not self.collector.asset_client:
+                raise RuntimeError("Not authenticated - call authenticate() first")
+            
+            # materialized inside the asset limiter so a throttled page retries the search
+            results = self.collector._call(
+                'asset',
+                lambda: list(self.collector.asset_client.search_all_resources(
+                    scope=scope,
+                    asset_types=[PROJECT_ASSET_TYPE],
+                    query='state:ACTIVE'
+                ))
+            )
+            
+            discovered = 0
+            for result in results:
+                project_id = result.additional_attributes.get('projectId')
+                if project_id:
+                    project_ids.add(project_id)
+                    discovered += 1
+            
+            self.logger.info(f"Discovered {discovered} active projects under {scope}")
+        
+        return sorted(project_ids)
+    
+    def scan(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        include_billing: bool = True,
+        include_resources: bool = True,
+        include_idle: bool = True
+    ) -> Dict[str, Any]:
+        """
+        scan every project in parallel and merge the results into one dataset.
+        every record carries the project_id it was collected from. API errors
+        (e.g. permission denied) and zones that could not be listed put the
+        project in failed_projects instead of reporting it as empty.
+        
+        returns:
+            merged dataset with per-project summaries and failures
+        """
+        project_ids = self.resolve_projects()
+        started = time.monotonic()
+        
+        def scan_project(project_id: str) -> Dict[str, Any]:
+            project_collector = self.collector.for_project(project_id, raise_errors=True)
+            project_started = time.monotonic()
+            result = {'project_id': project_id, 'billing_data': [], 'resources': [], 'idle_instances': []}
+            
+            try:
+                if include_billing:
+                    result['billing_data'] = project_collector.collect_billing_data(start_date, end_date)
+                if include_resources:
+                    result['resources'] = project_collector.collect_resource_data()
+                if include_idle:
+                    result['idle_instances'] = project_collector.get_idle_compute_instances()
+                    if isinstance(result['idle_instances'], PartialResult):
+                        result['error'] = f"Could not list instances in zones: {', '.join(result['idle_instances'].failures)}"
+            except Exception as e:
+                self.logger.warning(f"Could not scan project {project_id}: {str(e)}")
+                result['error'] = str(e)
+            
+            result['elapsed_seconds'] = round(time.monotonic() - project_started, 2)
+            return result
+        
+        workers = min(self.max_workers, len(project_ids)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='project-scan') as executor:
+            # map() keeps project order so the merged dataset is deterministic
+            project_results = list(executor.map(scan_project, project_ids))
+        
+        merged = {
+            'projects': project_ids,
+            'billing_data': [],
+            'resources': [],
+            'idle_instances': [],
+            'project_summaries': [],
+            'failed_projects': {}
+        }
+        
+        for result in project_results:
+            merged['billing_data'].extend(result['billing_data'])
+            merged['resources'].extend(result['resources'])
+            merged['idle_instances'].extend(result['idle_instances'])
+            merged['project_summaries'].append({
+                'project_id': result['project_id'],
+                'billing_records': len(result['billing_data']),
+                'resources': len(result['resources']),
+                'idle_instances': len(result['idle_instances']),
+                'elapsed_seconds': result['elapsed_seconds']
+            })
+            if 'error' in result:
+                merged['failed_projects'][result['project_id']] = result['error']
+        
+        self.logger.info(
+            f"Scanned {len(project_ids)} projects with {workers} workers in "
+            f"{time.monotonic() - started:.2f}s ({len(merged['failed_projects'])} failed)"
+        )
+        return merged
+    
+    def _discovery_scopes(self) -> List[str]:
+        scopes = []
+        if self.organization_id:
+            scopes.append(f"organizations/{self.organization_id}")
+        if self.folder_id:
+            scopes.append(f"folders/{self.folder_id}")
+        return scopes
@@ -0,0 +1,401 @@
+"""Per-API rate limiting, adaptive concurrency and retry with backoff for collector calls."""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import logging
+
+from .lazy_import import lazy_import
+
+logger = logging.getLogger(__name__)
+
+api_exceptions = lazy_import('google.api_core.exceptions')
+
+# quota errors: back off and shrink concurrency
+THROTTLING_ERROR_NAMES = ('TooManyRequests', 'ResourceExhausted')
+
+# transient server-side errors: back off and retry
+TRANSIENT_ERROR_NAMES = (
+    'ServiceUnavailable',
+    'InternalServerError',
+    'BadGateway',
+    'GatewayTimeout',
+    'DeadlineExceeded',
+)
+
+
+def throttling_errors() -> Tuple[type, ...]:
+    return tuple(getattr(api_exceptions, name) for name in THROTTLING_ERROR_NAMES)
+
+
+def retryable_errors() -> Tuple[type, ...]:
+    return throttling_errors() + tuple(getattr(api_exceptions, name) for name in TRANSIENT_ERROR_NAMES)
+
+
+DEFAULT_API_LIMITS = {
+    'billing': {'requests_per_second': 5, 'max_concurrency': 4},
+    'asset': {'requests_per_second': 10, 'max_concurrency': 8},
+    'compute': {'requests_per_second': 20, 'max_concurrency': 16}
+}
+
+
+class TokenBucket:
+    """thread-safe token bucket; a rate of 0 or less disables limiting"""
+    
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        args:
+            rate: tokens added per second
+            capacity: bucket size, i.e. the allowed burst (default: one second of tokens)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        block until tokens are available
+        returns:
+            seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self._take(tokens)
+            if wait == 0:
+                return waited
+            self.sleep(wait)
+            waited += wait
+    
+    async def acquire_async(
+        self,
+        tokens: float = 1.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ) -> float:
+        """
+        same as acquire, but waits with asyncio.sleep so the event loop keeps running
+        returns:
+            seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self._take(tokens)
+            if wait == 0:
+                return waited
+            await sleep(wait)
+            waited += wait
+    
+    def _take(self, tokens: float) -> float:
+        """
+        take tokens if available
+        returns:
+            0 when they were taken, else the seconds until they will be
+        """
+        if self.rate <= 0:
+            return 0.0
+        
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            
+            return (tokens - self.tokens) / self.rate
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    caps in-flight calls with an AIMD limit: halved whenever a call is
+    throttled, raised by one after a run of successful calls
+    """
+    
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1, increase_after: int = 10):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_concurrency = max(1, min(int(min_concurrency), self.max_concurrency))
+        self.increase_after = max(1, int(increase_after))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+    
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+    
+    def release(self, throttled: bool = False) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._adjust(throttled)
+            self._condition.notify_all()
+    
+    def _adjust(self, throttled: bool) -> None:
+        if throttled:
+            self.limit = max(float(self.min_concurrency), self.limit / 2)
+            self._successes = 0
+        else:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.max_concurrency:
+                self.limit = min(float(self.max_concurrency), self.limit + 1)
+                self._successes = 0
+
+
+class AsyncAdaptiveConcurrencyLimiter(AdaptiveConcurrencyLimiter):
+    """
+    AdaptiveConcurrencyLimiter for coroutines: waiting callers yield to the
+    event loop instead of blocking its thread. the asyncio.Condition is
+    created per running loop, so one limiter can serve several asyncio.run()s.
+    """
+    
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1, increase_after: int = 10):
+        super().__init__(max_concurrency, min_concurrency, increase_after)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_condition: Optional[asyncio.Condition] = None
+    
+    async def acquire(self) -> None:
+        condition = self._loop_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+    
+    async def release(self, throttled: bool = False) -> None:
+        condition = self._loop_condition()
+        async with condition:
+            self.in_flight -= 1
+            self._adjust(throttled)
+            condition.notify_all()
+    
+    def _loop_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._async_condition = asyncio.Condition()
+            self.in_flight = 0
+        return self._async_condition
+
+
+class ApiRateLimiter:
+    """
+    wraps calls to one API with a token bucket, adaptive concurrency and
+    exponential backoff (with jitter) on quota and transient errors
+    """
+    
+    def __init__(
+        self,
+        api: str,
+        requests_per_second: float = 10,
+        burst: Optional[float] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        args:
+            api: API name used in logs (billing, asset, compute)
+            requests_per_second: sustained request rate (0 = unlimited)
+            burst: token bucket capacity
+            max_concurrency: upper bound for in-flight calls
+            max_retries: retries before the error is raised to the caller
+            base_delay_seconds: first backoff delay, doubled on every retry
+            max_delay_seconds: backoff ceiling
+        """
+        self.api = api
+        self.bucket = TokenBucket(requests_per_second, burst, clock=clock, sleep=sleep)
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.async_concurrency = AsyncAdaptiveConcurrencyLimiter(max_concurrency)
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay_seconds = float(base_delay_seconds)
+        self.max_delay_seconds = float(max_delay_seconds)
+        self.sleep = sleep
+        self.async_sleep = async_sleep
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self._stats_lock = threading.Lock()
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        call func under the limits, retrying quota/transient errors.
+        non-retryable errors and errors past max_retries are raised.
+        """
+        attempt = 0
+        
+        while True:
+            self.bucket.acquire()
+            self.concurrency.acquire()
+            throttled = False
+            
+            try:
+                self._count('calls')
+                return func(*args, **kwargs)
+            
+            except Exception as e:
+                throttled = isinstance(e, throttling_errors())
+                if not self._should_retry(e, attempt):
+                    raise
+                error = e
+            
+            finally:
+                self.concurrency.release(throttled)
+            
+            self.sleep(self._retry_delay(error, attempt))
+            attempt += 1
+    
+    def call_once(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        call func under the limits without retrying, for calls that cannot be
+        repeated - e.g. advancing an SDK pager, whose page generator is closed
+        by an error so a retry would silently end the listing
+        """
+        self.bucket.acquire()
+        self.concurrency.acquire()
+        throttled = False
+        
+        try:
+            self._count('calls')
+            return func(*args, **kwargs)
+        
+        except Exception as e:
+            throttled = self._count_throttled(e)
+            raise
+        
+        finally:
+            self.concurrency.release(throttled)
+    
+    async def call_async(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        coroutine counterpart of call() for the SDK async clients: waits for
+        the token bucket and the async concurrency limiter and backs off with
+        asyncio.sleep, retrying the same quota/transient errors
+        """
+        attempt = 0
+        
+        while True:
+            await self.bucket.acquire_async(sleep=self.async_sleep)
+            await self.async_concurrency.acquire()
+            throttled = False
+            
+            try:
+                self._count('calls')
+                return await func(*args, **kwargs)
+            
+            except Exception as e:
+                throttled = isinstance(e, throttling_errors())
+                if not self._should_retry(e, attempt):
+                    raise
+                error = e
+            
+            finally:
+                await self.async_concurrency.release(throttled)
+            
+            await self.async_sleep(self._retry_delay(error, attempt))
+            attempt += 1
+    
+    async def call_once_async(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """coroutine counterpart of call_once()"""
+        await self.bucket.acquire_async(sleep=self.async_sleep)
+        await self.async_concurrency.acquire()
+        throttled = False
+        
+        try:
+            self._count('calls')
+            return await func(*args, **kwargs)
+        
+        except Exception as e:
+            throttled = self._count_throttled(e)
+            raise
+        
+        finally:
+            await self.async_concurrency.release(throttled)
+    
+    def _count_throttled(self, error: Exception) -> bool:
+        throttled = isinstance(error, throttling_errors())
+        if throttled:
+            self._count('throttled')
+        return throttled
+    
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        """count a failed call; False when it should be raised to the caller"""
+        if not isinstance(error, retryable_errors()):
+            return False
+        self._count_throttled(error)
+        if attempt >= self.max_retries:
+            self.logger.error(f"{self.api} call failed after {attempt} retries: {str(error)}")
+            return False
+        return True
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        delay = self.backoff_delay(attempt)
+        self._count('retries')
+        throttled = isinstance(error, throttling_errors())
+        self.logger.warning(
+            f"{self.api} call {'throttled' if throttled else 'failed'} ({type(error).__name__}), "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s "
+            f"(concurrency limit {self.concurrency_limit()})"
+        )
+        return delay
+    
+    def backoff_delay(self, attempt: int) -> float:
+        """exponential backoff with 50-100% jitter"""
+        delay = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'concurrency_limit': self.concurrency_limit()
+        }
+    
+    def concurrency_limit(self) -> int:
+        """current in-flight cap; the lower of the thread and asyncio limiters"""
+        return int(min(self.concurrency.limit, self.async_concurrency.limit))
+    
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def build_rate_limiters(rate_limit_config: Optional[Dict[str, Any]] = None) -> Dict[str, ApiRateLimiter]:
+    """
+    one limiter per API from the `rate_limits` config section. per-API keys
+    (billing/asset/compute) hold requests_per_second, burst and
+    max_concurrency; max_retries, base_delay_seconds and max_delay_seconds
+    apply to every API.
+    """
+    rate_limit_config = rate_limit_config or {}
+    retry_settings = {
+        key: rate_limit_config[key]
+        for key in ('max_retries', 'base_delay_seconds', 'max_delay_seconds')
+        if key in rate_limit_config
+    }
+    
+    limiters = {}
+    for api, defaults in DEFAULT_API_LIMITS.items():
+        settings = dict(defaults)
+        settings.update(rate_limit_config.get(api) or {})
+        settings.update(retry_settings)
+        limiters[api] = ApiRateLimiter(api, **settings)
+    
+    return limiters
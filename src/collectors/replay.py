@@ -0,0 +1,368 @@
+"""Record/replay stand-ins for the GCP API clients, for offline tests and benchmarks."""
+
+import os
+import json
+import time
+import random
+import hashlib
+import importlib
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import logging
+
+import proto
+
+logger = logging.getLogger(__name__)
+
+# collector attribute -> fixture sub-directory
+CLIENT_APIS = {
+    'billing_client': 'billing',
+    'asset_client': 'asset',
+    'compute_client': 'compute',
+    'zones_client': 'zones'
+}
+
+# repeated/map field each pager iterates over, by client method
+PAGER_ITEM_FIELDS = {
+    'list_assets': 'assets',
+    'search_all_resources': 'results',
+    'list': 'items',
+    'aggregated_list': 'items'
+}
+
+_IGNORED_CALL_ARGS = ('metadata', 'retry', 'timeout')
+
+
+def _type_path(message_type: type) -> str:
+    return f"{message_type.__module__}:{message_type.__qualname__}"
+
+
+def _load_type(path: str) -> type:
+    module_name, qualname = path.split(':')
+    return getattr(importlib.import_module(module_name), qualname)
+
+
+def _message_to_json(message: Any) -> Any:
+    return json.loads(type(message).to_json(message))
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, proto.Message):
+        return _message_to_json(value)
+    return value
+
+
+def call_key(method: str, args: Sequence[Any] = (), kwargs: Optional[Dict[str, Any]] = None) -> str:
+    """
+    stable fixture key for a client call (metadata/retry/timeout are ignored)
+    """
+    params = {
+        name: _normalize(value)
+        for name, value in (kwargs or {}).items()
+        if name not in _IGNORED_CALL_ARGS
+    }
+    if args:
+        params['_args'] = [_normalize(arg) for arg in args]
+    
+    blob = json.dumps({'method': method, 'params': params}, sort_keys=True, default=str)
+    return f"{method}-{hashlib.sha256(blob.encode('utf-8')).hexdigest()[:24]}"
+
+
+def write_fixture(
+    directory: str,
+    api: str,
+    method: str,
+    key: Optional[str],
+    message_type: type,
+    response: Any = None,
+    pages: Optional[List[Any]] = None
+) -> str:
+    """
+    write one recorded call. response/pages are JSON-ready dicts in the
+    message's JSON form. key=None writes the method's default fixture, which
+    is served for any call without an exact match.
+    
+    returns:
+        path of the fixture file
+    """
+    api_dir = os.path.join(directory, api)
+    os.makedirs(api_dir, exist_ok=True)
+    path = os.path.join(api_dir, f"{key or method + '.default'}.json")
+    
+    fixture = {
+        'api': api,
+        'method': method,
+        'type': _type_path(message_type),
+        'kind': 'pager' if pages is not None else 'message'
+    }
+    if pages is not None:
+        fixture['pages'] = pages
+    else:
+        fixture['response'] = response
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f)
+    return path
+
+
+class ReplayPager:
+    """
+    minimal stand-in for the SDK pagers: iterating yields items and `.pages`
+    yields the page responses, with optional latency per page
+    """
+    
+    def __init__(
+        self,
+        pages: Sequence[Any],
+        item_field: str,
+        message_type: Optional[type] = None,
+        page_latency_seconds: float = 0.0
+    ):
+        """
+        args:
+            pages: page messages, or JSON dicts when message_type is given
+            item_field: page field the pager iterates over
+            message_type: page message class used to rebuild JSON pages lazily
+            page_latency_seconds: simulated fetch latency for every page after the first
+        """
+        self._pages = pages
+        self.item_field = item_field
+        self.message_type = message_type
+        self.page_latency_seconds = page_latency_seconds
+    
+    @property
+    def pages(self) -> Iterator[Any]:
+        for i, page in enumerate(self._pages):
+            if i and self.page_latency_seconds:
+                time.sleep(self.page_latency_seconds)
+            if self.message_type is not None:
+                page = self.message_type.from_json(json.dumps(page), ignore_unknown_fields=True)
+            yield page
+    
+    def __iter__(self) -> Iterator[Any]:
+        for page in self.pages:
+            items = getattr(page, self.item_field)
+            # aggregated lists are keyed by scope, like the SDK pager
+            if isinstance(items, Mapping):
+                yield from items.items()
+            else:
+                yield from items
+
+
+class RecordingClient:
+    """
+    wraps a real API client and writes every call's response to a fixture
+    file. pagers are drained while recording and returned as ReplayPagers.
+    """
+    
+    def __init__(self, client: Any, api: str, directory: str):
+        self._client = client
+        self._api = api
+        self._directory = directory
+    
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+        
+        def record(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            key = call_key(name, args, kwargs)
+            
+            if hasattr(result, 'pages'):
+                pages = list(result.pages)
+                message_type = type(pages[0]) if pages else None
+                if message_type is not None:
+                    write_fixture(
+                        self._directory, self._api, name, key, message_type,
+                        pages=[_message_to_json(page) for page in pages]
+                    )
+                return ReplayPager(pages, PAGER_ITEM_FIELDS.get(name, 'items'))
+            
+            write_fixture(self._directory, self._api, name, key, type(result), response=_message_to_json(result))
+            return result
+        
+        return record
+
+
+class ReplayClient:
+    """
+    serves recorded fixtures in place of a real API client, with configurable
+    per-call and per-page latency. raises LookupError for unrecorded calls.
+    """
+    
+    def __init__(
+        self,
+        api: str,
+        directory: str,
+        latency_seconds: float = 0.0,
+        page_latency_seconds: Optional[float] = None
+    ):
+        self.api = api
+        self.directory = directory
+        self.latency_seconds = latency_seconds
+        self.page_latency_seconds = latency_seconds if page_latency_seconds is None else page_latency_seconds
+        self.calls: Dict[str, int] = {}
+    
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        
+        def replay(*args: Any, **kwargs: Any) -> Any:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            fixture = self._load(name, call_key(name, args, kwargs))
+            
+            if self.latency_seconds:
+                time.sleep(self.latency_seconds)
+            
+            message_type = _load_type(fixture['type'])
+            if fixture['kind'] == 'pager':
+                return ReplayPager(
+                    fixture['pages'],
+                    PAGER_ITEM_FIELDS.get(name, 'items'),
+                    message_type=message_type,
+                    page_latency_seconds=self.page_latency_seconds
+                )
+            return message_type.from_json(json.dumps(fixture['response']), ignore_unknown_fields=True)
+        
+        return replay
+    
+    def _load(self, method: str, key: str) -> Dict[str, Any]:
+        api_dir = os.path.join(self.directory, self.api)
+        for path in (os.path.join(api_dir, f"{key}.json"), os.path.join(api_dir, f"{method}.default.json")):
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        raise LookupError(f"No recorded fixture for {self.api}.{method} ({key}) in {self.directory}")
+
+
+def recording_clients(collector: Any, directory: str) -> Dict[str, RecordingClient]:
+    """
+    wrap an authenticated collector's clients so its calls are recorded;
+    pass the result to collector.use_clients(**clients)
+    """
+    from google.cloud import compute
+    
+    if collector.zones_client is None:
+        collector.zones_client = compute.ZonesClient(credentials=collector.credentials)
+    
+    return {
+        attr: RecordingClient(getattr(collector, attr), api, directory)
+        for attr, api in CLIENT_APIS.items()
+        if getattr(collector, attr) is not None
+    }
+
+
+def replay_clients(directory: str, latency_seconds: float = 0.0) -> Dict[str, ReplayClient]:
+    """
+    replay clients for every API; pass the result to collector.use_clients(**clients)
+    """
+    return {
+        attr: ReplayClient(api, directory, latency_seconds=latency_seconds)
+        for attr, api in CLIENT_APIS.items()
+    }
+
+
+def generate_synthetic_fleet(
+    directory: str,
+    project_id: str,
+    asset_count: int = 100_000,
+    instance_fraction: float = 0.2,
+    idle_fraction: float = 0.25,
+    zone_count: int = 40,
+    page_size: int = 1000,
+    seed: int = 0
+) -> Dict[str, int]:
+    """
+    write replay fixtures for a synthetic fleet so the collector can be
+    benchmarked at scale offline. the aggregated instance listing only
+    contains idle instances, mirroring the server-side status filter.
+    
+    returns:
+        counts of generated assets, instances and idle instances
+    """
+    from google.cloud import asset, billing, compute
+    
+    rng = random.Random(seed)
+    zones = [f"region{i // 3}-zone-{'abc'[i % 3]}" for i in range(zone_count)]
+    other_types = [
+        'compute.googleapis.com/Disk',
+        'compute.googleapis.com/Address',
+        'compute.googleapis.com/Snapshot',
+        'storage.googleapis.com/Bucket',
+        'iam.googleapis.com/ServiceAccount',
+        'pubsub.googleapis.com/Topic'
+    ]
+    machine_types = ['e2-micro', 'e2-small', 'e2-medium', 'e2-standard-2', 'n2-standard-4']
+    idle_statuses = ['STOPPED', 'SUSPENDED', 'TERMINATED']
+    
+    write_fixture(
+        directory, 'billing', 'get_project_billing_info', None, billing.ProjectBillingInfo,
+        response={
+            'name': f"projects/{project_id}/billingInfo",
+            'projectId': project_id,
+            'billingAccountName': 'billingAccounts/000000-000000-000000',
+            'billingEnabled': True
+        }
+    )
+    
+    assets = []
+    instances_by_zone: Dict[str, List[Dict[str, Any]]] = {zone: [] for zone in zones}
+    instance_count = 0
+    idle_count = 0
+    
+    for i in range(asset_count):
+        if rng.random() < instance_fraction:
+            zone = rng.choice(zones)
+            name = f"vm-{i:07d}"
+            status = rng.choice(idle_statuses) if rng.random() < idle_fraction else 'RUNNING'
+            instances_by_zone[zone].append({
+                'name': name,
+                'status': status,
+                'zone': f"https://www.googleapis.com/compute/v1/projects/{project_id}/zones/{zone}",
+                'machineType': f"zones/{zone}/machineTypes/{rng.choice(machine_types)}",
+                'creationTimestamp': '2024-01-01T00:00:00.000-07:00'
+            })
+            assets.append({
+                'name': f"//compute.googleapis.com/projects/{project_id}/zones/{zone}/instances/{name}",
+                'assetType': 'compute.googleapis.com/Instance'
+            })
+            instance_count += 1
+            idle_count += status != 'RUNNING'
+        else:
+            asset_type = rng.choice(other_types)
+            assets.append({
+                'name': f"//{asset_type.split('/')[0]}/projects/{project_id}/{asset_type.split('/')[-1].lower()}s/r-{i:07d}",
+                'assetType': asset_type
+            })
+    
+    asset_pages = []
+    for start in range(0, len(assets), page_size):
+        page = {'assets': assets[start:start + page_size]}
+        if start + page_size < len(assets):
+            page['nextPageToken'] = str(start + page_size)
+        asset_pages.append(page)
+    write_fixture(directory, 'asset', 'list_assets', None, asset.ListAssetsResponse, pages=asset_pages or [{}])
+    
+    write_fixture(
+        directory, 'zones', 'list', call_key('list', (), {'project': project_id}), compute.ZoneList,
+        pages=[{'items': [{'name': zone} for zone in zones]}]
+    )
+    for zone in zones:
+        write_fixture(
+            directory, 'compute', 'list', call_key('list', (), {'project': project_id, 'zone': zone}),
+            compute.InstanceList, pages=[{'items': instances_by_zone[zone]}]
+        )
+    
+    # server-side status filter: the aggregated listing only carries idle instances
+    idle_items = {
+        f"zones/{zone}": {'instances': [i for i in instances_by_zone[zone] if i['status'] != 'RUNNING']}
+        for zone in zones
+    }
+    write_fixture(
+        directory, 'compute', 'aggregated_list', None, compute.InstanceAggregatedList,
+        pages=[{'items': idle_items}]
+    )
+    
+    logger.info(f"Generated synthetic fleet: {asset_count} assets, {instance_count} instances, {idle_count} idle")
+    return {'assets': asset_count, 'instances': instance_count, 'idle_instances': idle_count}
@@ -0,0 +1,95 @@
+"""Lazy, read-only resource records backed by Cloud Asset protobuf messages."""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+_UNSET = object()
+
+
+class ResourceRecord(Mapping):
+    """
+    dict-like resource record that keeps the underlying asset message and only
+    converts resource.data to a python dict the first time it is read.
+    
+    reading 'name' or 'asset_type' never touches the resource payload, so a
+    type breakdown over a large inventory skips protobuf deserialization.
+    """
+    
+    __slots__ = ('_asset', 'project_id', 'collection_date', '_resource_data')
+    
+    _BASE_KEYS = ('name', 'asset_type', 'project_id', 'collection_date')
+    
+    def __init__(self, asset_item: Any, project_id: str, collection_date: str):
+        """
+        args:
+            asset_item: cloud asset message (asset_v1.Asset)
+            project_id: project the asset was collected from
+            collection_date: ISO timestamp shared by every record in the scan
+        """
+        self._asset = asset_item
+        self.project_id = project_id
+        self.collection_date = collection_date
+        self._resource_data = _UNSET
+    
+    @property
+    def name(self) -> str:
+        return self._asset.name
+    
+    @property
+    def asset_type(self) -> str:
+        return self._asset.asset_type
+    
+    @property
+    def asset(self) -> Any:
+        """underlying protobuf message"""
+        return self._asset
+    
+    @property
+    def has_resource_data(self) -> bool:
+        resource = self._asset.resource
+        return bool(resource and resource.data)
+    
+    @property
+    def resource_data(self) -> Optional[Dict[str, Any]]:
+        """
+        resource payload as a dict, converted on first access and memoized.
+        None when the asset has no payload or it cannot be converted.
+        """
+        if self._resource_data is _UNSET:
+            converted = None
+            if self.has_resource_data:
+                # convert protobuf to dict safely
+                try:
+                    converted = dict(self._asset.resource.data)
+                except Exception:
+                    converted = None
+            self._resource_data = converted
+        return self._resource_data
+    
+    def _keys(self):
+        yield from self._BASE_KEYS
+        if self.has_resource_data:
+            # if conversion fails, just note that data exists
+            yield 'resource_data' if self.resource_data is not None else 'has_resource_data'
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._BASE_KEYS:
+            return getattr(self, key)
+        if key == 'resource_data' and self.resource_data is not None:
+            return self.resource_data
+        if key == 'has_resource_data' and self.has_resource_data and self.resource_data is None:
+            return True
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return self._keys()
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self._keys())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """fully materialized plain dict (forces resource data conversion)"""
+        return dict(self.items())
+    
+    def __repr__(self) -> str:
+        return f"ResourceRecord(name={self.name!r}, asset_type={self.asset_type!r})"
@@ -0,0 +1,303 @@
+"""Persistent on-disk cache of collector API responses shared across runs."""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ('use', 'refresh', 'off')
+
+DEFAULT_CACHE_DIRECTORY = os.path.join('.cache', 'responses')
+
+
+def _to_jsonable(value: Any) -> Any:
+    """json.dump fallback for protobuf maps/repeated fields and lazy records"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, '__iter__') and not isinstance(value, (str, bytes)):
+        return list(value)
+    return str(value)
+
+
+class PartialResult(list):
+    """
+    records from a listing where some requests failed (e.g. zones that could
+    not be listed). callers get the records that were collected, but the
+    response cache never stores them, so the next run retries the whole
+    listing instead of replaying the gaps.
+    """
+    
+    def __init__(self, records: Iterable[Any] = (), failures: Iterable[str] = ()):
+        super().__init__(records)
+        self.failures = list(failures)
+
+
+class ResponseCache:
+    """
+    caches collector listings as JSON Lines files keyed by project, API method
+    and request parameters.
+    
+    each entry is a header line followed by one record per line, so entries
+    can be streamed back without loading them whole. entries expire after a
+    per-method TTL and the directory is kept under max_bytes by evicting the
+    least recently used entries (reads refresh an entry's mtime).
+    
+    modes: 'use' reads and writes, 'refresh' skips reads but stores fresh
+    results, 'off' bypasses the cache entirely.
+    """
+    
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIRECTORY,
+        default_ttl_seconds: float = 3600,
+        method_ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        mode: str = 'use'
+    ):
+        """
+        args:
+            directory: where cache entries are stored
+            default_ttl_seconds: TTL for methods without an explicit one
+            method_ttls: per-method TTL overrides in seconds
+            max_bytes: size limit for the cache directory
+            mode: use | refresh | off
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode: {mode} (expected one of {', '.join(CACHE_MODES)})")
+        
+        self.directory = directory
+        self.default_ttl_seconds = float(default_ttl_seconds)
+        self.method_ttls = {k: float(v) for k, v in (method_ttls or {}).items()}
+        self.max_bytes = int(max_bytes)
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    @classmethod
+    def from_config(cls, cache_config: Optional[Dict[str, Any]]) -> 'ResponseCache':
+        """
+        build a cache from the `cache` config section:
+            enabled, directory, max_size_mb, mode, ttl_seconds: {default, <method>: seconds}
+        without a `cache` section the cache is off.
+        """
+        if cache_config is None:
+            return cls(mode='off')
+        
+        ttls = dict(cache_config.get('ttl_seconds') or {})
+        default_ttl = ttls.pop('default', 3600)
+        mode = cache_config.get('mode', 'use')
+        if cache_config.get('enabled') is False:
+            mode = 'off'
+        
+        return cls(
+            directory=cache_config.get('directory', DEFAULT_CACHE_DIRECTORY),
+            default_ttl_seconds=default_ttl,
+            method_ttls=ttls,
+            max_bytes=int(float(cache_config.get('max_size_mb', 512)) * 1024 * 1024),
+            mode=mode
+        )
+    
+    @property
+    def readable(self) -> bool:
+        return self.mode == 'use'
+    
+    @property
+    def writable(self) -> bool:
+        return self.mode in ('use', 'refresh')
+    
+    def ttl_for(self, method: str) -> float:
+        return self.method_ttls.get(method, self.default_ttl_seconds)
+    
+    def lookup(self, project_id: str, method: str, params: Sequence[Any] = ()) -> Optional[Iterator[Any]]:
+        """
+        returns:
+            iterator streaming the cached records, or None on a miss/expired entry
+        """
+        if not self.readable:
+            return None
+        
+        path = self._path_for(project_id, method, params)
+        try:
+            handle = open(path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        
+        try:
+            header = json.loads(handle.readline())
+            if time.time() - header['stored_at'] > self.ttl_for(method):
+                handle.close()
+                self._count('misses')
+                return None
+        except (ValueError, KeyError):
+            handle.close()
+            self.logger.warning(f"Discarding corrupt cache entry: {path}")
+            self._remove(path)
+            self._count('misses')
+            return None
+        
+        # reading counts as use for LRU eviction
+        os.utime(path, None)
+        self._count('hits')
+        self.logger.debug(f"Disk cache hit: {method} ({project_id})")
+        return self._read_records(handle)
+    
+    def tee(
+        self,
+        project_id: str,
+        method: str,
+        params: Sequence[Any],
+        records: Iterable[Any]
+    ) -> Iterator[Any]:
+        """
+        yield records while writing them to a new entry. the entry is only
+        committed once the source is exhausted, so interrupted or failed
+        streams never leave a partial entry behind.
+        """
+        if not self.writable:
+            yield from records
+            return
+        
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        committed = False
+        
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                header = {
+                    'project_id': project_id,
+                    'method': method,
+                    'params': list(params),
+                    'stored_at': time.time()
+                }
+                handle.write(json.dumps(header, default=_to_jsonable) + '\n')
+                
+                for record in records:
+                    handle.write(json.dumps(record, default=_to_jsonable) + '\n')
+                    yield record
+            
+            os.replace(tmp_path, self._path_for(project_id, method, params))
+            committed = True
+            self._count('writes')
+            self._evict()
+        finally:
+            if not committed:
+                self._remove(tmp_path)
+    
+    def get_or_load(
+        self,
+        project_id: str,
+        method: str,
+        params: Sequence[Any],
+        loader: Callable[[], List[Any]]
+    ) -> List[Any]:
+        """
+        return cached records or call loader and store its result (see store).
+        """
+        cached = self.lookup(project_id, method, params)
+        if cached is not None:
+            return list(cached)
+        
+        records = loader()
+        self.store(project_id, method, params, records)
+        return records
+    
+    def store(self, project_id: str, method: str, params: Sequence[Any], records: List[Any]) -> bool:
+        """
+        write a complete listing to the cache. empty results are not stored
+        (collectors log and swallow API errors, so an empty listing may be a
+        failure) and neither are PartialResults, whose missing parts would
+        otherwise be replayed silently for the whole TTL.
+        returns:
+            whether the records were written
+        """
+        if isinstance(records, PartialResult):
+            self.logger.info(f"Not caching partial {method} for {project_id} ({len(records.failures)} failed requests)")
+            return False
+        if not records:
+            return False
+        
+        for _ in self.tee(project_id, method, params, records):
+            pass
+        return True
+    
+    def clear(self) -> int:
+        """
+        returns:
+            number of entries removed
+        """
+        removed = 0
+        for path, _, _ in self._entries():
+            self._remove(path)
+            removed += 1
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'mode': self.mode,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'evictions': self.evictions
+        }
+    
+    def _read_records(self, handle) -> Iterator[Any]:
+        with handle:
+            for line in handle:
+                yield json.loads(line)
+    
+    def _path_for(self, project_id: str, method: str, params: Sequence[Any]) -> str:
+        key = json.dumps([project_id, method, list(params)], default=str, sort_keys=True)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{method}-{digest[:32]}.jsonl")
+    
+    def _entries(self) -> List[tuple]:
+        """(path, size, mtime) for every committed entry"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.jsonl'):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        entries.append((entry.path, stat.st_size, stat.st_mtime))
+        except FileNotFoundError:
+            pass
+        return entries
+    
+    def _evict(self) -> None:
+        """drop least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda x: x[2])
+            total = sum(size for _, size, _ in entries)
+            
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                self.evictions += 1
+                self.logger.debug(f"Evicted cache entry {os.path.basename(path)}")
+    
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
@@ -0,0 +1,144 @@
+"""In-memory memoization of collector API results for a single scan session."""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# result of an in-flight async load that failed; waiters then load themselves
+_FAILED = object()
+
+
+class ScanCache:
+    """
+    caches expensive listings keyed by (project, API method, params) so every
+    consumer in a run shares a single fetch. concurrent callers of the same
+    key (worker threads, an asyncio.gather) wait for the first caller's load
+    instead of each running it.
+    """
+    
+    def __init__(self, ttl_seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        args:
+            ttl_seconds: how long an entry stays valid (None = for the whole session)
+            clock: monotonic time source
+        """
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[Hashable, ...], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # one lock per key held while loading it (sync), one future per key being loaded (async)
+        self._key_locks: Dict[Tuple[Hashable, ...], threading.RLock] = {}
+        self._pending: Dict[Tuple[Hashable, ...], asyncio.Future] = {}
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    def get_or_load(
+        self,
+        project_id: str,
+        method: str,
+        loader: Callable[[], Any],
+        params: Tuple[Hashable, ...] = ()
+    ) -> Any:
+        """
+        return the cached value for the key, calling loader on a miss. a
+        caller that arrives while another thread loads the key waits for
+        that load (if it fails, the next caller loads again).
+        """
+        key = (project_id, method) + tuple(params)
+        with self._key_lock(key):
+            found, value = self._lookup(key)
+            if found:
+                return value
+            
+            value = loader()
+            self._store(key, value)
+            return value
+    
+    async def get_or_load_async(
+        self,
+        project_id: str,
+        method: str,
+        loader: Callable[[], Awaitable[Any]],
+        params: Tuple[Hashable, ...] = ()
+    ) -> Any:
+        """
+        same as get_or_load for coroutine loaders (used by AsyncGCPCollector);
+        concurrent callers await the first caller's load
+        """
+        key = (project_id, method) + tuple(params)
+        while key in self._pending:
+            value = await asyncio.shield(self._pending[key])
+            if value is not _FAILED:
+                with self._lock:
+                    self.hits += 1
+                return value
+        
+        found, value = self._lookup(key)
+        if found:
+            return value
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await loader()
+            self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if not future.done():
+                future.set_result(_FAILED)
+            del self._pending[key]
+    
+    def invalidate(self, project_id: Optional[str] = None, method: Optional[str] = None) -> int:
+        """
+        drop cached entries, optionally only those matching project and/or method
+        returns:
+            number of entries removed
+        """
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if (project_id is None or key[0] == project_id)
+                and (method is None or key[1] == method)
+            ]
+            for key in stale:
+                del self._entries[key]
+        
+        return len(stale)
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0
+        }
+    
+    def _key_lock(self, key: Tuple[Hashable, ...]) -> threading.RLock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.RLock())
+    
+    def _lookup(self, key: Tuple[Hashable, ...]) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_expired(entry[0]):
+                self.hits += 1
+                self.logger.debug(f"Cache hit: {key[1]} ({key[0]})")
+                return True, entry[1]
+            self.misses += 1
+        
+        self.logger.debug(f"Cache miss: {key[1]} ({key[0]})")
+        return False, None
+    
+    def _store(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+    
+    def _is_expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and self.clock() - stored_at > self.ttl_seconds
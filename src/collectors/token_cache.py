@@ -0,0 +1,138 @@
+"""On-disk cache of OAuth access tokens so short repeated runs skip the token refresh."""
+
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_CACHE_PATH = os.path.join('.cache', 'token.json')
+
+
+def adc_file_path() -> Optional[str]:
+    """
+    the file application default credentials are loaded from:
+    GOOGLE_APPLICATION_CREDENTIALS, else gcloud's well-known location
+    returns:
+        the path, or None when ADC comes from the metadata server
+    """
+    path = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+    if not path:
+        config_dir = os.environ.get('CLOUDSDK_CONFIG')
+        if not config_dir:
+            if os.name == 'nt':
+                config_dir = os.path.join(os.environ.get('APPDATA', ''), 'gcloud')
+            else:
+                config_dir = os.path.join(os.path.expanduser('~'), '.config', 'gcloud')
+        path = os.path.join(config_dir, 'application_default_credentials.json')
+    return os.path.abspath(path) if os.path.exists(path) else None
+
+
+def _mtime(path: Optional[str]) -> Optional[float]:
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+class TokenCache:
+    """
+    stores one access token per credential identity (the resolved principal
+    plus scopes) with its expiry. tokens are only reused while they have more than
+    min_remaining_seconds left, and the file is written owner-readable only.
+    """
+    
+    def __init__(self, path: str = DEFAULT_TOKEN_CACHE_PATH, min_remaining_seconds: float = 300):
+        """
+        args:
+            path: JSON file holding the cached tokens
+            min_remaining_seconds: don't reuse tokens expiring sooner than this
+        """
+        self.path = path
+        self.min_remaining_seconds = float(min_remaining_seconds)
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    @staticmethod
+    def identity(credentials: Any, source: Optional[str], scopes: Sequence[str]) -> str:
+        """
+        cache key for the principal the credentials resolve to: the key or ADC
+        file and its mtime (a new key or `gcloud auth application-default
+        login` rewrites it), the service account email and key id, and the
+        quota project
+        args:
+            credentials: loaded google-auth credentials
+            source: service account key path, or None for application default credentials
+            scopes: OAuth scopes the token was issued for
+        """
+        path = os.path.abspath(source) if source else adc_file_path()
+        signer = getattr(credentials, 'signer', None)
+        blob = json.dumps([
+            path,
+            _mtime(path),
+            getattr(credentials, 'service_account_email', None),
+            getattr(signer, 'key_id', None),
+            getattr(credentials, 'quota_project_id', None),
+            sorted(scopes)
+        ], default=str)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:32]
+    
+    def restore(self, credentials: Any, identity: str) -> bool:
+        """
+        install a cached, unexpired token into credentials
+        returns:
+            True if a token was restored
+        """
+        entry = self._read().get(identity)
+        if not entry:
+            return False
+        
+        try:
+            expiry = datetime.fromisoformat(entry['expiry'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        
+        # google-auth keeps expiry as naive UTC
+        if expiry - datetime.utcnow() < timedelta(seconds=self.min_remaining_seconds):
+            return False
+        
+        credentials.token = entry['token']
+        credentials.expiry = expiry
+        self.logger.info(f"Reusing cached access token (expires {expiry.isoformat()}Z)")
+        return True
+    
+    def save(self, credentials: Any, identity: str) -> None:
+        token = getattr(credentials, 'token', None)
+        expiry = getattr(credentials, 'expiry', None)
+        if not token or expiry is None:
+            return
+        
+        entries = self._read()
+        entries[identity] = {'token': token, 'expiry': expiry.isoformat()}
+        
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            os.chmod(tmp_path, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write token cache {self.path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            self.logger.warning(f"Ignoring corrupt token cache: {self.path}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
@@ -0,0 +1,10 @@
+from .billing_frame import BillingFrame, as_billing_frame, as_billing_source
+from .cost_cube import DailyCostCube
+from .cost_store import CostStore, CostWindow
+from .snapshot import Snapshot, SnapshotWriter
+
+__all__ = [
+    'BillingFrame', 'as_billing_frame', 'as_billing_source',
+    'CostStore', 'CostWindow', 'DailyCostCube',
+    'Snapshot', 'SnapshotWriter'
+]
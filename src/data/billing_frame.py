@@ -0,0 +1,471 @@
+"""Columnar, dictionary-encoded billing line items backed by NumPy arrays."""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+import math
+from datetime import date, datetime
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# dictionary-encoded string columns; records carry them as <dimension>_name
+DIMENSIONS = ('service', 'project', 'sku', 'region')
+
+# int32 day index for line items without a usable date
+MISSING_DAY = np.iinfo(np.int32).min
+
+_EPOCH = date(1970, 1, 1)
+
+# combined rollup keys are compacted before they could overflow int64
+_MAX_KEY_SPAN = 1 << 62
+
+
+def _parse_days(values: Sequence[str]) -> np.ndarray:
+    """YYYY-MM-DD strings -> int32 days since 1970-01-01 (MISSING_DAY when unparseable)"""
+    try:
+        parsed = np.array(values, dtype='datetime64[D]')
+    except ValueError:
+        parsed = np.array([_parse_day(value) for value in values], dtype='datetime64[D]')
+    
+    days = parsed.astype(np.int64)
+    days[np.isnat(parsed)] = MISSING_DAY
+    return days.astype(np.int32)
+
+
+def _parse_day(value: str) -> np.datetime64:
+    try:
+        return np.datetime64(value, 'D')
+    except ValueError:
+        return np.datetime64('NaT', 'D')
+
+
+def day_index(value: Union[str, date, datetime]) -> int:
+    """days since 1970-01-01 for a date, datetime or YYYY-MM-DD string"""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return (value - _EPOCH).days
+    return int(np.datetime64(str(value)[:10], 'D').astype(np.int64))
+
+
+def day_label(index: int) -> str:
+    return str(np.datetime64(int(index), 'D'))
+
+
+class _Encoder:
+    """incremental dictionary encoder shared across chunks"""
+    
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+    
+    def encode(self, values: Iterable[Any]) -> np.ndarray:
+        codes = self.codes
+        encoded = [codes.setdefault(value or 'Unknown', len(codes)) for value in values]
+        return np.array(encoded, dtype=np.int32)
+    
+    @property
+    def categories(self) -> List[str]:
+        return list(self.codes)
+
+
+class BillingFrame:
+    """
+    billing line items as parallel columns: float64 cost/usage/credits,
+    int32 day indexes (days since 1970-01-01) and int32 codes into a
+    per-dimension category list for service, project, SKU and region.
+    
+    every analyzer accepts a frame in place of a list of record dicts, and
+    aggregations (group_costs, total_cost, daily_costs) run as NumPy
+    reductions instead of per-row Python loops.
+    """
+    
+    def __init__(
+        self,
+        cost: np.ndarray,
+        day: np.ndarray,
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+        usage: Optional[np.ndarray] = None,
+        credits: Optional[np.ndarray] = None
+    ):
+        """
+        args:
+            cost: cost per line item
+            day: day index per line item (MISSING_DAY when unknown)
+            codes: per-dimension category codes
+            categories: per-dimension category labels, indexed by code
+            usage: usage amount per line item (default: zeros)
+            credits: summed credits per line item (default: zeros)
+        """
+        size = len(cost)
+        self.cost = np.asarray(cost, dtype=np.float64)
+        self.day = np.asarray(day, dtype=np.int32)
+        self.usage = np.zeros(size) if usage is None else np.asarray(usage, dtype=np.float64)
+        self.credits = np.zeros(size) if credits is None else np.asarray(credits, dtype=np.float64)
+        self.codes = {}
+        self.categories = {}
+        
+        for dimension in DIMENSIONS:
+            dimension_codes = codes.get(dimension)
+            if dimension_codes is None:
+                # absent dimension: every line item is 'Unknown'
+                self.codes[dimension] = np.zeros(size, dtype=np.int32)
+                self.categories[dimension] = ['Unknown']
+            else:
+                self.codes[dimension] = np.asarray(dimension_codes, dtype=np.int32)
+                self.categories[dimension] = list(categories[dimension])
+        
+        for name in ('day', 'usage', 'credits'):
+            if len(getattr(self, name)) != size:
+                raise ValueError(f"Column {name} has {len(getattr(self, name))} rows, expected {size}")
+    
+    @classmethod
+    def empty(cls) -> 'BillingFrame':
+        return cls(np.zeros(0), np.zeros(0, dtype=np.int32), {}, {})
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'BillingFrame':
+        """
+        build a frame from billing record dicts (date or collection_date,
+        <dimension>_name, cost, usage_amount, credits)
+        """
+        return cls.from_chunks([records if isinstance(records, list) else list(records)])
+    
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Sequence[Dict[str, Any]]]) -> 'BillingFrame':
+        """
+        build a frame from a stream of record chunks (e.g.
+        BillingExportCollector.iter_chunks) - only one chunk of dicts is held
+        in memory at a time
+        """
+        encoders = {dimension: _Encoder() for dimension in DIMENSIONS}
+        columns: Dict[str, List[np.ndarray]] = {
+            name: [] for name in ('cost', 'day', 'usage', 'credits') + DIMENSIONS
+        }
+        
+        for chunk in chunks:
+            if not chunk:
+                continue
+            columns['cost'].append(np.array([float(r.get('cost', 0) or 0) for r in chunk]))
+            columns['usage'].append(np.array([float(r.get('usage_amount', 0) or 0) for r in chunk]))
+            columns['credits'].append(np.array([float(r.get('credits', 0) or 0) for r in chunk]))
+            columns['day'].append(_parse_days([
+                str(r.get('date') or r.get('collection_date') or '')[:10] for r in chunk
+            ]))
+            for dimension, encoder in encoders.items():
+                key = f'{dimension}_name'
+                columns[dimension].append(encoder.encode(r.get(key) for r in chunk))
+        
+        if not columns['cost']:
+            return cls.empty()
+        
+        return cls(
+            np.concatenate(columns['cost']),
+            np.concatenate(columns['day']),
+            {dimension: np.concatenate(columns[dimension]) for dimension in DIMENSIONS},
+            {dimension: encoder.categories for dimension, encoder in encoders.items()},
+            usage=np.concatenate(columns['usage']),
+            credits=np.concatenate(columns['credits'])
+        )
+    
+    @classmethod
+    def concat(cls, frames: Sequence['BillingFrame']) -> 'BillingFrame':
+        """stack frames, merging their category lists and re-coding each frame into them"""
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+        
+        codes = {}
+        categories = {}
+        for dimension in DIMENSIONS:
+            merged: Dict[str, int] = {}
+            recoded = []
+            for frame in frames:
+                lookup = np.array(
+                    [merged.setdefault(label, len(merged)) for label in frame.categories[dimension]],
+                    dtype=np.int32
+                )
+                recoded.append(lookup[frame.codes[dimension]])
+            codes[dimension] = np.concatenate(recoded)
+            categories[dimension] = list(merged)
+        
+        return cls(
+            np.concatenate([frame.cost for frame in frames]),
+            np.concatenate([frame.day for frame in frames]),
+            codes,
+            categories,
+            usage=np.concatenate([frame.usage for frame in frames]),
+            credits=np.concatenate([frame.credits for frame in frames])
+        )
+    
+    def __len__(self) -> int:
+        return len(self.cost)
+    
+    @property
+    def nbytes(self) -> int:
+        """memory held by the column arrays"""
+        arrays = [self.cost, self.day, self.usage, self.credits] + list(self.codes.values())
+        return sum(array.nbytes for array in arrays)
+    
+    def group_costs(self, dimension: str) -> Dict[str, float]:
+        """
+        total cost per category of a dimension (service, project, sku, region)
+        raises:
+            ValueError: for a dimension the frame doesn't carry
+        """
+        if dimension not in self.codes:
+            raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+        if len(self) == 0:
+            return {}
+        
+        categories = self.categories[dimension]
+        totals = np.bincount(self.codes[dimension], weights=self.cost, minlength=len(categories))
+        present = np.bincount(self.codes[dimension], minlength=len(categories)) > 0
+        return {categories[i]: float(totals[i]) for i in np.flatnonzero(present)}
+    
+    def total_cost(self) -> float:
+        return float(self.cost.sum())
+    
+    def daily_costs(self) -> Dict[str, float]:
+        """cost per day (YYYY-MM-DD), ascending; line items without a date are left out"""
+        first_day, totals, present = self._day_bins()
+        return {day_label(first_day + i): float(totals[i]) for i in np.flatnonzero(present)}
+    
+    def day_count(self) -> int:
+        """distinct known days"""
+        return int(self._day_bins()[2].sum())
+    
+    def _day_bins(self):
+        """
+        per-day cost bins over the frame's date span - one O(n) bincount
+        instead of sorting the day column
+        returns:
+            tuple of (first day index, cost per day offset, mask of days with line items)
+        """
+        known = self.day != MISSING_DAY
+        days = self.day[known]
+        if len(days) == 0:
+            return 0, np.zeros(0), np.zeros(0, dtype=bool)
+        
+        first_day = int(days.min())
+        offsets = days - first_day
+        totals = np.bincount(offsets, weights=self.cost[known])
+        present = np.bincount(offsets) > 0
+        return first_day, totals, present
+    
+    def rollup(self, dimensions: Sequence[str], by_day: bool = False) -> 'BillingFrame':
+        """
+        one row per distinct combination of the given dimensions (and day,
+        with by_day), with cost, usage and credits summed - a single pass over
+        the line items. the other dimensions collapse to 'Unknown' and, unless
+        by_day, day to MISSING_DAY; the result can be rolled up again to
+        coarser groupings.
+        raises:
+            ValueError: for an unknown dimension
+        """
+        index, codes, size = self._group_index(dimensions, by_day)
+        
+        def summed(values):
+            return np.bincount(index, weights=values, minlength=size)
+        
+        return BillingFrame(
+            summed(self.cost),
+            codes.pop('day') if by_day else np.full(size, MISSING_DAY, dtype=np.int32),
+            codes,
+            {dimension: self.categories[dimension] for dimension in dimensions},
+            usage=summed(self.usage),
+            credits=summed(self.credits)
+        )
+    
+    def daily_series(self, dimensions: Sequence[str]):
+        """
+        daily cost per distinct combination of the given dimensions, as one
+        dense series x day matrix (days without line items are 0) built with
+        a single bincount. line items without a date are left out.
+        returns:
+            tuple of (series keys as {dimension: label} dicts, first day index, cost matrix)
+        raises:
+            ValueError: for an unknown dimension
+        """
+        known = self.day != MISSING_DAY
+        frame = self if known.all() else self.take(known)
+        index, codes, size = frame._group_index(dimensions)
+        if len(frame) == 0:
+            return [], 0, np.zeros((0, 0))
+        
+        first_day = int(frame.day.min())
+        day_span = int(frame.day.max()) - first_day + 1
+        matrix = np.bincount(
+            index * day_span + (frame.day - first_day),
+            weights=frame.cost,
+            minlength=size * day_span
+        ).reshape(size, day_span)
+        
+        labels = {dimension: frame.categories[dimension] for dimension in dimensions}
+        keys = [
+            {dimension: labels[dimension][code] for dimension, code in zip(dimensions, cell)}
+            for cell in zip(*(codes[dimension].tolist() for dimension in dimensions))
+        ] if dimensions else [{}]
+        return keys, first_day, matrix
+    
+    def _group_index(self, dimensions: Sequence[str], by_day: bool = False):
+        """
+        group id per line item for the distinct combinations of dimensions
+        (and day, with by_day)
+        returns:
+            tuple of (group id per line item, per-dimension codes per group
+            plus 'day' indexes with by_day, group count)
+        """
+        for dimension in dimensions:
+            if dimension not in self.codes:
+                raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+        
+        key_codes = {dimension: self.codes[dimension] for dimension in dimensions}
+        sizes = [len(self.categories[dimension]) for dimension in dimensions]
+        if by_day:
+            # days as one more key column: offsets from the first day, with
+            # undated line items in a slot of their own after the last day
+            known = self.day != MISSING_DAY
+            first_day = int(self.day[known].min()) if known.any() else 0
+            day_span = int(self.day[known].max()) - first_day + 1 if known.any() else 0
+            key_codes = dict(key_codes, day=np.where(known, self.day - first_day, day_span))
+            sizes.append(day_span + 1)
+        
+        key = np.zeros(len(self), dtype=np.int64)
+        span = 1
+        for codes, size in zip(key_codes.values(), sizes):
+            if span * size >= _MAX_KEY_SPAN:
+                # keep the combined key inside int64 by compacting it first
+                key = np.unique(key, return_inverse=True)[1].astype(np.int64)
+                span = int(key.max()) + 1 if len(key) else 1
+            key = key * size + codes
+            span *= size
+        
+        codes = {}
+        if span <= max(2 * len(self), 1 << 16) and span == math.prod(sizes):
+            # dense key space: bin straight into the cross product
+            cells = np.flatnonzero(np.bincount(key, minlength=span))
+            lookup = np.zeros(span, dtype=np.int64)
+            lookup[cells] = np.arange(len(cells))
+            index = lookup[key]
+            remaining = cells.astype(np.int64)
+            for name, size in reversed(list(zip(key_codes, sizes))):
+                codes[name] = (remaining % size).astype(np.int32)
+                remaining //= size
+        else:
+            # sparse (high-cardinality) combinations: compact the keys and
+            # read each group's codes off its first line item
+            cells, first, index = np.unique(key, return_index=True, return_inverse=True)
+            for name, values in key_codes.items():
+                codes[name] = values[first].astype(np.int32)
+        
+        if by_day:
+            day_offsets = codes['day']
+            codes['day'] = np.where(day_offsets == day_span, MISSING_DAY, day_offsets + first_day).astype(np.int32)
+        
+        return index, codes, len(cells)
+    
+    def filter(
+        self,
+        start_date: Optional[Union[str, date, datetime]] = None,
+        end_date: Optional[Union[str, date, datetime]] = None,
+        **dimension_values: str
+    ) -> 'BillingFrame':
+        """
+        line items within [start_date, end_date] (inclusive, by day) whose
+        dimensions match, e.g. frame.filter(service='Compute Engine')
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if start_date is not None:
+            mask &= self.day >= day_index(start_date)
+        if end_date is not None:
+            mask &= (self.day <= day_index(end_date)) & (self.day != MISSING_DAY)
+        
+        for dimension, value in dimension_values.items():
+            if dimension not in self.codes:
+                raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+            categories = self.categories[dimension]
+            code = categories.index(value) if value in categories else -1
+            mask &= self.codes[dimension] == code
+        
+        return self.take(mask)
+    
+    def take(self, selection: np.ndarray) -> 'BillingFrame':
+        """new frame with the rows selected by a boolean mask or index array (categories are shared)"""
+        return BillingFrame(
+            self.cost[selection],
+            self.day[selection],
+            {dimension: codes[selection] for dimension, codes in self.codes.items()},
+            self.categories,
+            usage=self.usage[selection],
+            credits=self.credits[selection]
+        )
+    
+    def labels(self, dimension: str) -> np.ndarray:
+        """decoded category label per line item"""
+        return np.asarray(self.categories[dimension], dtype=object)[self.codes[dimension]]
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """decode back into record dicts (for small frames and debugging)"""
+        labels = {dimension: self.labels(dimension) for dimension in DIMENSIONS}
+        records = []
+        for i in range(len(self)):
+            record = {'date': day_label(self.day[i]) if self.day[i] != MISSING_DAY else ''}
+            for dimension in DIMENSIONS:
+                record[f'{dimension}_name'] = labels[dimension][i]
+            record['cost'] = float(self.cost[i])
+            record['usage_amount'] = float(self.usage[i])
+            record['credits'] = float(self.credits[i])
+            records.append(record)
+        return records
+
+
+BillingData = Union[BillingFrame, Iterable[Dict[str, Any]]]
+
+
+def top_indices(values: np.ndarray, n: Optional[int] = None) -> np.ndarray:
+    """
+    indexes of the n largest values, largest first. argpartition selects
+    them in O(len) and only those n are sorted, so top-N over
+    high-cardinality keys never sorts the whole array.
+    """
+    values = np.asarray(values)
+    if n is None or n >= len(values):
+        return np.argsort(-values, kind='stable')
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    selected = np.argpartition(-values, n - 1)[:n]
+    return selected[np.argsort(-values[selected], kind='stable')]
+
+
+def as_billing_frame(data: Optional[BillingData]) -> BillingFrame:
+    """
+    the common billing source for analyzers: frames pass through, snapshots
+    (anything with to_billing_frame) hand over their memory-mapped frame and
+    record dicts are encoded once
+    """
+    if isinstance(data, BillingFrame):
+        return data
+    if hasattr(data, 'to_billing_frame'):
+        return data.to_billing_frame()
+    if data is None:
+        return BillingFrame.empty()
+    return BillingFrame.from_records(data)
+
+
+# aggregations the analyzers call on a billing source
+AGGREGATION_METHODS = ('group_costs', 'total_cost', 'daily_costs', 'day_count', 'rollup', 'daily_series', '__len__')
+
+
+def as_billing_source(data: Optional[BillingData]) -> Any:
+    """
+    like as_billing_frame, but anything that already answers the aggregation
+    methods itself (a frame, a CostStore window) passes through, so stores can
+    push the aggregation down instead of materializing their rows
+    """
+    if data is not None and all(hasattr(data, name) for name in AGGREGATION_METHODS):
+        return data
+    return as_billing_frame(data)
@@ -0,0 +1,116 @@
+"""Pre-aggregated daily cost cube (day x service x project x SKU x region)."""
+
+from datetime import date, datetime
+from typing import Dict, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+
+from .billing_frame import DIMENSIONS, MISSING_DAY, BillingData, BillingFrame, as_billing_source, day_label
+from .snapshot import Snapshot, SnapshotWriter
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[str, date, datetime]
+
+
+class DailyCostCube:
+    """
+    billing line items summed to one cell per (day, service, project, sku,
+    region). a year of line items usually collapses to a few thousand cells,
+    so analyzers that take the cube in place of the raw data read those cells
+    instead of re-scanning every row - build it once, then pass it (or
+    cube.filter(...) slices) to every CostAnalyzer method.
+    
+    refresh() folds in newly arrived data: every day present in the new data
+    replaces that day in the cube, so re-loading a revised day doesn't
+    double count. line items without a date have no day to replace, so they
+    are added to the undated cells already in the cube.
+    """
+    
+    def __init__(self, cells: Optional[BillingFrame] = None):
+        """
+        args:
+            cells: frame with one row per (day, dimensions) cell, as built by build()
+        """
+        self.cells = cells if cells is not None else BillingFrame.empty()
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    @classmethod
+    def build(cls, billing_data: BillingData) -> 'DailyCostCube':
+        """
+        aggregate billing data (records, a frame, a snapshot or a CostStore
+        window, which groups in SQL) into a cube
+        """
+        return cls(as_billing_source(billing_data).rollup(DIMENSIONS, by_day=True))
+    
+    def refresh(self, billing_data: BillingData) -> int:
+        """
+        replace the days present in the new billing data with its cells;
+        undated cells are added to the cube's existing ones
+        returns:
+            number of days added or replaced
+        """
+        fresh = as_billing_source(billing_data).rollup(DIMENSIONS, by_day=True)
+        if len(fresh) == 0:
+            return 0
+        
+        # MISSING_DAY isn't a day: replacing it would drop every earlier undated cell
+        days = np.unique(fresh.day[fresh.day != MISSING_DAY])
+        kept = self.cells.take(~np.isin(self.cells.day, days))
+        self.cells = BillingFrame.concat([kept, fresh])
+        self.logger.info(f"Refreshed {len(days)} days; cube has {len(self.cells)} cells")
+        return len(days)
+    
+    def save(self, directory: str) -> str:
+        """write the cells as a snapshot directory (see SnapshotWriter)"""
+        writer = SnapshotWriter(directory, metadata={'kind': 'daily_cost_cube'})
+        writer.set_billing(self.cells)
+        return writer.close()
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'DailyCostCube':
+        """load a cube saved with save(); the cells are memory-mapped by default"""
+        return cls(Snapshot.load(directory, mmap=mmap).billing)
+    
+    def filter(
+        self,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+        **dimension_values: str
+    ) -> 'DailyCostCube':
+        """sub-cube for a date range and/or dimension values (see BillingFrame.filter)"""
+        return DailyCostCube(self.cells.filter(start_date, end_date, **dimension_values))
+    
+    def date_range(self) -> Optional[Tuple[str, str]]:
+        """first and last day in the cube, or None when it has no dated cells"""
+        days = self.cells.day[self.cells.day != MISSING_DAY]
+        if len(days) == 0:
+            return None
+        return day_label(int(days.min())), day_label(int(days.max()))
+    
+    @property
+    def nbytes(self) -> int:
+        return self.cells.nbytes
+    
+    # aggregations answered from the cells
+    def __len__(self) -> int:
+        return len(self.cells)
+    
+    def total_cost(self) -> float:
+        return self.cells.total_cost()
+    
+    def group_costs(self, dimension: str) -> Dict[str, float]:
+        return self.cells.group_costs(dimension)
+    
+    def daily_costs(self) -> Dict[str, float]:
+        return self.cells.daily_costs()
+    
+    def day_count(self) -> int:
+        return self.cells.day_count()
+    
+    def rollup(self, dimensions: Sequence[str], by_day: bool = False) -> BillingFrame:
+        return self.cells.rollup(dimensions, by_day)
+    
+    def daily_series(self, dimensions: Sequence[str]):
+        return self.cells.daily_series(dimensions)
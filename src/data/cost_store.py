@@ -0,0 +1,403 @@
+"""Local SQLite history of billing line items with aggregation pushed down into SQL."""
+
+import os
+import sqlite3
+import threading
+from itertools import repeat
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+
+from .billing_frame import DIMENSIONS, MISSING_DAY, BillingFrame, day_index, day_label
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COST_STORE_PATH = os.path.join('data', 'costs.sqlite')
+
+DateLike = Union[str, date, datetime]
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        source TEXT NOT NULL,
+        loaded_at TEXT NOT NULL,
+        first_day INTEGER,
+        last_day INTEGER,
+        row_count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS line_items (
+        day INTEGER NOT NULL,
+        service_id INTEGER NOT NULL,
+        project_id INTEGER NOT NULL,
+        sku_id INTEGER NOT NULL,
+        region_id INTEGER NOT NULL,
+        cost REAL NOT NULL,
+        usage REAL NOT NULL,
+        credits REAL NOT NULL,
+        run_id INTEGER NOT NULL
+    )
+    """,
+    # covers day-range scans and the per-dimension filters/groupings below
+    "CREATE INDEX IF NOT EXISTS idx_line_items_day ON line_items (day, service_id, project_id, sku_id)",
+    "CREATE INDEX IF NOT EXISTS idx_line_items_run ON line_items (run_id)",
+] + [
+    f"CREATE TABLE IF NOT EXISTS {dimension}_names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)"
+    for dimension in DIMENSIONS
+]
+
+
+class CostWindow:
+    """
+    a date range (and optional dimension filter) over a CostStore. offers the
+    same aggregation methods as BillingFrame, each answered by one SQL query,
+    so analyzers accept it without pulling raw rows into Python.
+    """
+    
+    def __init__(
+        self,
+        store: 'CostStore',
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+        **dimension_values: str
+    ):
+        for dimension in dimension_values:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+        
+        self.store = store
+        self.start_date = start_date
+        self.end_date = end_date
+        self.dimension_values = dimension_values
+    
+    def __len__(self) -> int:
+        where, params = self._where()
+        return int(self.store._query(f"SELECT COUNT(*) FROM line_items l {where}", params)[0][0])
+    
+    def total_cost(self) -> float:
+        where, params = self._where()
+        return float(self.store._query(f"SELECT COALESCE(SUM(cost), 0) FROM line_items l {where}", params)[0][0])
+    
+    def group_costs(self, dimension: str) -> Dict[str, float]:
+        """
+        total cost per category of a dimension
+        raises:
+            ValueError: for a dimension other than service, project, sku or region
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+        
+        where, params = self._where()
+        rows = self.store._query(
+            f"SELECT n.name, SUM(l.cost) FROM line_items l "
+            f"JOIN {dimension}_names n ON n.id = l.{dimension}_id {where} "
+            f"GROUP BY l.{dimension}_id",
+            params
+        )
+        return {name: float(total) for name, total in rows}
+    
+    def daily_costs(self) -> Dict[str, float]:
+        """cost per day (YYYY-MM-DD), ascending; line items without a date are left out"""
+        where, params = self._where(known_days=True)
+        rows = self.store._query(
+            f"SELECT day, SUM(cost) FROM line_items l {where} GROUP BY day ORDER BY day",
+            params
+        )
+        return {day_label(day): float(total) for day, total in rows}
+    
+    def day_count(self) -> int:
+        where, params = self._where(known_days=True)
+        return int(self.store._query(f"SELECT COUNT(DISTINCT day) FROM line_items l {where}", params)[0][0])
+    
+    def to_frame(self) -> BillingFrame:
+        """pull the window's line items into a BillingFrame"""
+        where, params = self._where()
+        columns = ', '.join(f"l.{dimension}_id" for dimension in DIMENSIONS)
+        rows = self.store._query(f"SELECT l.day, l.cost, l.usage, l.credits, {columns} FROM line_items l {where}", params)
+        return self._frame(rows, DIMENSIONS)
+    
+    def rollup(self, dimensions: Sequence[str], by_day: bool = False) -> BillingFrame:
+        """
+        one row per distinct combination of the given dimensions (and day,
+        with by_day; see BillingFrame.rollup), computed by a single GROUP BY
+        in the store
+        """
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+        
+        where, params = self._where()
+        columns = [f"l.{dimension}_id" for dimension in dimensions]
+        keys = ['l.day'] + columns if by_day else columns
+        group_by = f"GROUP BY {', '.join(keys)}" if keys else ""
+        rows = self.store._query(
+            f"SELECT {'l.day' if by_day else MISSING_DAY}, SUM(l.cost), SUM(l.usage), SUM(l.credits)"
+            f"{''.join(', ' + column for column in columns)} FROM line_items l {where} {group_by}",
+            params
+        )
+        # without GROUP BY an empty window still yields one row of NULL sums
+        return self._frame([row for row in rows if row[1] is not None], dimensions)
+    
+    def daily_series(self, dimensions: Sequence[str]):
+        """
+        daily cost matrix per combination of dimensions (see
+        BillingFrame.daily_series), from one GROUP BY over (dimensions, day)
+        """
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {dimension} (expected one of {', '.join(DIMENSIONS)})")
+        
+        where, params = self._where(known_days=True)
+        columns = ''.join(f", l.{dimension}_id" for dimension in dimensions)
+        rows = self.store._query(
+            f"SELECT l.day, SUM(l.cost){columns} FROM line_items l {where} GROUP BY l.day{columns}",
+            params
+        )
+        if not rows:
+            return [], 0, np.zeros((0, 0))
+        
+        table = np.array(rows, dtype=np.float64)
+        days = table[:, 0].astype(np.int64)
+        ids = table[:, 2:].astype(np.int64)
+        series, index = np.unique(ids, axis=0, return_inverse=True)
+        first_day = int(days.min())
+        matrix = np.zeros((len(series), int(days.max()) - first_day + 1))
+        matrix[index.reshape(-1), days - first_day] = table[:, 1]
+        
+        names = {dimension: self.store._names(dimension) for dimension in dimensions}
+        keys = [
+            {dimension: names[dimension][int(store_id)] for dimension, store_id in zip(dimensions, row)}
+            for row in series.tolist()
+        ]
+        return keys, first_day, matrix
+    
+    def _frame(self, rows: List[tuple], dimensions: Sequence[str]) -> BillingFrame:
+        """
+        (day, cost, usage, credits, <dimension ids>...) rows -> BillingFrame,
+        re-coding store ids into per-frame category codes
+        """
+        if not rows:
+            return BillingFrame.empty()
+        
+        table = np.array(rows, dtype=np.float64)
+        codes = {}
+        categories = {}
+        for i, dimension in enumerate(dimensions):
+            ids, inverse = np.unique(table[:, 4 + i].astype(np.int64), return_inverse=True)
+            names = self.store._names(dimension)
+            codes[dimension] = inverse.astype(np.int32)
+            categories[dimension] = [names[int(store_id)] for store_id in ids]
+        
+        return BillingFrame(
+            table[:, 1],
+            table[:, 0].astype(np.int32),
+            codes,
+            categories,
+            usage=table[:, 2],
+            credits=table[:, 3]
+        )
+    
+    def _where(self, known_days: bool = False) -> Tuple[str, List[Any]]:
+        clauses = []
+        params: List[Any] = []
+        if self.start_date is not None:
+            clauses.append("l.day >= ?")
+            params.append(day_index(self.start_date))
+        if self.end_date is not None:
+            clauses.append("l.day <= ?")
+            params.append(day_index(self.end_date))
+        if known_days or self.end_date is not None:
+            clauses.append("l.day != ?")
+            params.append(MISSING_DAY)
+        for dimension, value in self.dimension_values.items():
+            clauses.append(f"l.{dimension}_id = (SELECT id FROM {dimension}_names WHERE name = ?)")
+            params.append(value)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+class CostStore:
+    """
+    SQLite store of billing line items, indexed on (day, service, project, sku).
+    
+    each append() is one run: rows from the same source that fall inside the
+    new data's day range are replaced, so re-loading an overlapping export
+    (billing data is revised for a few days) never double counts. string
+    dimensions are stored once in per-dimension name tables.
+    """
+    
+    def __init__(self, path: str = DEFAULT_COST_STORE_PATH):
+        """
+        args:
+            path: SQLite database file (':memory:' for a throwaway store)
+        """
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._name_cache: Dict[str, Dict[int, str]] = {}
+        self.logger = logger.getChild(self.__class__.__name__)
+        
+        with self._lock, self._connection:
+            # one writer per run; WAL keeps readers unblocked during an append
+            if path != ':memory:':
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+    
+    @classmethod
+    def from_config(cls, store_config: Optional[Dict[str, Any]]) -> Optional['CostStore']:
+        """
+        build a store from the `cost_store` config section (path), or None when it is absent
+        """
+        if not store_config or store_config.get('enabled') is False:
+            return None
+        return cls(store_config.get('path', DEFAULT_COST_STORE_PATH))
+    
+    def close(self) -> None:
+        self._connection.close()
+    
+    def append(self, frame: BillingFrame, source: str = 'default') -> int:
+        """
+        add a run's line items, replacing rows from the same source within
+        the frame's day range (and its undated rows, when the frame has any)
+        args:
+            frame: line items to store
+            source: where the rows came from (e.g. the export path or project id)
+        returns:
+            number of rows stored
+        """
+        if len(frame) == 0:
+            return 0
+        
+        dated = frame.day != MISSING_DAY
+        known_days = frame.day[dated]
+        first_day = int(known_days.min()) if len(known_days) else None
+        last_day = int(known_days.max()) if len(known_days) else None
+        
+        with self._lock, self._connection:
+            # map the frame's category codes to store ids with one lookup array per dimension
+            store_ids = {
+                dimension: self._ensure_names(dimension, frame.categories[dimension])[frame.codes[dimension]]
+                for dimension in DIMENSIONS
+            }
+            
+            if first_day is not None:
+                self._connection.execute(
+                    "DELETE FROM line_items WHERE day BETWEEN ? AND ? "
+                    "AND run_id IN (SELECT id FROM runs WHERE source = ?)",
+                    (first_day, last_day, source)
+                )
+            if not dated.all():
+                # undated rows have no day range, so a reload replaces all of the source's
+                self._connection.execute(
+                    "DELETE FROM line_items WHERE day = ? "
+                    "AND run_id IN (SELECT id FROM runs WHERE source = ?)",
+                    (MISSING_DAY, source)
+                )
+            run_id = self._connection.execute(
+                "INSERT INTO runs (source, loaded_at, first_day, last_day, row_count) VALUES (?, ?, ?, ?, ?)",
+                (source, datetime.now().isoformat(), first_day, last_day, len(frame))
+            ).lastrowid
+            
+            # inserting in index order turns the index updates into appends
+            order = np.lexsort(tuple(store_ids[dimension] for dimension in ('sku', 'project', 'service')) + (frame.day,))
+            rows = zip(
+                frame.day[order].tolist(),
+                *(store_ids[dimension][order].tolist() for dimension in DIMENSIONS),
+                frame.cost[order].tolist(),
+                frame.usage[order].tolist(),
+                frame.credits[order].tolist(),
+                repeat(run_id)
+            )
+            self._connection.executemany(
+                "INSERT INTO line_items (day, service_id, project_id, sku_id, region_id, cost, usage, credits, "
+                "run_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        
+        self.logger.info(f"Stored {len(frame)} line items from {source} (run {run_id})")
+        return len(frame)
+    
+    def window(
+        self,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+        **dimension_values: str
+    ) -> CostWindow:
+        """
+        aggregation view over [start_date, end_date] (inclusive, by day),
+        optionally filtered, e.g. store.window('2024-01-01', service='Compute Engine')
+        """
+        return CostWindow(self, start_date, end_date, **dimension_values)
+    
+    def date_range(self) -> Optional[Tuple[str, str]]:
+        """first and last stored usage day, or None when the store is empty"""
+        first, last = self._query("SELECT MIN(day), MAX(day) FROM line_items WHERE day != ?", [MISSING_DAY])[0]
+        if first is None:
+            return None
+        return day_label(first), day_label(last)
+    
+    def runs(self) -> List[Dict[str, Any]]:
+        rows = self._query("SELECT id, source, loaded_at, first_day, last_day, row_count FROM runs ORDER BY id")
+        return [
+            {
+                'id': run_id,
+                'source': source,
+                'loaded_at': loaded_at,
+                'first_day': day_label(first_day) if first_day is not None else None,
+                'last_day': day_label(last_day) if last_day is not None else None,
+                'row_count': row_count
+            }
+            for run_id, source, loaded_at, first_day, last_day, row_count in rows
+        ]
+    
+    # the whole store is a window without bounds
+    def __len__(self) -> int:
+        return len(self.window())
+    
+    def total_cost(self) -> float:
+        return self.window().total_cost()
+    
+    def group_costs(self, dimension: str) -> Dict[str, float]:
+        return self.window().group_costs(dimension)
+    
+    def daily_costs(self) -> Dict[str, float]:
+        return self.window().daily_costs()
+    
+    def day_count(self) -> int:
+        return self.window().day_count()
+    
+    def rollup(self, dimensions: Sequence[str], by_day: bool = False) -> BillingFrame:
+        return self.window().rollup(dimensions, by_day)
+    
+    def daily_series(self, dimensions: Sequence[str]):
+        return self.window().daily_series(dimensions)
+    
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, list(params)).fetchall()
+    
+    def _ensure_names(self, dimension: str, names: Sequence[str]) -> np.ndarray:
+        """
+        store ids for category names, inserting new ones (caller holds the lock)
+        returns:
+            int64 array mapping frame category code -> store id
+        """
+        table = f"{dimension}_names"
+        self._connection.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", ((name,) for name in names))
+        ids = dict(self._connection.execute(f"SELECT name, id FROM {table}").fetchall())
+        self._name_cache.pop(dimension, None)
+        return np.array([ids[name] for name in names], dtype=np.int64)
+    
+    def _names(self, dimension: str) -> Dict[int, str]:
+        if dimension not in self._name_cache:
+            rows = self._query(f"SELECT id, name FROM {dimension}_names")
+            self._name_cache[dimension] = dict(rows)
+        return self._name_cache[dimension]
@@ -0,0 +1,265 @@
+"""Memory-mapped columnar snapshots of a scan's billing, asset and idle-instance data."""
+
+import os
+import json
+import shutil
+import tempfile
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import logging
+
+import numpy as np
+
+from .billing_frame import DIMENSIONS, BillingFrame
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+META_FILE = 'meta.json'
+IDLE_INSTANCES_FILE = 'idle_instances.json'
+ASSET_NAME_DATA_FILE = 'assets.name_data.bin'
+
+# fixed-width billing columns, stored as billing.<attribute>.npy
+BILLING_COLUMNS = ('cost', 'usage', 'credits', 'day')
+
+
+class SnapshotWriter:
+    """
+    writes a snapshot directory:
+        
+        meta.json                 format version, counts, string dictionaries
+        billing.<column>.npy      cost/usage/credits (float64), day (int32)
+        billing.<dimension>.npy   int32 codes into meta.json categories
+        assets.<column>.npy       asset_type/project codes, name offsets
+        assets.name_data.bin      concatenated UTF-8 asset names
+        idle_instances.json       idle instance records
+    
+    resources can be streamed in with add_resource(); everything lands in a
+    temporary directory that replaces the target only on close().
+    """
+    
+    def __init__(self, directory: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        args:
+            directory: snapshot directory (replaced if it exists)
+            metadata: extra scan details stored in meta.json (project_id, dates, ...)
+        """
+        self.directory = directory
+        self.metadata = dict(metadata or {})
+        # created on first write, so a run that aborts early leaves nothing behind
+        self._tmp_dir: Optional[str] = None
+        self._name_data = None
+        
+        self._frame: Optional[BillingFrame] = None
+        self._idle_instances: List[Dict[str, Any]] = []
+        self._asset_types: Dict[str, int] = {}
+        self._asset_projects: Dict[str, int] = {}
+        self._type_codes = array('i')
+        self._project_codes = array('i')
+        self._name_offsets = array('q', [0])
+        self._collection_date = None
+        self._closed = False
+        self.logger = logger.getChild(self.__class__.__name__)
+    
+    def set_billing(self, frame: BillingFrame) -> None:
+        self._frame = frame
+    
+    def set_idle_instances(self, idle_instances: Iterable[Dict[str, Any]]) -> None:
+        self._idle_instances = [dict(instance) for instance in idle_instances]
+    
+    def add_resource(self, resource: Dict[str, Any]) -> None:
+        asset_type = resource.get('asset_type') or 'Unknown'
+        project_id = resource.get('project_id') or 'Unknown'
+        name = (resource.get('name') or '').encode('utf-8')
+        self._open()
+        
+        self._type_codes.append(self._asset_types.setdefault(asset_type, len(self._asset_types)))
+        self._project_codes.append(self._asset_projects.setdefault(project_id, len(self._asset_projects)))
+        self._name_data.write(name)
+        self._name_offsets.append(self._name_offsets[-1] + len(name))
+        if self._collection_date is None:
+            self._collection_date = resource.get('collection_date')
+    
+    def add_resources(self, resources: Iterable[Dict[str, Any]]) -> None:
+        for resource in resources:
+            self.add_resource(resource)
+    
+    def close(self) -> str:
+        """
+        write the remaining columns and meta.json, then move the snapshot into place
+        returns:
+            snapshot directory
+        """
+        if self._closed:
+            return self.directory
+        self._open()
+        self._name_data.close()
+        
+        try:
+            frame = self._frame if self._frame is not None else BillingFrame.empty()
+            for column in BILLING_COLUMNS:
+                self._save(f'billing.{column}.npy', getattr(frame, column))
+            for dimension in DIMENSIONS:
+                self._save(f'billing.{dimension}.npy', frame.codes[dimension])
+            
+            self._save('assets.asset_type.npy', np.frombuffer(self._type_codes, dtype=np.int32))
+            self._save('assets.project.npy', np.frombuffer(self._project_codes, dtype=np.int32))
+            self._save('assets.name_offsets.npy', np.frombuffer(self._name_offsets, dtype=np.int64))
+            
+            with open(os.path.join(self._tmp_dir, IDLE_INSTANCES_FILE), 'w', encoding='utf-8') as f:
+                json.dump(self._idle_instances, f, default=str)
+            
+            meta = {
+                'format_version': SNAPSHOT_FORMAT_VERSION,
+                'created_at': datetime.now().isoformat(),
+                'billing_rows': len(frame),
+                'resource_count': len(self._type_codes),
+                'idle_instance_count': len(self._idle_instances),
+                'collection_date': self._collection_date,
+                'categories': {dimension: frame.categories[dimension] for dimension in DIMENSIONS},
+                'asset_types': list(self._asset_types),
+                'asset_projects': list(self._asset_projects),
+                'scan': self.metadata
+            }
+            with open(os.path.join(self._tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, default=str)
+            
+            self._replace_target()
+        except BaseException:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            raise
+        finally:
+            self._closed = True
+        
+        self.logger.info(
+            f"Wrote snapshot {self.directory}: {meta['billing_rows']} billing rows, "
+            f"{meta['resource_count']} resources, {meta['idle_instance_count']} idle instances"
+        )
+        return self.directory
+    
+    def _open(self) -> None:
+        if self._tmp_dir is None:
+            parent = os.path.dirname(os.path.abspath(self.directory))
+            os.makedirs(parent, exist_ok=True)
+            self._tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(self.directory)}.")
+            self._name_data = open(os.path.join(self._tmp_dir, ASSET_NAME_DATA_FILE), 'wb')
+    
+    def _save(self, name: str, values: np.ndarray) -> None:
+        np.save(os.path.join(self._tmp_dir, name), np.ascontiguousarray(values), allow_pickle=False)
+    
+    def _replace_target(self) -> None:
+        # a non-empty directory can't be os.replace()d over, so swap via a backup
+        backup = None
+        if os.path.exists(self.directory):
+            backup = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(self.directory)), prefix='.old-snapshot.')
+            os.rmdir(backup)
+            os.replace(self.directory, backup)
+        os.replace(self._tmp_dir, self.directory)
+        if backup:
+            shutil.rmtree(backup, ignore_errors=True)
+
+
+class Snapshot:
+    """
+    a snapshot loaded back for reporting. numeric columns are memory-mapped
+    (np.load mmap_mode='r'), so loading is independent of the data size and
+    the BillingFrame reads straight from the page cache.
+    """
+    
+    def __init__(self, directory: str, mmap: bool = True):
+        """
+        args:
+            directory: snapshot directory written by SnapshotWriter
+            mmap: memory-map the columns (False reads them into memory)
+        raises:
+            ValueError: if the directory isn't a snapshot of a supported version
+        """
+        self.directory = directory
+        self._mmap_mode = 'r' if mmap else None
+        
+        meta_path = os.path.join(directory, META_FILE)
+        if not os.path.exists(meta_path):
+            raise ValueError(f"Not a snapshot directory: {directory}")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        
+        version = self.meta.get('format_version')
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {version} in {directory}")
+        
+        self._billing: Optional[BillingFrame] = None
+        self._idle_instances: Optional[List[Dict[str, Any]]] = None
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'Snapshot':
+        return cls(directory, mmap=mmap)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """scan details passed to the writer (project_id, dates, ...)"""
+        return self.meta.get('scan') or {}
+    
+    @property
+    def billing(self) -> BillingFrame:
+        if self._billing is None:
+            self._billing = BillingFrame(
+                self._column('billing.cost.npy'),
+                self._column('billing.day.npy'),
+                {dimension: self._column(f'billing.{dimension}.npy') for dimension in DIMENSIONS},
+                self.meta['categories'],
+                usage=self._column('billing.usage.npy'),
+                credits=self._column('billing.credits.npy')
+            )
+        return self._billing
+    
+    def to_billing_frame(self) -> BillingFrame:
+        """lets analyzers take the snapshot itself as billing data"""
+        return self.billing
+    
+    @property
+    def resource_count(self) -> int:
+        return int(self.meta['resource_count'])
+    
+    def resource_type_counts(self) -> Dict[str, int]:
+        """resources per asset type, counted on the code column"""
+        asset_types = self.meta['asset_types']
+        counts = np.bincount(self._column('assets.asset_type.npy'), minlength=len(asset_types))
+        return {asset_types[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+    
+    def iter_resources(self) -> Iterator[Dict[str, Any]]:
+        """resource records (name, asset_type, project_id, collection_date)"""
+        asset_types = self.meta['asset_types']
+        projects = self.meta['asset_projects']
+        type_codes = self._column('assets.asset_type.npy')
+        project_codes = self._column('assets.project.npy')
+        offsets = self._column('assets.name_offsets.npy')
+        names = self._name_data()
+        collection_date = self.meta.get('collection_date')
+        
+        for i in range(len(type_codes)):
+            yield {
+                'name': bytes(names[offsets[i]:offsets[i + 1]]).decode('utf-8'),
+                'asset_type': asset_types[type_codes[i]],
+                'project_id': projects[project_codes[i]],
+                'collection_date': collection_date
+            }
+    
+    @property
+    def idle_instances(self) -> List[Dict[str, Any]]:
+        if self._idle_instances is None:
+            with open(os.path.join(self.directory, IDLE_INSTANCES_FILE), 'r', encoding='utf-8') as f:
+                self._idle_instances = json.load(f)
+        return self._idle_instances
+    
+    def _column(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.directory, name), mmap_mode=self._mmap_mode, allow_pickle=False)
+    
+    def _name_data(self) -> np.ndarray:
+        path = os.path.join(self.directory, ASSET_NAME_DATA_FILE)
+        if os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=np.uint8)
+        if self._mmap_mode:
+            return np.memmap(path, dtype=np.uint8, mode='r')
+        return np.fromfile(path, dtype=np.uint8)
@@ -1,6 +1,33 @@
 import sys
+from datetime import date, timedelta
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+# shared billing-record builders for the analyzer tests (import with `from conftest import ...`)
+def billing_record(day, service, cost, project="p0", sku="sku", region="us-central1"):
+    """one billing line item; day is a date or a YYYY-MM-DD string"""
+    return {
+        "date": str(day),
+        "service_name": service,
+        "project_name": project,
+        "sku_name": sku,
+        "region_name": region,
+        "cost": cost,
+    }
+
+
+def daily_records(service, costs, project="p1", start=date(2024, 1, 1)):
+    """one line item per day for a service, starting at start"""
+    return [billing_record(start + timedelta(days=i), service, cost, project=project) for i, cost in enumerate(costs)]
+
+
+def without_dates(result):
+    """drop the run timestamps so analyzer results can be compared"""
+    if isinstance(result, dict):
+        result.pop("analysis_date", None)
+        result.pop("generated_date", None)
+    return result
@@ -0,0 +1,148 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.analyzers import CostAnalyzer, DetectorState, SeriesAnomalyDetector
+from src.analyzers.recommendation_engine import RecommendationEngine
+from src.data.billing_frame import BillingFrame
+from src.data.cost_store import CostStore
+
+from conftest import daily_records
+
+
+def test_ramp_is_not_flagged_but_a_spike_is():
+    ramp = [100.0 + 5 * i for i in range(30)]
+    steady = [50.0 + (i % 3) for i in range(30)]
+    steady[20] = 400.0
+    records = daily_records("Compute Engine", ramp) + daily_records("Cloud Storage", steady)
+
+    for method in ("mad", "ewma"):
+        anomalies = SeriesAnomalyDetector(method=method).detect(records)
+        assert [(a["name"], a["date"], a["direction"]) for a in anomalies][:1] == [
+            ("Cloud Storage", "2024-01-21", "spike")
+        ]
+        assert all(a["name"] != "Compute Engine" for a in anomalies)
+
+    # the global-mean detector flags both ends of the ramp
+    flagged = CostAnalyzer().identify_anomalies(daily_records("Compute Engine", ramp))
+    assert len(flagged) > 2
+
+
+def test_series_per_dimension_combination():
+    costs = [10.0] * 20
+    spiked = list(costs)
+    spiked[15] = 60.0
+    records = daily_records("Compute Engine", costs, project="a") + daily_records("Compute Engine", spiked, project="b")
+
+    anomalies = CostAnalyzer().identify_series_anomalies(records, dimensions=("service", "project"))
+    assert len(anomalies) == 1
+    assert anomalies[0]["series"] == {"service": "Compute Engine", "project": "b"}
+    assert anomalies[0]["expected_cost"] == 10.0
+    assert anomalies[0]["severity"] == "high"
+
+
+def test_scores_thousands_of_series_in_one_pass():
+    rng = np.random.default_rng(1)
+    matrix = rng.normal(100, 5, size=(2000, 60))
+    matrix[123, 45] = 300.0
+
+    scores, expected = SeriesAnomalyDetector(threshold=6).score(matrix)
+    assert scores.shape == matrix.shape
+    assert np.isnan(scores[:, :7]).all()
+    assert np.argwhere(np.abs(np.nan_to_num(scores)) > 20).tolist() == [[123, 45]]
+    assert expected[123, 45] == pytest.approx(100, abs=5)
+
+
+def test_store_windows_and_frames_give_the_same_series():
+    records = daily_records("Compute Engine", [float(i % 4) for i in range(12)]) + daily_records("BigQuery", [3.0, 0, 5.0])
+    frame = BillingFrame.from_records(records)
+    store = CostStore(":memory:")
+    store.append(frame)
+
+    frame_keys, frame_first, frame_matrix = frame.daily_series(("service",))
+    store_keys, store_first, store_matrix = store.window().daily_series(("service",))
+    store.close()
+
+    order = [store_keys.index(key) for key in frame_keys]
+    assert frame_first == store_first
+    np.testing.assert_array_equal(frame_matrix, store_matrix[order])
+
+
+def test_recommendations_from_series_anomalies():
+    engine = RecommendationEngine()
+    engine.add_cost_anomaly_recommendations([
+        {"date": "2024-01-02", "cost": 5.0, "expected_cost": 0.0, "deviation_percentage": None, "severity": "high"}
+    ])
+    assert engine.recommendations[0]["anomaly_details"]["expected_cost"] == 0.0
+    # no baseline to take a percentage of, so the absolute change is shown
+    assert engine.recommendations[0]["action"] == "Investigate 5.00 cost increase"
+
+
+def test_recommendations_describe_drops_as_decreases():
+    engine = RecommendationEngine()
+    engine.add_cost_anomaly_recommendations([
+        {"date": "2024-01-03", "cost": 40.0, "expected_cost": 100.0, "deviation": -60.0,
+         "deviation_percentage": -60.0, "direction": "drop"},
+        {"date": "2024-01-04", "cost": 20.0, "average_cost": 50.0, "deviation_percentage": -60.0},
+    ])
+
+    for rec in engine.recommendations:
+        assert rec["recommendation"].startswith("Cost drop detected")
+        assert rec["action"] == "Investigate 60.0% cost decrease"
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        SeriesAnomalyDetector(method="prophet")
+    with pytest.raises(ValueError):
+        SeriesAnomalyDetector(alpha=0)
+    assert SeriesAnomalyDetector().detect([]) == []
+
+
+@pytest.mark.parametrize("method", ["mad", "ewma"])
+def test_incremental_runs_match_a_full_recompute(tmp_path, method):
+    rng = np.random.default_rng(3)
+    records = daily_records("Compute Engine", list(rng.normal(100, 10, 40)))
+    records += daily_records("Cloud Storage", list(rng.normal(20, 1, 40)))
+    # a series that starts mid-way and a gap with no line items at all
+    records += daily_records("BigQuery", [5.0] * 10 + [90.0], start=date(2024, 1, 25))
+    records = [r for r in records if r["date"] not in ("2024-01-15", "2024-01-16")]
+    records[5]["cost"] = 900.0
+    records[70]["cost"] = 80.0
+    frame = BillingFrame.from_records(records)
+
+    detector = SeriesAnomalyDetector(method=method, min_deviation=0)
+    full = detector.detect(frame)
+    assert {a["name"] for a in full} >= {"Compute Engine", "BigQuery"}
+
+    state_path = str(tmp_path / "detector.npz")
+    incremental = []
+    for start, end in (("2024-01-01", "2024-01-14"), ("2024-01-15", "2024-01-24"), ("2024-01-25", "2024-02-09")):
+        anomalies = CostAnalyzer().identify_series_anomalies(
+            frame.filter(start, end), method=method, threshold=detector.threshold, state_path=state_path
+        )
+        incremental.extend(anomalies)
+
+    strip = [{k: v for k, v in a.items() if k != "score"} for a in full]
+    assert [{k: v for k, v in a.items() if k != "score"} for a in incremental] == strip
+    assert [a["score"] for a in incremental] == pytest.approx([a["score"] for a in full])
+
+
+def test_state_skips_processed_days_and_rejects_other_settings(tmp_path):
+    records = daily_records("Compute Engine", [10.0] * 10)
+    detector = SeriesAnomalyDetector()
+    _, state = detector.detect_incremental(records)
+    assert state.last_day is not None
+
+    # replaying the same days is a no-op
+    again, state = detector.detect_incremental(records, state)
+    assert again == []
+
+    path = str(tmp_path / "state.npz")
+    state.save(path)
+    assert DetectorState.load(path, detector).keys == [{"service": "Compute Engine"}]
+    with pytest.raises(ValueError):
+        DetectorState.load(path, SeriesAnomalyDetector(window=7))
+    with pytest.raises(ValueError):
+        detector.detect_incremental(records, state, dimensions=("project",))
@@ -0,0 +1,119 @@
+import asyncio
+import types
+import src.collectors.async_gcp_collector as amod
+
+
+class DummyAsyncBillingClient:
+    def __init__(self, credentials=None):
+        self.calls = 0
+
+    async def get_project_billing_info(self, name):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return types.SimpleNamespace(billing_account_name="billingAccounts/TEST", billing_enabled=True)
+
+
+class DummyAsyncPager:
+    def __init__(self, pages):
+        self._pages = pages
+
+    @property
+    async def pages(self):
+        for page in self._pages:
+            await asyncio.sleep(0)
+            yield types.SimpleNamespace(assets=page)
+
+
+class DummyAsyncAssetClient:
+    def __init__(self, credentials=None):
+        pass
+
+    async def list_assets(self, request):
+        asset = types.SimpleNamespace(name="a", asset_type="compute.googleapis.com/Disk", resource=None)
+        return DummyAsyncPager([[asset], [asset]])
+
+
+class DummyInstancesClient:
+    def __init__(self, credentials=None):
+        self.calls = 0
+
+    def aggregated_list(self, request, metadata=()):
+        self.calls += 1
+        instance = types.SimpleNamespace(
+            name="vm-1", status="STOPPED", machine_type="e2-small", creation_timestamp="t"
+        )
+        return [("zones/us-central1-a", types.SimpleNamespace(instances=[instance]))]
+
+
+def make_collector(monkeypatch):
+    monkeypatch.setattr(amod.GCPCollector, "_load_credentials", lambda self: True)
+    monkeypatch.setattr(amod.billing, "CloudBillingAsyncClient", DummyAsyncBillingClient)
+    monkeypatch.setattr(amod.asset, "AssetServiceAsyncClient", DummyAsyncAssetClient)
+    monkeypatch.setattr(amod.compute, "InstancesClient", DummyInstancesClient)
+    return amod.AsyncGCPCollector({"project_id": "pid", "collection": {"api_concurrency": {"compute": 2}}})
+
+
+def test_async_collection_runs_concurrently(monkeypatch):
+    from datetime import datetime
+
+    collector = make_collector(monkeypatch)
+
+    async def run():
+        assert await collector.authenticate() is True
+        now = datetime.now()
+        billing, resources, idle = await asyncio.gather(
+            collector.collect_billing_data(now, now),
+            collector.collect_resource_data(),
+            collector.get_idle_compute_instances(),
+        )
+        recommendations = await collector.get_cost_optimization_recommendations()
+        return billing, resources, idle, recommendations
+
+    billing, resources, idle, recommendations = asyncio.run(run())
+
+    assert billing[0]["billing_enabled"] is True
+    assert len(resources) == 2
+    assert [i["name"] for i in idle] == ["vm-1"]
+    assert [r["resource_name"] for r in recommendations] == ["vm-1"]
+    # recommendations reuse the cached idle scan
+    assert collector.compute_client.calls == 1
+    assert collector.api_concurrency["compute"] == 2
+
+
+def test_async_billing_and_asset_calls_retry_quota_errors(monkeypatch):
+    from datetime import datetime
+    from google.api_core import exceptions
+
+    class ThrottledBillingClient(DummyAsyncBillingClient):
+        async def get_project_billing_info(self, name):
+            if self.calls == 0:
+                self.calls += 1
+                raise exceptions.TooManyRequests("rate limited")
+            return await super().get_project_billing_info(name)
+
+    class ThrottledAssetClient(DummyAsyncAssetClient):
+        calls = 0
+
+        async def list_assets(self, request):
+            ThrottledAssetClient.calls += 1
+            if ThrottledAssetClient.calls == 1:
+                raise exceptions.ServiceUnavailable("try again")
+            return await super().list_assets(request)
+
+    collector = make_collector(monkeypatch)
+    monkeypatch.setattr(amod.billing, "CloudBillingAsyncClient", ThrottledBillingClient)
+    monkeypatch.setattr(amod.asset, "AssetServiceAsyncClient", ThrottledAssetClient)
+    for limiter in collector.rate_limiters.values():
+        limiter.base_delay_seconds = 0
+
+    async def run():
+        assert await collector.authenticate() is True
+        now = datetime.now()
+        return await collector.collect_billing_data(now, now), await collector.collect_resource_data()
+
+    billing, resources = asyncio.run(run())
+
+    assert billing[0]["billing_enabled"] is True
+    assert len(resources) == 2
+    assert collector.rate_limiters["billing"].stats()["throttled"] == 1
+    assert collector.rate_limiters["asset"].stats()["retries"] == 1
@@ -0,0 +1,128 @@
+import csv
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+from src.collectors.billing_export_collector import BillingExportCollector
+
+ROWS = [
+    ("2024-01-01 00:00:00 UTC", "Compute Engine", "N1 Core", "proj-a", "us-central1", "10.5", '[{"name": "SUD", "amount": -1.5}]'),
+    ("2024-01-02 00:00:00 UTC", "Cloud Storage", "Standard Storage", "proj-a", "us-east1", "2.0", "[]"),
+    ("2024-01-03 00:00:00 UTC", "Compute Engine", "N1 Core", "proj-b", "europe-west1", "7.25", ""),
+]
+
+
+def write_csv(path, opener=open):
+    with opener(path, "wt", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["usage_start_time", "service.description", "sku.description",
+                         "project.id", "location.region", "cost", "credits"])
+        writer.writerows(ROWS)
+
+
+def make_collector(path, **export_config):
+    return BillingExportCollector({"billing_export": dict(path=str(path), **export_config)})
+
+
+def test_csv_projection_chunking_and_date_pushdown(tmp_path):
+    write_csv(tmp_path / "export.csv")
+    collector = make_collector(tmp_path, chunk_size=1)
+    assert collector.authenticate() is True
+
+    chunks = list(collector.iter_chunks(
+        datetime(2024, 1, 2), datetime(2024, 1, 3), columns=("service_name", "cost")
+    ))
+
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+    assert [record for chunk in chunks for record in chunk] == [
+        {"service_name": "Cloud Storage", "cost": 2.0},
+        {"service_name": "Compute Engine", "cost": 7.25},
+    ]
+
+
+def test_csv_gzip_full_records(tmp_path):
+    write_csv(tmp_path / "export.csv.gz", opener=gzip.open)
+    records = make_collector(tmp_path / "*.csv.gz").collect_billing_data()
+
+    assert records[0]["date"] == "2024-01-01"
+    assert records[0]["project_name"] == "proj-a"
+    assert records[0]["region_name"] == "us-central1"
+    assert records[0]["credits"] == -1.5
+    assert records[2]["credits"] == 0.0
+
+
+def test_jsonl_nested_schema_and_cost_by_service(tmp_path):
+    with open(tmp_path / "export.jsonl", "w") as f:
+        for day, service, sku, project, region, cost, _ in ROWS:
+            f.write(json.dumps({
+                "usage_start_time": day,
+                "service": {"description": service},
+                "sku": {"description": sku},
+                "project": {"id": project, "name": project.upper()},
+                "location": {"region": region},
+                "cost": float(cost),
+            }) + "\n")
+
+    collector = make_collector(tmp_path)
+    records = collector.collect_billing_data(columns=("date", "project_name", "cost"))
+    assert records[1] == {"date": "2024-01-02", "project_name": "PROJ-A", "cost": 2.0}
+
+    costs = collector.get_cost_by_service(datetime(2024, 1, 1), datetime(2024, 1, 31))
+    assert costs == {"Compute Engine": 17.75, "Cloud Storage": 2.0}
+
+    frame = collector.collect_billing_frame(datetime(2024, 1, 2))
+    assert len(frame) == 2
+    assert frame.group_costs("project") == {"PROJ-A": 2.0, "PROJ-B": 7.25}
+
+
+def test_jsonl_resolves_fields_per_record(tmp_path):
+    lines = [
+        # the first line has no project and a flat service column
+        {"usage_start_time": "2024-01-01", "service_description": "Compute Engine", "cost": 1.0},
+        {"usage_start_time": "2024-01-02", "service": {"description": "Cloud Storage"},
+         "project": {"id": "proj-a"}, "cost": 2.0},
+        {"usage_start_date": "2024-01-03", "service_description": "BigQuery",
+         "project_id": "proj-b", "cost": 3.0},
+    ]
+    with open(tmp_path / "export.jsonl", "w") as f:
+        f.writelines(json.dumps(line) + "\n" for line in lines)
+
+    records = make_collector(tmp_path).collect_billing_data(
+        columns=("date", "service_name", "project_id", "project_name")
+    )
+
+    assert records == [
+        {"date": "2024-01-01", "service_name": "Compute Engine", "project_id": "", "project_name": ""},
+        {"date": "2024-01-02", "service_name": "Cloud Storage", "project_id": "proj-a", "project_name": "proj-a"},
+        {"date": "2024-01-03", "service_name": "BigQuery", "project_id": "proj-b", "project_name": "proj-b"},
+    ]
+
+
+def test_parquet_skips_row_groups_outside_range(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    table = pa.table({
+        "usage_start_time": [datetime(2024, 1, d) for d in (1, 2, 3)],
+        "service": [{"description": row[1]} for row in ROWS],
+        "cost": [float(row[5]) for row in ROWS],
+    })
+    pq.write_table(table, tmp_path / "export.parquet", row_group_size=1)
+
+    collector = make_collector(tmp_path)
+    collector.authenticate()
+    records = collector.collect_billing_data(datetime(2024, 1, 3), datetime(2024, 1, 31))
+
+    assert records == [{
+        "date": "2024-01-03", "service_name": "Compute Engine", "sku_name": "",
+        "project_id": "", "project_name": "", "region_name": "", "cost": 7.25,
+        "currency": "", "usage_amount": 0.0, "usage_unit": "", "credits": 0.0,
+    }]
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        make_collector("x", columns=["bogus"])
+    assert make_collector("/nonexistent/*.csv").authenticate() is False
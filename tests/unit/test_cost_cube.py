@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from src.analyzers import CostAnalyzer
+from src.data.billing_frame import BillingFrame
+from src.data.cost_cube import DailyCostCube
+from src.data.cost_store import CostStore
+
+from conftest import without_dates
+
+SERVICES = ["Compute Engine", "Cloud Storage", "BigQuery"]
+
+
+def line_items(days, per_day=40, seed=0):
+    # whole-unit costs keep sums exact regardless of aggregation order
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "date": f"2024-01-{day:02d}",
+            "service_name": SERVICES[i % 3],
+            "project_name": f"p{i % 2}",
+            "sku_name": f"sku-{i % 4}",
+            "region_name": "us-central1",
+            "cost": float(rng.integers(1, 10)),
+        }
+        for day in days for i in range(per_day)
+    ]
+
+
+def test_every_analyzer_answers_the_same_from_the_cube():
+    frame = BillingFrame.from_records(line_items(range(1, 29)))
+    cube = DailyCostCube.build(frame)
+    analyzer = CostAnalyzer()
+
+    assert len(cube) == 28 * 12
+    for method in (
+        "analyze_cost_trends",
+        "analyze_cost_breakdown",
+        "identify_anomalies",
+        "identify_series_anomalies",
+        "generate_budget_forecast",
+        "forecast_budgets",
+    ):
+        from_frame = without_dates(getattr(analyzer, method)(frame))
+        from_cube = without_dates(getattr(analyzer, method)(cube))
+        assert from_cube == from_frame, method
+
+    assert analyzer.compare_periods(cube.filter("2024-01-15"), cube.filter(end_date="2024-01-14"))[
+        "absolute_change"
+    ] == analyzer.compare_periods(frame.filter("2024-01-15"), frame.filter(end_date="2024-01-14"))["absolute_change"]
+
+
+def test_refresh_adds_new_days_and_replaces_revised_ones():
+    cube = DailyCostCube.build(line_items(range(1, 11)))
+    revised = line_items([10, 11], seed=1)
+
+    assert cube.refresh(revised) == 2
+    expected = BillingFrame.from_records(line_items(range(1, 10)) + revised)
+    assert cube.total_cost() == expected.total_cost()
+    assert cube.daily_costs() == expected.daily_costs()
+    assert cube.group_costs("sku") == expected.group_costs("sku")
+    assert cube.date_range() == ("2024-01-01", "2024-01-11")
+    assert cube.refresh([]) == 0
+
+
+def test_refresh_keeps_undated_cells_from_earlier_loads():
+    undated = {"service_name": "Support", "project_name": "p0", "cost": 4.0}
+    cube = DailyCostCube.build(line_items([1]) + [undated])
+
+    assert cube.refresh(line_items([2]) + [dict(undated, cost=6.0)]) == 1
+    assert cube.group_costs("service")["Support"] == 10.0
+    assert cube.date_range() == ("2024-01-01", "2024-01-02")
+
+
+def test_build_from_a_store_window_and_round_trip(tmp_path):
+    records = line_items(range(1, 8))
+    store = CostStore(":memory:")
+    store.append(BillingFrame.from_records(records))
+    cube = DailyCostCube.build(store.window("2024-01-02", "2024-01-05"))
+    store.close()
+
+    expected = DailyCostCube.build(BillingFrame.from_records(records).filter("2024-01-02", "2024-01-05"))
+    assert cube.daily_costs() == expected.daily_costs()
+    assert cube.rollup(("service", "project")).group_costs("project") == expected.group_costs("project")
+
+    loaded = DailyCostCube.load(cube.save(str(tmp_path / "cube")))
+    assert isinstance(loaded.cells.cost.base, np.memmap)
+    assert loaded.group_costs("service") == cube.group_costs("service")
+    assert loaded.filter(service="BigQuery").total_cost() == pytest.approx(cube.filter(service="BigQuery").total_cost())
+
+
+def test_concat_merges_categories():
+    left = BillingFrame.from_records([{"service_name": "a", "cost": 1.0}, {"service_name": "b", "cost": 2.0}])
+    right = BillingFrame.from_records([{"service_name": "b", "cost": 3.0}, {"service_name": "c", "cost": 4.0}])
+
+    merged = BillingFrame.concat([left, BillingFrame.empty(), right])
+    assert merged.categories["service"] == ["a", "b", "c"]
+    assert merged.group_costs("service") == {"a": 1.0, "b": 5.0, "c": 4.0}
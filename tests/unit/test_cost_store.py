@@ -0,0 +1,115 @@
+import pytest
+
+from src.analyzers.cost_analyzer import CostAnalyzer
+from src.data.billing_frame import BillingFrame
+from src.data.cost_store import CostStore
+
+RECORDS = [
+    {"date": "2024-01-01", "service_name": "Compute Engine", "project_name": "p1", "sku_name": "vm", "cost": 10.0},
+    {"date": "2024-01-01", "service_name": "Cloud Storage", "project_name": "p1", "sku_name": "gb", "cost": 2.0},
+    {"date": "2024-01-02", "service_name": "Compute Engine", "project_name": "p2", "sku_name": "vm", "cost": 5.0},
+    {"date": "2024-01-03", "service_name": "Compute Engine", "project_name": "p1", "sku_name": "vm", "cost": 7.0},
+    {"date": "", "service_name": "Support", "cost": 1.0},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CostStore(str(tmp_path / "costs.sqlite"))
+    store.append(BillingFrame.from_records(RECORDS), source="export")
+    yield store
+    store.close()
+
+
+def test_aggregations_match_the_frame(store):
+    frame = BillingFrame.from_records(RECORDS)
+
+    assert len(store) == len(frame)
+    assert store.total_cost() == pytest.approx(frame.total_cost())
+    assert store.group_costs("service") == frame.group_costs("service")
+    assert store.group_costs("project") == frame.group_costs("project")
+    assert store.daily_costs() == frame.daily_costs()
+    assert store.day_count() == 3
+    with pytest.raises(ValueError):
+        store.group_costs("label")
+
+
+def test_window_filters_by_day_and_dimension(store):
+    window = store.window("2024-01-02", "2024-01-03", service="Compute Engine")
+
+    assert window.total_cost() == 12.0
+    assert window.group_costs("project") == {"p1": 7.0, "p2": 5.0}
+    assert store.window(end_date="2024-01-01").total_cost() == 12.0
+    assert store.window(service="Nope").total_cost() == 0.0
+    with pytest.raises(ValueError):
+        store.window(colour="red")
+
+
+def test_window_round_trips_to_a_frame(store):
+    frame = store.window("2024-01-01", "2024-01-01").to_frame()
+
+    assert sorted(r["service_name"] for r in frame.to_records()) == ["Cloud Storage", "Compute Engine"]
+    assert frame.total_cost() == 12.0
+
+
+def test_reloading_a_day_range_replaces_rows_from_the_same_source(tmp_path, store):
+    revised = [{"date": "2024-01-03", "service_name": "Compute Engine", "cost": 9.0}]
+    store.append(BillingFrame.from_records(revised), source="export")
+    store.append(BillingFrame.from_records(revised), source="other")
+
+    assert store.window("2024-01-03", "2024-01-03").total_cost() == 18.0
+    assert store.window("2024-01-01", "2024-01-02").total_cost() == 17.0
+    assert [run["row_count"] for run in store.runs()] == [5, 1, 1]
+
+    # persisted across connections
+    reopened = CostStore(store.path)
+    assert reopened.date_range() == ("2024-01-01", "2024-01-03")
+    reopened.close()
+
+
+def test_reloading_a_source_replaces_its_undated_rows(store):
+    store.append(BillingFrame.from_records(RECORDS), source="export")
+    store.append(BillingFrame.from_records(RECORDS[-1:]), source="other")
+
+    assert len(store) == len(RECORDS) + 1
+    assert store.group_costs("service")["Support"] == 2.0
+
+
+def test_analyzer_aggregates_in_the_store(store):
+    analyzer = CostAnalyzer()
+
+    comparison = analyzer.compare_periods(
+        store.window("2024-01-02", "2024-01-03"),
+        store.window("2024-01-01", "2024-01-01")
+    )
+    assert comparison["current_period_cost"] == 12.0
+    assert comparison["previous_period_cost"] == 12.0
+
+    trends = analyzer.analyze_cost_trends(store.window(), group_by="service")
+    assert trends["top_cost_driver"] == "Compute Engine"
+
+    forecast = analyzer.generate_budget_forecast(store.window("2024-01-01", "2024-01-03"), forecast_days=10)
+    assert forecast["historical_daily_average"] == 8.0
+
+
+def test_from_config():
+    assert CostStore.from_config(None) is None
+    assert CostStore.from_config({"path": ":memory:", "enabled": False}) is None
+    in_memory = CostStore.from_config({"path": ":memory:"})
+    assert len(in_memory) == 0
+    assert in_memory.date_range() is None
+    in_memory.close()
+
+
+def test_rollup_groups_in_the_store(store):
+    frame = BillingFrame.from_records(RECORDS)
+
+    cells = store.window().rollup(("service", "project"))
+    assert len(cells) == len(frame.rollup(("service", "project")))
+    assert cells.group_costs("project") == frame.group_costs("project")
+    assert len(store.window("2030-01-01").rollup(())) == 0
+
+    breakdown = CostAnalyzer().analyze_cost_breakdown(store.window(), top_n=1)
+    assert breakdown["groupings"]["service+project+sku"]["top"][0]["key"] == {
+        "service": "Compute Engine", "project": "p1", "sku": "vm"
+    }
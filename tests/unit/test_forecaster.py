@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.analyzers import BatchForecaster, CostAnalyzer
+
+from conftest import daily_records
+
+
+def test_recovers_trend_and_weekly_pattern_for_many_series():
+    rng = np.random.default_rng(5)
+    days = np.arange(56)
+    weekday_effect = np.array([0, 0, 0, 0, 0, -20, -20])[(days + 3) % 7]  # day 0 is a Thursday
+    slopes = rng.uniform(0, 2, size=500)
+    matrix = 100 + slopes[:, None] * days + weekday_effect + rng.normal(0, 1, size=(500, 56))
+
+    fitted = BatchForecaster(confidence_level=0.9).fit_predict(matrix, first_day=0, horizon=14)
+
+    truth = 100 + slopes[:, None] * np.arange(56, 70) + np.array([0, 0, 0, 0, 0, -20, -20])[(np.arange(56, 70) + 3) % 7]
+    assert fitted["daily"].shape == (500, 14)
+    assert np.abs(fitted["daily"] - truth).max() < 5
+    assert np.allclose(fitted["trend_per_day"], slopes, atol=0.1)
+    assert fitted["terms"] == ["intercept", "trend", "weekday"]
+    # the interval covers the true totals for (nearly) every series
+    coverage = ((fitted["total_lower"] <= truth.sum(axis=1)) & (truth.sum(axis=1) <= fitted["total_upper"])).mean()
+    assert coverage > 0.8
+
+
+def test_per_series_forecasts_from_billing_data():
+    records = daily_records("Compute Engine", [100.0 + i for i in range(21)])
+    records += daily_records("Cloud Storage", [10.0] * 21)
+
+    forecasts = CostAnalyzer().forecast_budgets(records, forecast_days=7)
+    assert [f["name"] for f in forecasts] == ["Compute Engine", "Cloud Storage"]
+    assert forecasts[0]["forecast_start"] == "2024-01-22"
+    assert forecasts[0]["forecasted_total"] == pytest.approx(sum(121.0 + i for i in range(7)), rel=0.01)
+    assert forecasts[1]["forecasted_total"] == pytest.approx(70.0)
+    assert forecasts[1]["lower_bound"] == pytest.approx(70.0)
+
+
+def test_budget_forecast_uses_the_regression_with_enough_history():
+    analyzer = CostAnalyzer()
+
+    forecast = analyzer.generate_budget_forecast(daily_records("Compute Engine", [50.0 + i for i in range(28)]), 10)
+    assert forecast["method"] == "linear_trend_weekly"
+    assert forecast["forecasted_total"] == pytest.approx(sum(78.0 + i for i in range(10)), rel=0.01)
+    assert forecast["lower_bound"] <= forecast["forecasted_total"] <= forecast["upper_bound"]
+    assert forecast["confidence"] == "high"
+
+    short = analyzer.generate_budget_forecast(daily_records("Compute Engine", [10.0, 20.0]), 10)
+    assert short["method"] == "simple_moving_average"
+    assert short["forecasted_total"] == 150.0
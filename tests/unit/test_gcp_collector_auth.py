@@ -1,4 +1,5 @@
 import types
+from datetime import datetime, timedelta
 import src.collectors.gcp_collector as gmod
 
 
@@ -39,4 +40,96 @@ def test_authenticate_uses_adc(monkeypatch):
     monkeypatch.setattr(gmod.compute, "InstancesClient", lambda credentials=None: DummyInstancesClient(credentials))
 
     collector = gmod.GCPCollector({"project_id": "pid"})
-    assert collector.authenticate() is True
\ No newline at end of file
+    assert collector.authenticate() is True
+
+
+class CountingBillingClient(DummyBillingClient):
+    def __init__(self, credentials=None):
+        super().__init__(credentials)
+        self.calls = 0
+
+    def get_project_billing_info(self, name):
+        self.calls += 1
+        return super().get_project_billing_info(name)
+
+
+class RefreshableCredentials:
+    def __init__(self, service_account_email=None, quota_project_id=None):
+        self.token = None
+        self.expiry = None
+        self.refreshes = 0
+        self.service_account_email = service_account_email
+        self.quota_project_id = quota_project_id
+
+    def refresh(self, request):
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+
+def patch_clients(monkeypatch, credentials):
+    billing_clients = []
+
+    def make_billing_client(credentials=None):
+        billing_clients.append(CountingBillingClient(credentials))
+        return billing_clients[-1]
+
+    monkeypatch.setattr(gmod.google.auth, "default", lambda scopes=None: (credentials, "pid"))
+    monkeypatch.setattr(gmod.billing, "CloudBillingClient", make_billing_client)
+    monkeypatch.setattr(gmod.asset, "AssetServiceClient", lambda credentials=None: DummyAssetClient(credentials))
+    monkeypatch.setattr(gmod.compute, "InstancesClient", lambda credentials=None: DummyInstancesClient(credentials))
+    return billing_clients
+
+
+def test_probe_response_is_reused_for_billing(monkeypatch):
+    billing_clients = patch_clients(monkeypatch, object())
+    collector = gmod.GCPCollector({"project_id": "pid"})
+
+    assert collector.authenticate() is True
+    records = collector.collect_billing_data(datetime(2024, 1, 1), datetime(2024, 1, 31))
+
+    assert records[0]["billing_enabled"] is True
+    assert billing_clients[0].calls == 1
+
+
+def test_lazy_auth_skips_probe_and_caches_token(monkeypatch, tmp_path):
+    token_path = str(tmp_path / "token.json")
+    config = {"project_id": "pid", "auth": {"lazy": True, "token_cache": token_path}}
+
+    first_creds = RefreshableCredentials()
+    billing_clients = patch_clients(monkeypatch, first_creds)
+    assert gmod.GCPCollector(config).authenticate() is True
+    assert billing_clients[0].calls == 0
+    assert first_creds.refreshes == 1
+
+    # a second run reuses the cached token instead of refreshing
+    second_creds = RefreshableCredentials()
+    patch_clients(monkeypatch, second_creds)
+    assert gmod.GCPCollector(config).authenticate() is True
+    assert second_creds.refreshes == 0
+    assert second_creds.token == "token-1"
+
+
+def test_token_cache_is_keyed_by_principal(monkeypatch, tmp_path):
+    import os
+
+    adc_file = tmp_path / "adc.json"
+    adc_file.write_text("{}")
+    monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", str(adc_file))
+    config = {"project_id": "pid", "auth": {"lazy": True, "token_cache": str(tmp_path / "token.json")}}
+
+    def authenticate(credentials):
+        patch_clients(monkeypatch, credentials)
+        assert gmod.GCPCollector(config).authenticate() is True
+        return credentials.refreshes
+
+    assert authenticate(RefreshableCredentials("a@pid.iam.gserviceaccount.com")) == 1
+    assert authenticate(RefreshableCredentials("a@pid.iam.gserviceaccount.com")) == 0
+    # another ADC principal or quota project never reuses a's token
+    assert authenticate(RefreshableCredentials("b@pid.iam.gserviceaccount.com")) == 1
+    assert authenticate(RefreshableCredentials("a@pid.iam.gserviceaccount.com", "other")) == 1
+
+    # re-running the ADC login rewrites the file
+    stat = adc_file.stat()
+    os.utime(adc_file, (stat.st_atime, stat.st_mtime + 60))
+    assert authenticate(RefreshableCredentials("a@pid.iam.gserviceaccount.com")) == 1
@@ -0,0 +1,120 @@
+import types
+import src.collectors.gcp_collector as gmod
+
+
+def make_asset(i, asset_type="compute.googleapis.com/Instance"):
+    return types.SimpleNamespace(
+        name=f"//compute.googleapis.com/projects/pid/instances/vm-{i}",
+        asset_type=asset_type,
+        resource=None,
+    )
+
+
+class DummyPager:
+    def __init__(self, pages, log):
+        self._pages = pages
+        self.log = log
+
+    @property
+    def pages(self):
+        for i, page in enumerate(self._pages):
+            self.log.append(i)
+            yield types.SimpleNamespace(assets=page)
+
+
+class DummyAssetClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+        self.requests = []
+
+    def list_assets(self, request):
+        self.requests.append(request)
+        return DummyPager(self.pages, self.fetched)
+
+
+def make_collector(pages):
+    collector = gmod.GCPCollector({"project_id": "pid"})
+    collector.asset_client = DummyAssetClient(pages)
+    return collector
+
+
+def test_iter_resources_streams_page_by_page():
+    collector = make_collector([[make_asset(0), make_asset(1)], [make_asset(2)]])
+
+    stream = collector.iter_resources()
+    first = next(stream)
+
+    assert first["asset_type"] == "compute.googleapis.com/Instance"
+    assert collector.asset_client.fetched == [0]
+    assert len(list(stream)) == 2
+    assert collector.asset_client.fetched == [0, 1]
+
+
+def test_every_asset_page_goes_through_the_limiter():
+    collector = make_collector([[make_asset(0)], [make_asset(1)], [make_asset(2)]])
+
+    assert len(list(collector.iter_resources())) == 3
+    # list_assets, one advance per page and the advance that ends the pager
+    assert collector.rate_limiters["asset"].stats()["calls"] == 5
+
+
+def test_collect_resource_data_wraps_iterator():
+    collector = make_collector([[make_asset(0)], [make_asset(1, "storage.googleapis.com/Bucket")]])
+
+    resources = collector.collect_resource_data()
+
+    assert [r["asset_type"] for r in resources] == [
+        "compute.googleapis.com/Instance",
+        "storage.googleapis.com/Bucket",
+    ]
+    assert all(r["project_id"] == "pid" for r in resources)
+
+
+def test_request_carries_asset_filters():
+    collector = gmod.GCPCollector({
+        "project_id": "pid",
+        "collection": {
+            "asset_types": ["compute.googleapis.com/Instance"],
+            "content_type": "resource",
+            "page_size": 500,
+        },
+    })
+    collector.asset_client = DummyAssetClient([[make_asset(0)]])
+
+    list(collector.iter_resources())
+    collector.collect_resource_data(asset_types=["compute.googleapis.com/Disk"])
+
+    default_request, override_request = collector.asset_client.requests
+    assert default_request.parent == "projects/pid"
+    assert list(default_request.asset_types) == ["compute.googleapis.com/Instance"]
+    assert default_request.content_type == gmod.asset.ContentType.RESOURCE
+    assert default_request.page_size == 500
+    assert list(override_request.asset_types) == ["compute.googleapis.com/Disk"]
+
+
+def test_asset_types_for_computes_minimal_union():
+    from src.analyzers.cost_analyzer import CostAnalyzer
+    from src.analyzers.recommendation_engine import RecommendationEngine
+    from src.analyzers.rightsizing_analyzer import RightsizingAnalyzer
+
+    union = gmod.GCPCollector.asset_types_for(RightsizingAnalyzer(), RecommendationEngine())
+
+    assert union == sorted(RecommendationEngine.REQUIRED_ASSET_TYPES)
+    assert gmod.GCPCollector.asset_types_for(RightsizingAnalyzer()) == ["compute.googleapis.com/Instance"]
+    assert gmod.GCPCollector.asset_types_for(RightsizingAnalyzer(), CostAnalyzer()) is None
+
+
+def test_repeat_run_served_from_disk_cache(tmp_path):
+    config = {"project_id": "pid", "cache": {"directory": str(tmp_path)}}
+    first = gmod.GCPCollector(config)
+    first.asset_client = DummyAssetClient([[make_asset(0), make_asset(1)]])
+    assert len(list(first.iter_resources())) == 2
+
+    second = gmod.GCPCollector(config)
+    second.asset_client = DummyAssetClient([[make_asset(0), make_asset(1)]])
+    records = second.collect_resource_data()
+
+    assert second.asset_client.requests == []
+    assert [r["asset_type"] for r in records] == ["compute.googleapis.com/Instance"] * 2
+    assert second.response_cache.stats()["hits"] == 1
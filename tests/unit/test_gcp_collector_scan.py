@@ -0,0 +1,133 @@
+import time
+import types
+import src.collectors.gcp_collector as gmod
+
+
+ZONES = ["us-central1-a", "us-central1-b", "europe-west1-b", "asia-east1-a"]
+
+
+class DummyZonesClient:
+    def __init__(self, credentials=None):
+        self.credentials = credentials
+
+    def list(self, project):
+        return [types.SimpleNamespace(name=z) for z in ZONES]
+
+
+class DummyInstancesClient:
+    def list(self, project, zone):
+        # make earlier zones slower so completion order differs from zone order
+        time.sleep(0.01 * (len(ZONES) - ZONES.index(zone)))
+        if zone == "europe-west1-b":
+            raise RuntimeError("zone unavailable")
+        return [
+            types.SimpleNamespace(
+                name=f"{zone}-{status.lower()}",
+                status=status,
+                machine_type="zones/x/machineTypes/e2-small",
+                creation_timestamp="2024-01-01T00:00:00Z",
+            )
+            for status in ("RUNNING", "STOPPED", "TERMINATED")
+        ]
+
+
+class DummyAggregatedInstancesClient(DummyInstancesClient):
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def aggregated_list(self, request, metadata=()):
+        self.calls.append((request, metadata))
+        if self.fail:
+            raise RuntimeError("aggregated listing not permitted")
+        return [
+            ("zones/us-central1-a", types.SimpleNamespace(instances=[
+                types.SimpleNamespace(
+                    name="agg-stopped",
+                    status="STOPPED",
+                    machine_type="zones/x/machineTypes/e2-small",
+                    creation_timestamp="2024-01-01T00:00:00Z",
+                ),
+            ])),
+            ("zones/us-east1-b", types.SimpleNamespace(instances=[])),
+        ]
+
+
+def make_collector(monkeypatch, max_workers, strategy="zonal", compute_client=None, cache=None):
+    monkeypatch.setattr(gmod.compute, "ZonesClient", DummyZonesClient)
+    collector = gmod.GCPCollector({
+        "project_id": "pid",
+        "collection": {"max_workers": max_workers, "instance_scan_strategy": strategy},
+        "cache": cache,
+    })
+    collector.compute_client = compute_client or DummyInstancesClient()
+    return collector
+
+
+def test_concurrent_scan_matches_sequential_order(monkeypatch):
+    sequential = make_collector(monkeypatch, 1).get_idle_compute_instances()
+    concurrent = make_collector(monkeypatch, 4).get_idle_compute_instances()
+
+    assert [i["name"] for i in concurrent] == [i["name"] for i in sequential]
+    assert [i["name"] for i in concurrent] == [
+        "us-central1-a-stopped",
+        "us-central1-a-terminated",
+        "us-central1-b-stopped",
+        "us-central1-b-terminated",
+        "asia-east1-a-stopped",
+        "asia-east1-a-terminated",
+    ]
+
+
+def test_failed_zone_does_not_drop_other_zones(monkeypatch):
+    idle = make_collector(monkeypatch, 4).get_idle_compute_instances()
+
+    assert {i["zone"] for i in idle} == {"us-central1-a", "us-central1-b", "asia-east1-a"}
+    assert all(i["project_id"] == "pid" for i in idle)
+    assert idle.failures == ["europe-west1-b"]
+
+
+def test_partial_zone_scan_is_not_cached_on_disk(monkeypatch, tmp_path):
+    cache = {"directory": str(tmp_path)}
+    idle = make_collector(monkeypatch, 4, cache=cache).get_idle_compute_instances()
+
+    assert isinstance(idle, gmod.PartialResult)
+    assert list(tmp_path.iterdir()) == []
+    # a later run lists every zone again instead of replaying the gap
+    rerun = make_collector(monkeypatch, 4, cache=cache)
+    assert rerun.response_cache.lookup("pid", "get_idle_compute_instances", ()) is None
+
+
+def test_aggregated_strategy_filters_server_side(monkeypatch):
+    client = DummyAggregatedInstancesClient()
+    idle = make_collector(monkeypatch, 4, "aggregated", client).get_idle_compute_instances()
+
+    assert [(i["name"], i["zone"]) for i in idle] == [("agg-stopped", "us-central1-a")]
+    request, metadata = client.calls[0]
+    assert request.project == "pid"
+    assert 'status = "STOPPED"' in request.filter
+    assert 'status = "TERMINATED"' in request.filter
+    assert dict(metadata)["x-goog-fieldmask"] == gmod.DEFAULT_INSTANCE_FIELD_MASK
+
+
+def test_aggregated_strategy_falls_back_to_zonal(monkeypatch):
+    client = DummyAggregatedInstancesClient(fail=True)
+    idle = make_collector(monkeypatch, 4, "aggregated", client).get_idle_compute_instances()
+
+    assert len(client.calls) == 1
+    assert {i["zone"] for i in idle} == {"us-central1-a", "us-central1-b", "asia-east1-a"}
+
+
+def test_idle_instances_fetched_once_per_session(monkeypatch):
+    client = DummyAggregatedInstancesClient()
+    collector = make_collector(monkeypatch, 4, "aggregated", client)
+
+    collector.get_idle_compute_instances()
+    recommendations = collector.get_cost_optimization_recommendations()
+
+    assert len(client.calls) == 1
+    assert [r["resource_name"] for r in recommendations] == ["agg-stopped"]
+
+    collector.invalidate_cache("get_idle_compute_instances")
+    collector.get_idle_compute_instances()
+    assert len(client.calls) == 2
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from src.collectors.lazy_import import lazy_import
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_importing_collectors_defers_sdk_imports():
+    code = (
+        "import sys, src.collectors\n"
+        "print(','.join(m for m in ('google.cloud.billing', 'google.cloud.asset', 'google.cloud.compute')"
+        " if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(ROOT), capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_importing_collectors_defers_numpy():
+    code = "import sys, src.collectors\nprint('numpy' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(ROOT), capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_lazy_module_loads_on_access_and_forwards_writes():
+    module = lazy_import("json")
+    assert not module.is_loaded
+
+    assert module.dumps([1]) == "[1]"
+    assert module.is_loaded
+
+    import json
+    module.custom_attr = "x"
+    assert json.custom_attr == "x"
+    del module.custom_attr
+    assert not hasattr(json, "custom_attr")
@@ -0,0 +1,100 @@
+import types
+from datetime import datetime
+
+import src.collectors.gcp_collector as gmod
+from src.collectors.multi_project import MultiProjectScanner
+
+
+class DummyAssetClient:
+    def __init__(self):
+        self.scopes = []
+
+    def search_all_resources(self, scope, asset_types, query):
+        self.scopes.append(scope)
+        return [
+            types.SimpleNamespace(additional_attributes={"projectId": "proj-b"}),
+            types.SimpleNamespace(additional_attributes={"projectId": "proj-c"}),
+        ]
+
+
+def make_collector(monkeypatch):
+    def fake_idle(self):
+        if self.project_id == "proj-c":
+            raise RuntimeError("permission denied")
+        return [{"name": f"{self.project_id}-vm", "project_id": self.project_id}]
+
+    monkeypatch.setattr(gmod.GCPCollector, "_fetch_idle_compute_instances", fake_idle)
+    collector = gmod.GCPCollector({"project_id": "proj-a"})
+    collector.asset_client = DummyAssetClient()
+    collector.compute_client = object()
+    return collector
+
+
+def test_from_config_returns_none_for_single_project(monkeypatch):
+    collector = make_collector(monkeypatch)
+    assert MultiProjectScanner.from_config(collector, {"project_id": "proj-a"}) is None
+
+
+def test_scan_merges_projects_sharing_clients(monkeypatch):
+    collector = make_collector(monkeypatch)
+    scanner = MultiProjectScanner(collector, projects=["proj-a", "proj-b"], organization_id="42", max_workers=3)
+
+    results = scanner.scan(datetime.now(), datetime.now(), include_billing=False, include_resources=False)
+
+    assert collector.asset_client.scopes == ["organizations/42"]
+    assert results["projects"] == ["proj-a", "proj-b", "proj-c"]
+    assert [i["project_id"] for i in results["idle_instances"]] == ["proj-a", "proj-b"]
+    assert list(results["failed_projects"]) == ["proj-c"]
+    # the base collector is untouched and every project shares its cache
+    assert collector.project_id == "proj-a"
+    assert collector.for_project("proj-b").scan_cache is collector.scan_cache
+
+
+class DeniedBillingClient:
+    def get_project_billing_info(self, name):
+        if name == "projects/proj-b":
+            raise PermissionError("permission denied")
+        return types.SimpleNamespace(billing_account_name="billingAccounts/x", billing_enabled=True)
+
+
+def test_swallowed_api_errors_are_reported_as_failures(monkeypatch):
+    collector = make_collector(monkeypatch)
+    collector.billing_client = DeniedBillingClient()
+    scanner = MultiProjectScanner(collector, projects=["proj-a", "proj-b"])
+
+    results = scanner.scan(datetime.now(), datetime.now(), include_resources=False, include_idle=False)
+
+    assert results["failed_projects"] == {"proj-b": "permission denied"}
+    assert [r["project_id"] for r in results["billing_data"]] == ["proj-a"]
+    # the single-project collector still logs and carries on
+    assert collector.for_project("proj-b")._fetch_billing_data(datetime.now(), datetime.now()) == []
+
+
+def test_partial_zone_scans_are_reported(monkeypatch):
+    collector = make_collector(monkeypatch)
+    monkeypatch.setattr(
+        gmod.GCPCollector, "_fetch_idle_compute_instances",
+        lambda self: gmod.PartialResult([], failures=["us-east1-b"])
+    )
+
+    results = MultiProjectScanner(collector, projects=["proj-a"]).scan(
+        datetime.now(), datetime.now(), include_billing=False, include_resources=False
+    )
+
+    assert results["failed_projects"] == {"proj-a": "Could not list instances in zones: us-east1-b"}
+
+
+def test_project_discovery_goes_through_the_asset_limiter(monkeypatch):
+    collector = make_collector(monkeypatch)
+    calls = []
+    limiter = collector.rate_limiters["asset"]
+    original = limiter.call
+
+    def counted(func, *args, **kwargs):
+        calls.append(func)
+        return original(func, *args, **kwargs)
+
+    monkeypatch.setattr(limiter, "call", counted)
+
+    assert MultiProjectScanner(collector, organization_id="42").resolve_projects() == ["proj-b", "proj-c"]
+    assert len(calls) == 1
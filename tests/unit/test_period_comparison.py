@@ -0,0 +1,107 @@
+from datetime import date
+
+import pytest
+
+from src.analyzers import CostAnalyzer, PeriodComparator
+from src.analyzers.period_comparison import resolve_periods
+from src.data.billing_frame import BillingFrame
+from src.data.cost_cube import DailyCostCube
+from src.data.cost_store import CostStore
+
+from conftest import billing_record as record
+
+
+def two_weeks():
+    records = []
+    for day in range(1, 15):
+        current = day > 7
+        records.append(record(f"2024-03-{day:02d}", "Compute Engine", 20.0 if current else 10.0))
+        records.append(record(f"2024-03-{day:02d}", "Cloud Storage", 5.0))
+        if current:
+            records.append(record(f"2024-03-{day:02d}", "BigQuery", 1.0, project="p1"))
+        else:
+            records.append(record(f"2024-03-{day:02d}", "Pub/Sub", 2.0, project="p1"))
+    return records
+
+
+def test_resolve_named_and_numeric_periods():
+    assert resolve_periods("wow", "2024-03-14") == (
+        (date(2024, 3, 8), date(2024, 3, 14)), (date(2024, 3, 1), date(2024, 3, 7))
+    )
+    assert resolve_periods(3, date(2024, 3, 14)) == (
+        (date(2024, 3, 12), date(2024, 3, 14)), (date(2024, 3, 9), date(2024, 3, 11))
+    )
+
+
+def test_resolve_month_to_date_clips_to_previous_month():
+    assert resolve_periods("mom", "2024-03-31") == (
+        (date(2024, 3, 1), date(2024, 3, 31)), (date(2024, 2, 1), date(2024, 2, 29))
+    )
+
+
+def test_resolve_rejects_unknown_periods():
+    with pytest.raises(ValueError):
+        resolve_periods("yoy", "2024-03-14")
+    with pytest.raises(ValueError):
+        resolve_periods(0, "2024-03-14")
+
+
+def test_week_over_week_ranks_groups_by_absolute_change():
+    result = PeriodComparator("wow").compare(two_weeks(), ("service", "project"))
+
+    assert result["status"] == "success"
+    assert result["current_period"] == {"start": "2024-03-08", "end": "2024-03-14"}
+    assert result["current_cost"] == 7 * 26
+    assert result["previous_cost"] == 7 * 17
+    assert result["percentage_change"] == round(63 / 119 * 100, 2)
+
+    services = result["groupings"]["service"]
+    assert services["group_count"] == 4
+    assert [(g["name"], g["absolute_change"], g["change"]) for g in services["groups"]] == [
+        ("Compute Engine", 70.0, "increased"),
+        ("Pub/Sub", -14.0, "removed"),
+        ("BigQuery", 7.0, "new"),
+        ("Cloud Storage", 0.0, "unchanged"),
+    ]
+    assert services["groups"][2]["percentage_change"] is None
+
+    projects = {g["name"]: g["absolute_change"] for g in result["groupings"]["project"]["groups"]}
+    assert projects == {"p0": 70.0, "p1": -7.0}
+
+
+def test_custom_windows_and_top_n():
+    periods = (("2024-03-13", "2024-03-14"), ("2024-03-01", "2024-03-02"))
+    result = PeriodComparator(periods, top_n=1).compare(two_weeks())
+
+    assert result["period"] == "custom"
+    assert result["previous_period"] == {"start": "2024-03-01", "end": "2024-03-02"}
+    assert result["groupings"]["service"]["groups"] == [{
+        "name": "Compute Engine",
+        "current_cost": 40.0,
+        "previous_cost": 20.0,
+        "absolute_change": 20.0,
+        "percentage_change": 100.0,
+        "change": "increased",
+    }]
+
+
+def test_cube_and_store_give_the_same_comparison():
+    records = two_weeks()
+    comparator = PeriodComparator("wow")
+    expected = comparator.compare(BillingFrame.from_records(records), ("service",))
+
+    store = CostStore(":memory:")
+    store.append(BillingFrame.from_records(records))
+    assert comparator.compare(DailyCostCube.build(records), ("service",)) == expected
+    assert comparator.compare(store, ("service",)) == expected
+    store.close()
+
+
+def test_analyzer_wrapper_reports_errors_and_empty_data():
+    analyzer = CostAnalyzer()
+
+    assert analyzer.compare_period_groups([])["status"] == "no_data"
+    assert analyzer.compare_period_groups(two_weeks(), period="yoy")["status"] == "error"
+    result = analyzer.compare_period_groups(two_weeks(), period="dod", end_date="2024-03-14")
+    assert result["current_cost"] == 26.0
+    assert "analysis_date" in result
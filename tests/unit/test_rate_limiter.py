@@ -0,0 +1,228 @@
+import asyncio
+import types
+
+import pytest
+from google.api_core import exceptions
+
+import src.collectors.gcp_collector as gmod
+from src.collectors.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ApiRateLimiter,
+    AsyncAdaptiveConcurrencyLimiter,
+    TokenBucket,
+    build_rate_limiters,
+)
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_paces():
+    fake = FakeTime()
+    bucket = TokenBucket(rate=2, capacity=2, clock=fake.clock, sleep=fake.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert fake.now == pytest.approx(0.5)
+
+
+def test_concurrency_limit_halves_on_throttle_and_recovers():
+    limiter = AdaptiveConcurrencyLimiter(max_concurrency=8, increase_after=2)
+
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert int(limiter.limit) == 4
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release()
+    assert int(limiter.limit) == 6
+
+
+def test_retries_quota_errors_with_backoff():
+    fake = FakeTime()
+    limiter = ApiRateLimiter(
+        "compute", requests_per_second=0, max_concurrency=4,
+        base_delay_seconds=1, clock=fake.clock, sleep=fake.sleep,
+    )
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise exceptions.TooManyRequests("quota exceeded")
+        return "ok"
+
+    assert limiter.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert len(fake.sleeps) == 2
+    assert 0.5 <= fake.sleeps[0] <= 1 and 1 <= fake.sleeps[1] <= 2
+    assert limiter.stats() == {"calls": 3, "retries": 2, "throttled": 2, "concurrency_limit": 1}
+
+
+def test_async_calls_wait_for_the_bucket_and_retry_without_blocking():
+    fake = FakeTime()
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        fake.now += seconds
+
+    limiter = ApiRateLimiter(
+        "billing", requests_per_second=1, burst=1, base_delay_seconds=1,
+        clock=fake.clock, sleep=fake.sleep, async_sleep=fake_sleep,
+    )
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise exceptions.ResourceExhausted("quota exceeded")
+        return "ok"
+
+    async def denied():
+        raise exceptions.PermissionDenied("no access")
+
+    assert asyncio.run(limiter.call_async(flaky)) == "ok"
+    with pytest.raises(exceptions.PermissionDenied):
+        asyncio.run(limiter.call_async(denied))
+
+    assert fake.sleeps == []
+    # backoff after the quota error, then the bucket paced the retry and the next call
+    assert 0.5 <= sleeps[0] <= 1
+    assert limiter.stats()["calls"] == 3
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_async_calls_share_an_adaptive_concurrency_limit():
+    limiter = ApiRateLimiter("asset", requests_per_second=0, max_concurrency=4, base_delay_seconds=0)
+    in_flight = []
+    peak = []
+
+    async def throttled_once():
+        if not peak:
+            peak.append(0)
+            raise exceptions.TooManyRequests("quota exceeded")
+        return "ok"
+
+    async def slow():
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return "ok"
+
+    async def run():
+        await limiter.call_async(throttled_once)
+        return await asyncio.gather(*(limiter.call_async(slow) for _ in range(6)))
+
+    assert asyncio.run(run()) == ["ok"] * 6
+    # the 429 halved the async limit from 4 to 2
+    assert limiter.stats()["concurrency_limit"] == 2
+    assert max(peak) == 2
+
+
+def test_async_limiter_waits_for_a_free_slot():
+    limiter = AsyncAdaptiveConcurrencyLimiter(max_concurrency=1)
+
+    async def run():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        blocked = not waiter.done()
+        await limiter.release(throttled=True)
+        await waiter
+        return blocked
+
+    assert asyncio.run(run()) is True
+    assert limiter.in_flight == 1
+    assert limiter.limit == 1
+
+
+def test_call_once_does_not_retry():
+    fake = FakeTime()
+    limiter = ApiRateLimiter("asset", requests_per_second=0, max_concurrency=4, sleep=fake.sleep)
+
+    def unavailable():
+        raise exceptions.TooManyRequests("quota exceeded")
+
+    with pytest.raises(exceptions.TooManyRequests):
+        limiter.call_once(unavailable)
+
+    assert fake.sleeps == []
+    assert limiter.stats() == {"calls": 1, "retries": 0, "throttled": 1, "concurrency_limit": 2}
+
+
+def test_non_retryable_and_exhausted_errors_are_raised():
+    fake = FakeTime()
+    limiter = ApiRateLimiter("billing", requests_per_second=0, max_retries=1, sleep=fake.sleep)
+
+    def denied():
+        raise exceptions.PermissionDenied("no access")
+
+    def unavailable():
+        raise exceptions.ServiceUnavailable("down")
+
+    with pytest.raises(exceptions.PermissionDenied):
+        limiter.call(denied)
+    assert fake.sleeps == []
+
+    with pytest.raises(exceptions.ServiceUnavailable):
+        limiter.call(unavailable)
+    assert len(fake.sleeps) == 1
+
+
+def test_build_rate_limiters_merges_config():
+    limiters = build_rate_limiters({"max_retries": 2, "compute": {"max_concurrency": 3}})
+
+    assert set(limiters) == {"billing", "asset", "compute"}
+    assert limiters["compute"].concurrency.max_concurrency == 3
+    assert limiters["billing"].max_retries == 2
+
+
+def test_throttled_zone_is_retried_not_dropped(monkeypatch):
+    zones = ["zone-a", "zone-b"]
+    calls = {"zone-b": 0}
+
+    class ZonesClient:
+        def __init__(self, credentials=None):
+            pass
+
+        def list(self, project):
+            return [types.SimpleNamespace(name=z) for z in zones]
+
+    class InstancesClient:
+        def list(self, project, zone):
+            if zone == "zone-b":
+                calls["zone-b"] += 1
+                if calls["zone-b"] == 1:
+                    raise exceptions.TooManyRequests("rate limited")
+            return [types.SimpleNamespace(
+                name=f"{zone}-vm", status="STOPPED",
+                machine_type="e2-small", creation_timestamp="2024-01-01T00:00:00Z",
+            )]
+
+    monkeypatch.setattr(gmod.compute, "ZonesClient", ZonesClient)
+    collector = gmod.GCPCollector({
+        "project_id": "pid",
+        "collection": {"max_workers": 2, "instance_scan_strategy": "zonal"},
+        "rate_limits": {"base_delay_seconds": 0},
+    })
+    collector.compute_client = InstancesClient()
+
+    idle = collector.get_idle_compute_instances()
+
+    assert [i["name"] for i in idle] == ["zone-a-vm", "zone-b-vm"]
+    assert calls["zone-b"] == 2
+    assert collector.rate_limiters["compute"].stats()["throttled"] == 1
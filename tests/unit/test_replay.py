@@ -0,0 +1,63 @@
+import types
+
+from google.cloud import billing, compute
+
+from src.collectors.gcp_collector import GCPCollector
+from src.collectors.replay import (
+    RecordingClient,
+    ReplayClient,
+    generate_synthetic_fleet,
+    replay_clients,
+)
+
+
+class FakeZonesClient:
+    def list(self, project):
+        pages = [
+            compute.ZoneList(items=[compute.Zone(name="us-central1-a")], next_page_token="1"),
+            compute.ZoneList(items=[compute.Zone(name="us-central1-b")]),
+        ]
+        return types.SimpleNamespace(pages=iter(pages))
+
+
+class FakeBillingClient:
+    def get_project_billing_info(self, name):
+        return billing.ProjectBillingInfo(name=name, billing_enabled=True, billing_account_name="billingAccounts/X")
+
+
+def test_recorded_calls_replay_identically(tmp_path):
+    zones = RecordingClient(FakeZonesClient(), "zones", str(tmp_path))
+    billing_client = RecordingClient(FakeBillingClient(), "billing", str(tmp_path))
+
+    recorded_zones = [z.name for z in zones.list(project="pid")]
+    recorded_info = billing_client.get_project_billing_info(name="projects/pid")
+
+    replayed_zones = [z.name for z in ReplayClient("zones", str(tmp_path)).list(project="pid")]
+    replayed_info = ReplayClient("billing", str(tmp_path)).get_project_billing_info(name="projects/pid")
+
+    assert replayed_zones == recorded_zones == ["us-central1-a", "us-central1-b"]
+    assert replayed_info == recorded_info
+
+
+def test_unrecorded_call_raises(tmp_path):
+    client = ReplayClient("zones", str(tmp_path))
+    try:
+        client.list(project="other")
+    except LookupError as e:
+        assert "zones.list" in str(e)
+    else:
+        raise AssertionError("expected LookupError")
+
+
+def test_synthetic_fleet_drives_collector(tmp_path):
+    counts = generate_synthetic_fleet(str(tmp_path), "pid", asset_count=2000, zone_count=6, page_size=250)
+
+    results = {}
+    for strategy in ("aggregated", "zonal"):
+        collector = GCPCollector({"project_id": "pid", "collection": {"instance_scan_strategy": strategy}})
+        collector.use_clients(**replay_clients(str(tmp_path)))
+        results[strategy] = sorted(i["name"] for i in collector.get_idle_compute_instances())
+        assert sum(1 for _ in collector.iter_resources()) == counts["assets"]
+
+    assert len(results["aggregated"]) == counts["idle_instances"]
+    assert results["aggregated"] == results["zonal"]
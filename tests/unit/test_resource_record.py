@@ -0,0 +1,42 @@
+from google.cloud import asset
+
+from src.collectors.resource_record import ResourceRecord, _UNSET
+
+
+def make_record(data=None):
+    item = asset.Asset(
+        name="//compute.googleapis.com/projects/pid/zones/z/instances/vm-1",
+        asset_type="compute.googleapis.com/Instance",
+        resource=asset.Resource(data=data) if data is not None else None,
+    )
+    return ResourceRecord(item, "pid", "2024-01-01T00:00:00")
+
+
+def test_reading_type_does_not_convert_payload():
+    record = make_record({"status": "RUNNING"})
+
+    assert record.get("asset_type") == "compute.googleapis.com/Instance"
+    assert record["project_id"] == "pid"
+    assert record._resource_data is _UNSET
+
+
+def test_payload_converted_once_on_access():
+    record = make_record({"status": "RUNNING", "cpus": 2})
+
+    data = record["resource_data"]
+
+    assert data == {"status": "RUNNING", "cpus": 2}
+    assert record["resource_data"] is data
+    assert record._resource_data is data
+
+
+def test_materializes_like_original_dict():
+    assert make_record().to_dict() == {
+        "name": "//compute.googleapis.com/projects/pid/zones/z/instances/vm-1",
+        "asset_type": "compute.googleapis.com/Instance",
+        "project_id": "pid",
+        "collection_date": "2024-01-01T00:00:00",
+    }
+    assert set(make_record({"a": "b"})) == {
+        "name", "asset_type", "project_id", "collection_date", "resource_data",
+    }
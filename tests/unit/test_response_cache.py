@@ -0,0 +1,81 @@
+import os
+import time
+
+import pytest
+
+from src.collectors.response_cache import PartialResult, ResponseCache
+
+
+def test_round_trip_and_modes(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path))
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [{"name": "vm-1"}, {"name": "vm-2"}]
+
+    expected = [{"name": "vm-1"}, {"name": "vm-2"}]
+    assert cache.get_or_load("pid", "list", ("a",), loader) == expected
+    assert cache.get_or_load("pid", "list", ("a",), loader) == expected
+    assert len(calls) == 1
+
+    refresh = ResponseCache(directory=str(tmp_path), mode="refresh")
+    refresh.get_or_load("pid", "list", ("a",), loader)
+    assert len(calls) == 2
+    assert refresh.stats()["writes"] == 1
+
+    off = ResponseCache(directory=str(tmp_path), mode="off")
+    assert off.lookup("pid", "list", ("a",)) is None
+
+
+def test_per_method_ttl(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), method_ttls={"short": 0.0})
+    cache.get_or_load("pid", "short", (), lambda: [1])
+    cache.get_or_load("pid", "long", (), lambda: [1])
+    time.sleep(0.01)
+
+    assert cache.lookup("pid", "short", ()) is None
+    assert list(cache.lookup("pid", "long", ())) == [1]
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), max_bytes=10 ** 6)
+    for name in ("a", "b", "c"):
+        cache.get_or_load("pid", name, (), lambda: ["x" * 300])
+
+    # age every entry, then read "a" so it becomes most recently used
+    for entry in os.scandir(tmp_path):
+        os.utime(entry.path, (1, 1))
+    list(cache.lookup("pid", "a", ()))
+
+    # room for two entries; the stored_at header makes sizes vary by a few bytes
+    entry_size = max(e.stat().st_size for e in os.scandir(tmp_path))
+    cache.max_bytes = entry_size * 2 + 32
+    cache.get_or_load("pid", "d", (), lambda: ["x" * 300])
+
+    assert cache.lookup("pid", "a", ()) is not None
+    assert cache.lookup("pid", "d", ()) is not None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_failed_stream_is_not_committed(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path))
+
+    def broken():
+        yield {"name": "first"}
+        raise RuntimeError("page 2 failed")
+
+    with pytest.raises(RuntimeError):
+        list(cache.tee("pid", "stream", (), broken()))
+
+    assert cache.lookup("pid", "stream", ()) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_partial_results_are_returned_but_not_stored(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path))
+    partial = PartialResult([{"name": "vm-1"}], failures=["zone-b"])
+
+    assert cache.get_or_load("pid", "list", (), lambda: partial) is partial
+    assert cache.lookup("pid", "list", ()) is None
+    assert cache.stats()["writes"] == 0
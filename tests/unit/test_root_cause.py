@@ -0,0 +1,102 @@
+import pytest
+
+from src.analyzers import AnomalyExplainer, CostAnalyzer
+from src.analyzers.recommendation_engine import RecommendationEngine
+from src.data.billing_frame import BillingFrame
+from src.data.cost_cube import DailyCostCube
+
+from conftest import billing_record
+
+
+def record(day, service, sku, cost, project="p0"):
+    return billing_record(f"2024-05-{day:02d}", service, cost, project=project, sku=sku)
+
+
+def spiky_history():
+    # steady spend for two weeks; on the 15th the GPU SKU jumps by 90 and storage by 10
+    records = []
+    for day in range(1, 16):
+        spike = day == 15
+        records.append(record(day, "Compute Engine", "GPU", 100.0 if spike else 10.0))
+        records.append(record(day, "Compute Engine", "N1 Cores", 20.0))
+        records.append(record(day, "Cloud Storage", "Standard", 15.0 if spike else 5.0, project="p1"))
+    return records
+
+
+def test_contributors_are_ranked_by_share_of_the_deviation():
+    anomalies = [{"date": "2024-05-15", "cost": 135.0, "deviation_percentage": 200.0}]
+    explained = AnomalyExplainer().explain(spiky_history(), anomalies)[0]
+
+    assert explained["cost"] == 135.0
+    services = explained["root_causes"]["service"]
+    assert [(c["name"], c["deviation"], c["contribution_percentage"]) for c in services] == [
+        ("Compute Engine", 90.0, 90.0),
+        ("Cloud Storage", 10.0, 10.0),
+    ]
+    assert services[0]["expected_cost"] == 30.0
+    assert explained["root_causes"]["sku"][0]["name"] == "GPU"
+    # N1 Cores didn't move, so it isn't listed
+    assert [c["name"] for c in explained["root_causes"]["sku"]] == ["GPU", "Standard"]
+
+
+def test_series_anomalies_drill_down_within_their_series():
+    anomaly = {
+        "date": "2024-05-15",
+        "series": {"service": "Compute Engine"},
+        "deviation": 90.0,
+        "direction": "spike",
+    }
+    explained = AnomalyExplainer(dimensions=("service", "sku"), top_n=1).explain(spiky_history(), [anomaly])[0]
+
+    assert list(explained["root_causes"]) == ["sku"]
+    assert explained["root_causes"]["sku"] == [{
+        "name": "GPU",
+        "cost": 100.0,
+        "expected_cost": 10.0,
+        "deviation": 90.0,
+        "contribution_percentage": 100.0,
+    }]
+
+
+def test_drops_rank_the_largest_decreases():
+    records = [r for r in spiky_history() if r["date"] != "2024-05-15"]
+    records.append(record(15, "Compute Engine", "GPU", 10.0))
+    records.append(record(15, "Compute Engine", "N1 Cores", 5.0))
+    records.append(record(15, "Cloud Storage", "Standard", 5.0, project="p1"))
+    explained = AnomalyExplainer().explain(records, [{"date": "2024-05-15", "deviation_percentage": -43.0}])[0]
+
+    assert explained["root_causes"]["sku"] == [{
+        "name": "N1 Cores",
+        "cost": 5.0,
+        "expected_cost": 20.0,
+        "deviation": -15.0,
+        "contribution_percentage": 100.0,
+    }]
+
+
+def test_cube_gives_the_same_root_causes_and_unknown_days_are_skipped():
+    records = spiky_history()
+    anomalies = [{"date": "2024-05-15", "deviation_percentage": 200.0}, {"date": "2024-06-01"}]
+    explainer = AnomalyExplainer()
+    expected = explainer.explain(BillingFrame.from_records(records), anomalies)
+
+    assert explainer.explain(DailyCostCube.build(records), anomalies) == expected
+    assert expected[1]["root_causes"] == {}
+
+
+def test_unknown_dimension_is_rejected():
+    with pytest.raises(ValueError):
+        AnomalyExplainer(dimensions=("zone",))
+
+
+def test_recommendations_name_the_top_root_cause():
+    analyzer = CostAnalyzer()
+    anomalies = [{"date": "2024-05-15", "cost": 135.0, "average_cost": 45.0,
+                  "deviation_percentage": 200.0, "severity": "high"}]
+    explained = analyzer.explain_anomalies(spiky_history(), anomalies)
+
+    engine = RecommendationEngine()
+    engine.add_cost_anomaly_recommendations(explained)
+    rec = engine.recommendations[0]
+    assert rec["action"] == "Investigate 200.0% cost increase, mostly sku GPU (+90.00, 90% of the change)"
+    assert rec["anomaly_details"]["root_causes"]["service"][0]["name"] == "Compute Engine"
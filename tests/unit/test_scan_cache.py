@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.collectors.scan_cache import ScanCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_loader_called_once_per_key():
+    cache = ScanCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ["x"]
+
+    assert cache.get_or_load("p1", "list", loader) == ["x"]
+    assert cache.get_or_load("p1", "list", loader) == ["x"]
+    assert cache.get_or_load("p2", "list", loader) == ["x"]
+
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_ttl_expiry_and_invalidation():
+    clock = FakeClock()
+    cache = ScanCache(ttl_seconds=10, clock=clock)
+    values = iter(range(100))
+
+    first = cache.get_or_load("p", "list", lambda: next(values))
+    clock.now = 5
+    assert cache.get_or_load("p", "list", lambda: next(values)) == first
+
+    clock.now = 20
+    assert cache.get_or_load("p", "list", lambda: next(values)) != first
+
+    cache.get_or_load("p", "other", lambda: next(values))
+    assert cache.invalidate(project_id="p", method="list") == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_concurrent_threads_share_one_load():
+    cache = ScanCache()
+    calls = []
+    start = threading.Barrier(4)
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return ["x"]
+
+    def fetch(_):
+        start.wait()
+        return cache.get_or_load("p", "list", loader)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(fetch, range(4)))
+
+    assert results == [["x"]] * 4
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_concurrent_coroutines_share_one_load():
+    cache = ScanCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["x"]
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_load_async("p", "list", loader) for _ in range(4))
+        )
+
+    assert asyncio.run(run()) == [["x"]] * 4
+    assert len(calls) == 1
+    assert cache.stats() == {**cache.stats(), "hits": 3, "misses": 1}
+
+
+def test_failed_async_load_lets_waiters_retry():
+    cache = ScanCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return ["x"]
+
+    async def run():
+        return await asyncio.gather(
+            cache.get_or_load_async("p", "list", loader),
+            cache.get_or_load_async("p", "list", loader),
+            return_exceptions=True
+        )
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, RuntimeError)
+    assert second == ["x"]
+    assert len(calls) == 2
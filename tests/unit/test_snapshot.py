@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from src.analyzers.cost_analyzer import CostAnalyzer
+from src.analyzers.recommendation_engine import RecommendationEngine
+from src.data.billing_frame import BillingFrame
+from src.data.snapshot import Snapshot, SnapshotWriter
+
+RECORDS = [
+    {"date": "2024-01-01", "service_name": "Compute Engine", "cost": 10.0},
+    {"date": "2024-01-02", "service_name": "Cloud Storage", "cost": 2.5},
+]
+
+RESOURCES = [
+    {"name": "//compute/instances/vm-1", "asset_type": "compute.googleapis.com/Instance", "project_id": "p1"},
+    {"name": "//storage/buckets/b-ü", "asset_type": "storage.googleapis.com/Bucket", "project_id": "p1"},
+    {"name": "//compute/instances/vm-2", "asset_type": "compute.googleapis.com/Instance", "project_id": "p2"},
+]
+
+IDLE = [{"name": "vm-2", "zone": "us-central1-a", "status": "STOPPED", "machine_type": "zones/x/machineTypes/e2-small"}]
+
+
+def write_snapshot(directory):
+    writer = SnapshotWriter(str(directory), metadata={"project_id": "p1"})
+    writer.set_billing(BillingFrame.from_records(RECORDS))
+    for resource in RESOURCES:
+        writer.add_resource(resource)
+    writer.set_idle_instances(IDLE)
+    return writer.close()
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    snapshot = Snapshot.load(write_snapshot(tmp_path / "snap"))
+
+    frame = snapshot.billing
+    assert isinstance(frame.cost.base, np.memmap)
+    assert frame.group_costs("service") == {"Compute Engine": 10.0, "Cloud Storage": 2.5}
+    assert snapshot.metadata == {"project_id": "p1"}
+    assert snapshot.resource_count == 3
+    assert snapshot.resource_type_counts() == {
+        "compute.googleapis.com/Instance": 2,
+        "storage.googleapis.com/Bucket": 1,
+    }
+    assert [(r["name"], r["project_id"]) for r in snapshot.iter_resources()] == [
+        (r["name"], r["project_id"]) for r in RESOURCES
+    ]
+
+
+def test_analyzers_read_snapshots_directly(tmp_path):
+    snapshot = Snapshot.load(write_snapshot(tmp_path / "snap"))
+
+    trends = CostAnalyzer().analyze_cost_trends(snapshot)
+    assert trends["total_cost"] == 12.5
+    assert trends["top_cost_driver"] == "Compute Engine"
+
+    engine = RecommendationEngine()
+    engine.add_snapshot_recommendations(snapshot)
+    assert [rec["resource_name"] for rec in engine.recommendations] == ["vm-2"]
+
+
+def test_rewrite_replaces_existing_snapshot(tmp_path):
+    target = tmp_path / "snap"
+    write_snapshot(target)
+
+    writer = SnapshotWriter(str(target))
+    writer.close()
+
+    snapshot = Snapshot.load(str(target))
+    assert snapshot.resource_count == 0
+    assert len(snapshot.billing) == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["snap"]
+
+
+def test_load_rejects_non_snapshots(tmp_path):
+    with pytest.raises(ValueError):
+        Snapshot.load(str(tmp_path))
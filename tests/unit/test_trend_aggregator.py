@@ -0,0 +1,49 @@
+import pickle
+
+import pytest
+
+from src.analyzers import CostAnalyzer, CostTrendAggregator
+from src.data.billing_frame import BillingFrame
+
+from conftest import without_dates
+
+RECORDS = [
+    {"date": "2024-01-01", "service_name": "Compute Engine", "project_name": "a", "cost": 10.0},
+    {"date": "2024-01-01", "service_name": "Cloud Storage", "project_name": "a", "cost": 2.0},
+    {"date": "2024-01-02", "service_name": "Compute Engine", "project_name": "b", "cost": 4.5},
+    {"date": "2024-01-03", "service_name": "BigQuery", "project_name": "b", "cost": 30.0},
+    {"service_name": "", "cost": 1.0},
+]
+
+
+def test_streamed_chunks_match_the_batch_analysis():
+    aggregator = CostTrendAggregator().consume([RECORDS[:2], [], BillingFrame.from_records(RECORDS[2:])])
+    batch = without_dates(CostAnalyzer().analyze_cost_trends(RECORDS, group_by="project"))
+
+    streamed = without_dates(aggregator.result(group_by="project"))
+    assert streamed.pop("line_items") == 5
+    assert streamed.pop("daily_costs") == {"2024-01-01": 12.0, "2024-01-02": 4.5, "2024-01-03": 30.0}
+    assert streamed == batch
+
+
+def test_merge_combines_partial_states_from_workers():
+    left = CostTrendAggregator(("service",)).update(RECORDS[:3])
+    right = pickle.loads(pickle.dumps(CostTrendAggregator(("service",)).update(RECORDS[3:])))
+
+    merged = left.merge(right).result()
+    assert merged["top_cost_driver"] == "BigQuery"
+    assert merged["total_cost"] == 47.5
+    assert [group["name"] for group in merged["breakdown"]] == ["BigQuery", "Compute Engine", "Cloud Storage", "Unknown"]
+
+    with pytest.raises(ValueError):
+        left.merge(CostTrendAggregator(("project",)))
+    with pytest.raises(ValueError):
+        left.result(group_by="project")
+
+
+def test_empty_and_invalid():
+    assert CostTrendAggregator().result()["status"] == "no_data"
+    with pytest.raises(ValueError):
+        CostTrendAggregator(("owner",))
+    with pytest.raises(ValueError):
+        CostTrendAggregator(())